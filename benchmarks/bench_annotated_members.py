@@ -0,0 +1,81 @@
+"""
+Measure the refresh time of a web application context with a large synthetic app,
+in which every bean is inspected by the built-in post-processors.
+
+Each component has a number of plain methods, one @autowired method and one @async_run method,
+every tenth component is a blueprint and every tenth is a configuration with @bean methods.
+
+Usage: python benchmarks/bench_annotated_members.py [component counts...]
+"""
+import sys
+import time
+
+from flask import Flask
+
+from guniflask.context import autowired, bean, component, configuration
+from guniflask.scheduling import async_run
+from guniflask.web import blueprint, get_route
+from guniflask.web.context import WebApplicationContext
+from guniflask.web.scheduling_config import WebAsyncConfiguration, WebSchedulingConfiguration
+
+
+class Dependency:
+    pass
+
+
+def make_components(n: int, methods: int = 20) -> list:
+    components = [component('dependency')(Dependency)]
+    for i in range(n):
+        attrs = {f'method{j}': lambda self: None for j in range(methods)}
+
+        def set_dependency(self, dependency: Dependency):
+            self.dependency = dependency
+
+        attrs['set_dependency'] = autowired(set_dependency)
+        attrs['run_async'] = async_run(lambda self: None)
+        if i % 10 == 1:
+            def index(self):
+                return 'ok'
+
+            attrs['index'] = get_route('/')(index)
+            cls = blueprint(f'/synthetic{i}')(type(f'SyntheticController{i}', (object,), attrs))
+        elif i % 10 == 2:
+            attrs.update({f'product{i}_{j}': bean(make_factory(f'product{i}_{j}')) for j in range(5)})
+            cls = configuration(type(f'SyntheticConfiguration{i}', (object,), attrs))
+        else:
+            cls = component(type(f'SyntheticService{i}', (object,), attrs))
+        components.append(cls)
+    return components
+
+
+def make_factory(name: str):
+    def factory(self) -> dict:
+        return {}
+
+    factory.__name__ = name
+    return factory
+
+
+def bench_refresh(n: int) -> float:
+    components = make_components(n)
+    app = Flask(__name__)
+    bean_context = WebApplicationContext(app)
+    bean_context.register(WebAsyncConfiguration, WebSchedulingConfiguration)
+    bean_context.register(*components)
+    with app.app_context():
+        start = time.perf_counter()
+        bean_context.refresh()
+        elapsed = time.perf_counter() - start
+        bean_context.close()
+    return elapsed
+
+
+def main():
+    counts = [int(i) for i in sys.argv[1:]] or [100, 500, 1000]
+    for n in counts:
+        elapsed = bench_refresh(n)
+        print(f'{n:>6} components: refresh {elapsed * 1000:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
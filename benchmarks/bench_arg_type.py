@@ -0,0 +1,42 @@
+"""
+Measure the time of analyzing common shapes of argument types with analyze_arg_type.
+
+Usage: python benchmarks/bench_arg_type.py [repeat]
+"""
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from guniflask.data_model.typing import analyze_arg_type
+
+
+class Model(BaseModel):
+    name: str
+
+
+SHAPES = [
+    ('int', int),
+    ('List[int]', List[int]),
+    ('Set[str]', Set[str]),
+    ('Dict[str, Model]', Dict[str, Model]),
+    ('Dict[str, List[Model]]', Dict[str, List[Model]]),
+    ('Optional[int]', Optional[int]),
+    ('Optional[List[Model]]', Optional[List[Model]]),
+]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, arg_type in SHAPES:
+        analyze_arg_type(arg_type)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            analyze_arg_type(arg_type)
+        elapsed = time.perf_counter() - start
+        print(f'{name:<24} {elapsed / repeat * 1e9:>10,.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure the refresh time of a bean context with synthetic beans.
+
+Usage: python benchmarks/bench_bean_refresh.py [bean counts...]
+"""
+import sys
+import time
+
+from guniflask.context import AnnotationConfigBeanContext, bean, component, configuration
+
+
+def make_components(n: int) -> list:
+    components = []
+    prev = None
+    for i in range(n):
+        def __init__(self, dep=None):
+            self.dep = dep
+
+        if prev is not None:
+            __init__.__annotations__ = {'dep': prev}
+        cls = component(type(f'SyntheticBean{i}', (object,), {'__init__': __init__}))
+        components.append(cls)
+        prev = cls
+
+    for i in range(0, n, 10):
+        factory = make_factory(type(f'SyntheticProduct{i}', (object,), {}))
+        factory.__name__ = f'synthetic_product{i}'
+        config = configuration(type(f'SyntheticConfiguration{i}', (object,), {factory.__name__: bean(factory)}))
+        components.append(config)
+    return components
+
+
+def make_factory(product: type):
+    def factory(self):
+        return product()
+
+    factory.__annotations__ = {'return': product}
+    return factory
+
+
+def bench_refresh(n: int):
+    components = make_components(n)
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.register(*components)
+    start = time.perf_counter()
+    bean_context.refresh()
+    elapsed = time.perf_counter() - start
+    stats = bean_context.get_bean_type_index_stats()
+    bean_context.close()
+    return elapsed, stats
+
+
+def main():
+    counts = [int(i) for i in sys.argv[1:]] or [100, 1000, 5000]
+    for n in counts:
+        elapsed, stats = bench_refresh(n)
+        print(f'{n:>6} beans: refresh {elapsed * 1000:10.1f} ms  '
+              f'(type index hits={stats["hits"]}, misses={stats["misses"]}, rebuilds={stats["rebuilds"]})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the CPU time and the compressed size of a JSON response body for each available encoding and level,
+compressed at once and incrementally in chunks of 8 KiB.
+
+Usage: python benchmarks/bench_compression.py [row count]
+"""
+import json
+import sys
+import time
+
+from guniflask.web.compression import COMPRESSORS
+
+LEVELS = {
+    'gzip': [1, 6, 9],
+    'br': [1, 4, 6, 11],
+    'zstd': [1, 3, 10, 19],
+}
+
+CHUNK_SIZE = 8 * 1024
+
+
+def make_payload(n: int) -> bytes:
+    rows = [
+        {'id': i, 'name': f'user{i}', 'email': f'user{i}@example.com', 'score': i * 0.5, 'tags': ['a', 'b']}
+        for i in range(n)
+    ]
+    return json.dumps(rows).encode()
+
+
+def bench(func, repeat: int = 5) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    payload = make_payload(n)
+    chunks = [payload[i:i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE)]
+    mb = len(payload) / 1024 / 1024
+    print(f'payload: {len(payload):,} bytes')
+    print(f'{"encoding":<8} {"level":>5} {"ratio":>7} {"MB/s":>8} {"stream ratio":>13} {"stream MB/s":>12}')
+    for encoding, compressor_type in COMPRESSORS.items():
+        if not compressor_type.is_available():
+            print(f'{encoding:<8} not available')
+            continue
+        for level in LEVELS[encoding]:
+            compressor = compressor_type(level)
+            size = len(compressor.compress(payload))
+            elapsed = bench(lambda: compressor.compress(payload))
+            stream_size = sum(len(c) for c in compressor.compress_stream(chunks))
+            stream_elapsed = bench(lambda: list(compressor.compress_stream(chunks)))
+            print(f'{encoding:<8} {level:>5} {len(payload) / size:>7.2f} {mb / elapsed:>8.1f} '
+                  f'{len(payload) / stream_size:>13.2f} {mb / stream_elapsed:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure the throughput of ConstructorResolver.instantiate on a class with several injected arguments.
+
+Usage: python benchmarks/bench_constructor_resolver.py [iterations]
+"""
+import sys
+import time
+from typing import List
+
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+from guniflask.beans.constructor_resolver import ConstructorResolver
+
+
+class Repository:
+    pass
+
+
+class Cache:
+    pass
+
+
+class Handler:
+    pass
+
+
+class FooHandler(Handler):
+    pass
+
+
+class BarHandler(Handler):
+    pass
+
+
+class UnitOfWork:
+    def __init__(self, repository: Repository, cache: Cache, handlers: List[Handler], timeout: int = 10):
+        self.repository = repository
+        self.cache = cache
+        self.handlers = handlers
+        self.timeout = timeout
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    bean_factory = DefaultBeanFactory()
+    for cls in (Repository, Cache, FooHandler, BarHandler):
+        bean_factory.register_bean_definition(cls.__name__.lower(), BeanDefinition(cls))
+    bean_factory.pre_instantiate_singletons()
+    resolver = ConstructorResolver(bean_factory)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        resolver.instantiate(UnitOfWork)
+    elapsed = time.perf_counter() - start
+    print(f'{iterations} instantiations in {elapsed:.3f} s ({iterations / elapsed:,.0f} ops/s)')
+
+
+if __name__ == '__main__':
+    main()
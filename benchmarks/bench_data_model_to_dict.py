@@ -0,0 +1,70 @@
+"""
+Measure the time of DataModel.to_dict on 10k nested models, with and without the ignore and only rules.
+
+Each model has a nested model, a list of nested models and an Enum field.
+
+Usage: python benchmarks/bench_data_model_to_dict.py [model count]
+"""
+import enum
+import sys
+import time
+from typing import List
+
+from guniflask.data_model import DataModel
+
+
+class Role(enum.Enum):
+    ADMIN = 'admin'
+    USER = 'user'
+
+
+class Address(DataModel):
+    city: str
+    street: str
+
+
+class Tag(DataModel):
+    id: int
+    name: str
+
+
+class User(DataModel):
+    id: int
+    name: str
+    role: Role
+    address: Address
+    tags: List[Tag]
+
+
+def make_user(i: int) -> User:
+    return User(
+        id=i,
+        name=f'user{i}',
+        role=Role.USER,
+        address=Address(city='Shanghai', street=f'street{i}'),
+        tags=[Tag(id=j, name=f'tag{j}') for j in range(3)],
+    )
+
+
+def bench(users: List[User], repeat: int = 5, **kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for u in users:
+            u.to_dict(**kwargs)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    users = [make_user(i) for i in range(n)]
+    cases = [
+        ('no rules', {}),
+        ('ignore', {'ignore': 'address.street,tags.id'}),
+        ('only', {'only': ['id', 'name', 'tags.name']}),
+    ]
+    for name, kwargs in cases:
+        print(f'{name:<12} {bench(users, **kwargs):>8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure the throughput of publishing events with different numbers of listeners.
+
+A third of the listeners accept all events, a third accept the published type of events
+and the others accept another type of events. Half of the listeners are registered as singleton beans.
+
+Usage: python benchmarks/bench_event_publisher.py [listener counts...]
+"""
+import sys
+import time
+
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+from guniflask.context import ApplicationEventPublisher
+from guniflask.context.event import ApplicationEvent
+from guniflask.context.event_listener import ApplicationEventListener
+
+
+class OrderCreatedEvent(ApplicationEvent):
+    pass
+
+
+class UserRegisteredEvent(ApplicationEvent):
+    pass
+
+
+class AnyEventListener(ApplicationEventListener):
+    def __init__(self):
+        self.count = 0
+
+    def on_application_event(self, application_event: ApplicationEvent):
+        self.count += 1
+
+
+class OrderListener(AnyEventListener):
+    def on_application_event(self, application_event: OrderCreatedEvent):
+        self.count += 1
+
+
+class UserListener(AnyEventListener):
+    def on_application_event(self, application_event: UserRegisteredEvent):
+        self.count += 1
+
+
+def make_publisher(n: int) -> ApplicationEventPublisher:
+    bean_factory = DefaultBeanFactory()
+    publisher = ApplicationEventPublisher(bean_factory)
+    listener_types = [AnyEventListener, OrderListener, UserListener]
+    for i in range(n):
+        listener_type = listener_types[i % len(listener_types)]
+        if i % 2 == 0:
+            publisher.add_application_listener(listener_type())
+        else:
+            bean_factory.register_bean_definition(f'listener{i}', BeanDefinition(listener_type))
+            publisher.add_application_listener_bean(f'listener{i}')
+    return publisher
+
+
+def bench_publish(n: int, duration: float = 1.0) -> float:
+    publisher = make_publisher(n)
+    event = OrderCreatedEvent(None)
+    publisher.publish_event(event)
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(100):
+            publisher.publish_event(event)
+        count += 100
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return count / elapsed
+
+
+def main():
+    counts = [int(i) for i in sys.argv[1:]] or [1, 50, 500]
+    for n in counts:
+        rate = bench_publish(n)
+        print(f'{n:>6} listeners: {rate:>12,.0f} events/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the time of converting the rows of a query result to DataModel instances,
+one by one with from_orm and in batch with from_orm_many.
+
+The rows are loaded from an in-memory SQLite database along with a many-to-one relationship.
+
+Usage: python benchmarks/bench_from_orm_many.py [row count]
+"""
+import sys
+import time
+from typing import Optional
+
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, joinedload, relationship, sessionmaker
+
+from guniflask.data_model import DataModel
+from guniflask.orm import BaseModelMixin
+
+Base = declarative_base()
+
+
+class UserEntity(BaseModelMixin, Base):
+    __tablename__ = 'user'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    email = Column(String)
+
+
+class ArticleEntity(BaseModelMixin, Base):
+    __tablename__ = 'article'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    content = Column(String)
+    status = Column(Integer)
+    user_id = Column(Integer, ForeignKey('user.id'))
+    author = relationship('UserEntity')
+
+
+class UserModel(DataModel):
+    id: int
+    name: str
+    email: str
+
+
+class ArticleModel(DataModel):
+    id: int
+    title: str
+    content: str
+    status: int
+    user_id: int
+    author: Optional[UserModel] = None
+
+
+def bench(func, repeat: int = 10) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    users = [UserEntity(id=i, name=f'user{i}', email=f'user{i}@example.com') for i in range(10)]
+    session.add_all(users)
+    session.add_all([
+        ArticleEntity(id=i, title=f'title{i}', content='content', status=1, author=users[i % 10])
+        for i in range(n)
+    ])
+    session.commit()
+    rows = session.query(ArticleEntity).options(joinedload(ArticleEntity.author)).all()
+
+    cases = [
+        ('from_orm', lambda: [ArticleModel.from_orm(r, include='author') for r in rows]),
+        ('from_orm_many', lambda: ArticleModel.from_orm_many(rows, include='author')),
+        ('from_orm_many trusted', lambda: ArticleModel.from_orm_many(rows, include='author', trusted=True)),
+    ]
+    for name, func in cases:
+        print(f'{name:<24} {bench(func):>8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
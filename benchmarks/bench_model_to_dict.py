@@ -0,0 +1,71 @@
+"""
+Measure the time of converting 100k rows to dicts with model_to_dict, and back to models with dict_to_model.
+
+The rows are loaded from an in-memory SQLite database, with a datetime column and a many-to-one relationship.
+
+Usage: python benchmarks/bench_model_to_dict.py [row count]
+"""
+import datetime as dt
+import sys
+import time
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, joinedload, relationship, sessionmaker
+
+from guniflask.orm import BaseModelMixin, dict_to_model, model_to_dict, models_to_dicts
+
+Base = declarative_base()
+
+
+class User(BaseModelMixin, Base):
+    __tablename__ = 'user'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class Article(BaseModelMixin, Base):
+    __tablename__ = 'article'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    content = Column(String)
+    status = Column(Integer)
+    created_at = Column(DateTime)
+    user_id = Column(Integer, ForeignKey('user.id'))
+    author = relationship('User')
+
+
+def bench(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    users = [User(id=i, name=f'user{i}') for i in range(10)]
+    session.add_all(users)
+    now = dt.datetime(2024, 1, 2, 3, 4, 5)
+    session.add_all([
+        Article(id=i, title=f'title{i}', content='content', status=1, created_at=now, author=users[i % 10])
+        for i in range(n)
+    ])
+    session.commit()
+    rows = session.query(Article).options(joinedload(Article.author)).all()
+    dicts = [model_to_dict(r) for r in rows]
+
+    cases = [
+        ('model_to_dict', lambda: [model_to_dict(r) for r in rows]),
+        ('model_to_dict ignore', lambda: [model_to_dict(r, ignore='content,status') for r in rows]),
+        ('model_to_dict include', lambda: [model_to_dict(r, include='author') for r in rows]),
+        ('models_to_dicts include', lambda: models_to_dicts(rows, include='author')),
+        ('dict_to_model', lambda: [dict_to_model(d, Article) for d in dicts]),
+    ]
+    for name, func in cases:
+        print(f'{name:<24} {bench(func):>10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare sequential and parallel instantiation of synthetic slow singletons.
+
+Each bean sleeps for a while in its constructor to simulate I/O bound initialization,
+e.g. connecting to a database. Every bean depends on the bean of the previous layer.
+
+Usage: python benchmarks/bench_parallel_init.py [layers] [width] [delay_ms]
+"""
+import sys
+import time
+
+from guniflask.context import AnnotationConfigBeanContext, component
+
+
+def make_components(layers: int, width: int, delay: float) -> list:
+    components = []
+    prev_layer = []
+    for i in range(layers):
+        layer = []
+        for j in range(width):
+            def __init__(self, dep=None):
+                time.sleep(delay)
+                self.dep = dep
+
+            if prev_layer:
+                __init__.__annotations__ = {'dep': prev_layer[j]}
+            cls = component(type(f'SlowBean{i}_{j}', (object,), {'__init__': __init__}))
+            layer.append(cls)
+        components.extend(layer)
+        prev_layer = layer
+    return components
+
+
+def bench_refresh(components: list, parallel: bool, max_workers: int = None) -> float:
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.set_parallel_instantiation(parallel, max_workers=max_workers)
+    bean_context.register(*components)
+    start = time.perf_counter()
+    bean_context.refresh()
+    elapsed = time.perf_counter() - start
+    bean_context.close()
+    return elapsed
+
+
+def main():
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    delay = (float(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+    components = make_components(layers, width, delay)
+    print(f'{layers * width} beans in {layers} layers, {delay * 1000:.0f}ms each')
+    print(f'{"mode":>16} {"refresh":>12}')
+    for name, parallel, max_workers in [('sequential', False, None),
+                                        ('parallel (4)', True, 4),
+                                        ('parallel', True, width)]:
+        elapsed = bench_refresh(components, parallel, max_workers)
+        print(f'{name:>16} {elapsed * 1000:>10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure the time of parsing 1k-element JSON bodies with parse_json.
+
+The bodies are lists and dicts of pydantic models with nested models, and lists of plain classes for comparison.
+
+Usage: python benchmarks/bench_parse_json.py [element count]
+"""
+import datetime as dt
+import sys
+import time
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from guniflask.data_model import parse_json
+
+
+class Address(BaseModel):
+    city: str
+    street: str
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    tags: List[str]
+    address: Address
+    created_at: dt.datetime
+
+
+class PlainUser:
+    id: int
+    name: str
+    tags: List[str]
+
+
+def make_user(i: int) -> dict:
+    return {
+        'id': i,
+        'name': f'user{i}',
+        'tags': ['a', 'b'],
+        'address': {'city': 'Shanghai', 'street': f'street{i}'},
+        'created_at': '2024-01-02T03:04:05',
+    }
+
+
+def bench(source, dtype, repeat: int = 20) -> float:
+    parse_json(source, dtype)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_json(source, dtype)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    users = [make_user(i) for i in range(n)]
+    cases = [
+        ('List[User]', users, List[User]),
+        ('Dict[str, User]', {str(u['id']): u for u in users}, Dict[str, User]),
+        ('Dict[str, List[User]]', {'users': users}, Dict[str, List[User]]),
+        ('List[PlainUser]', users, List[PlainUser]),
+    ]
+    for name, source, dtype in cases:
+        try:
+            print(f'{name:<24} {bench(source, dtype):>8.2f} ms')
+        except Exception as e:
+            print(f'{name:<24} failed: {e!r}')
+
+
+if __name__ == '__main__':
+    main()
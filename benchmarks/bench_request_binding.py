@@ -0,0 +1,97 @@
+"""
+Measure the throughput of a route with 10 mixed parameters: a path variable, query parameters of int, bool,
+datetime and list, headers of int and list, a cookie, a model of query parameters and a JSON body model.
+
+Both the full requests through the test client and the view function alone in a request context are measured.
+
+Usage: python benchmarks/bench_request_binding.py [duration]
+"""
+import datetime as dt
+import sys
+import time
+from typing import List
+
+from flask import Flask
+from pydantic import BaseModel
+
+from guniflask.web import CookieValue, PathVariable, RequestBody, RequestHeader, RequestParam, blueprint, post_route
+from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
+
+
+class Paging(BaseModel):
+    page: int = 1
+    size: int = 20
+
+
+class Order(BaseModel):
+    item: str
+    quantity: int
+
+
+@blueprint('/shops')
+class ShopController:
+    @post_route('/<shop_id>/orders')
+    def create_order(self,
+                     order: Order = RequestBody,
+                     shop_id: int = PathVariable,
+                     user_id: int = RequestParam,
+                     dry_run: bool = RequestParam(default=False),
+                     since: dt.datetime = RequestParam(default=None),
+                     tags: List[str] = RequestParam(default=None),
+                     paging: Paging = RequestParam,
+                     trace_id: int = RequestHeader('X-Trace-Id'),
+                     accept_language: List[str] = RequestHeader('Accept-Language', default=None),
+                     session: str = CookieValue):
+        return 'ok'
+
+
+def make_app() -> Flask:
+    app = Flask(__name__)
+    post_processor = BlueprintPostProcessor()
+    post_processor.post_process_after_initialization(ShopController(), 'shop_controller')
+    for b in post_processor.blueprints:
+        app.register_blueprint(b)
+    return app
+
+
+REQUEST = dict(
+    path='/shops/42/orders',
+    query_string='user_id=7&dry_run=true&since=2024-01-02T03:04:05&tags=a&tags=b&page=2&size=50',
+    headers={'X-Trace-Id': '123456', 'Accept-Language': 'en', 'Cookie': 'session=abc'},
+    json={'item': 'book', 'quantity': 3},
+    method='POST',
+)
+
+
+def bench(func, duration: float) -> float:
+    func()
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(100):
+            func()
+        count += 100
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return count / elapsed
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    app = make_app()
+    client = app.test_client()
+
+    def send_request():
+        resp = client.open(**REQUEST)
+        assert resp.status_code == 200, resp.data
+
+    view_func = app.view_functions['shop_controller.create_order']
+    with app.test_request_context(**REQUEST):
+        rate = bench(lambda: view_func(shop_id='42'), duration)
+    print(f'view function: {rate:>10,.0f} calls/s')
+    rate = bench(send_request, duration)
+    print(f'test client:   {rate:>10,.0f} requests/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure the time of converting the rows of a 100k-row report query to dicts,
+row by row with result_to_dict and at once with results_to_dicts, in rows and in columns.
+
+Usage: python benchmarks/bench_results_to_dicts.py [row count]
+"""
+import datetime as dt
+import sys
+import time
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from guniflask.orm import result_to_dict, results_to_dicts
+
+Base = declarative_base()
+
+
+class Sale(Base):
+    __tablename__ = 'sale'
+    id = Column(Integer, primary_key=True)
+    region = Column(String)
+    product = Column(String)
+    amount = Column(Float)
+    quantity = Column(Integer)
+    sold_at = Column(DateTime)
+
+
+def bench(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    now = dt.datetime(2024, 1, 2, 3, 4, 5)
+    session.add_all([
+        Sale(id=i, region=f'region{i % 8}', product=f'product{i % 100}', amount=i * 0.5, quantity=i % 10,
+             sold_at=now)
+        for i in range(n)
+    ])
+    session.commit()
+    rows = session.query(Sale).with_entities(Sale.region, Sale.product, Sale.amount, Sale.quantity,
+                                             Sale.sold_at).all()
+    plain_rows = session.query(Sale).with_entities(Sale.region, Sale.product, Sale.amount, Sale.quantity).all()
+
+    cases = [
+        ('result_to_dict', lambda: [result_to_dict(r) for r in rows]),
+        ('results_to_dicts', lambda: results_to_dicts(rows)),
+        ('results_to_dicts columnar', lambda: results_to_dicts(rows, columnar=True)),
+        ('result_to_dict only', lambda: [result_to_dict(r, only='region,amount') for r in rows]),
+        ('results_to_dicts only', lambda: results_to_dicts(rows, only='region,amount')),
+        ('result_to_dict no datetime', lambda: [result_to_dict(r) for r in plain_rows]),
+        ('results_to_dicts no datetime', lambda: results_to_dicts(plain_rows)),
+    ]
+    for name, func in cases:
+        print(f'{name:<30} {bench(func):>10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the time and the peak memory of exporting 1M rows of a SQLite database as JSON from a view function,
+by loading all the models and dumping them at once, and by streaming them with stream_query.
+
+Each mode runs in a subprocess so that the peak memory is measured separately.
+
+Usage: python benchmarks/bench_stream_export.py [row count]
+"""
+import datetime as dt
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy import Column, DateTime, Float, Integer, String, create_engine, insert
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from guniflask.orm import BaseModelMixin, model_to_dict, stream_query
+from guniflask.web.json_codec import JsonCodecProvider, create_json_codec
+
+Base = declarative_base()
+
+
+class Order(BaseModelMixin, Base):
+    __tablename__ = 'order'
+    id = Column(Integer, primary_key=True)
+    customer = Column(String)
+    product = Column(String)
+    amount = Column(Float)
+    created_at = Column(DateTime)
+
+
+MODES = ['all', 'json', 'ndjson']
+
+
+def create_database(path: str, n: int):
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    now = dt.datetime(2024, 1, 2, 3, 4, 5)
+    with engine.begin() as conn:
+        for start in range(0, n, 100000):
+            conn.execute(insert(Order), [
+                dict(id=i, customer=f'customer{i % 1000}', product=f'product{i % 100}', amount=i * 0.5,
+                     created_at=now)
+                for i in range(start, min(start + 100000, n))
+            ])
+
+
+def run(path: str, mode: str):
+    engine = create_engine(f'sqlite:///{path}')
+    session = sessionmaker(bind=engine)()
+    app = Flask(__name__)
+    app.json = JsonCodecProvider(app, create_json_codec())
+
+    @app.route('/orders')
+    def export_orders():
+        if mode == 'all':
+            return app.json.response([model_to_dict(o) for o in session.query(Order).all()])
+        return stream_query(session.query(Order), stream_format=mode, batch_size=2000)
+
+    start = time.perf_counter()
+    resp = app.test_client().get('/orders', buffered=False)
+    size = sum(len(chunk) for chunk in resp.iter_encoded())
+    resp.close()
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{mode:<8} {elapsed:>8.2f} s {peak:>10.1f} MiB peak RSS {size / 1024 / 1024:>10.1f} MiB body')
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--run':
+        run(sys.argv[2], sys.argv[3])
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'orders.db')
+        create_database(path, n)
+        for mode in MODES:
+            subprocess.run([sys.executable, __file__, '--run', path, mode], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,7 @@
-from typing import List, Type
+import inspect
+import threading
+from typing import Callable, List, Tuple, Type
+from weakref import WeakKeyDictionary, WeakSet
 
 
 class Annotation:
@@ -76,3 +79,65 @@ class AnnotationUtils:
             annotation_metadata = AnnotationMetadata(source)
             setattr(source, ANNOTATION_METADATA, annotation_metadata)
         annotation_metadata.add_annotation(annotation)
+        if inspect.isfunction(source):
+            # only the indexes of the classes owning the function are stale
+            with _member_index_lock:
+                owners = _function_owners.pop(source, None)
+                if owners:
+                    for cls in owners:
+                        _member_indexes.pop(cls, None)
+
+    @staticmethod
+    def get_member_index(cls: type) -> 'AnnotatedMemberIndex':
+        index = _member_indexes.get(cls)
+        if index is None:
+            with _member_index_lock:
+                index = _member_indexes.get(cls)
+                if index is None:
+                    index = AnnotatedMemberIndex(cls)
+                    _member_indexes[cls] = index
+        return index
+
+    @staticmethod
+    def get_annotated_methods(cls: type, annotation_type: Type[Annotation]) -> List[Tuple[str, Callable, Annotation]]:
+        """
+        Get the name, the function and the annotation of each method of the class annotated with the annotation type.
+        """
+        return AnnotationUtils.get_member_index(cls).get_annotated_functions(annotation_type)
+
+
+class AnnotatedMemberIndex:
+    """
+    Index of the functions defined in a class, which groups the annotated functions by the types of annotations.
+
+    The index is memoized per class by ``AnnotationUtils.get_member_index``
+    and rebuilt once an annotation has been added to one of its functions afterwards.
+    The classes owning each function are recorded when the indexes are built,
+    so that adding an annotation only invalidates the indexes of these classes.
+    The annotated functions are grouped by each annotation type in the MRO of the annotation,
+    so that querying a base annotation type also finds the functions annotated with its subclasses.
+    """
+
+    def __init__(self, cls: type):
+        self.annotated_functions: List[Tuple[str, Callable]] = []
+        self._functions_by_annotation = {}
+        for name in dir(cls):
+            func = getattr(cls, name, None)
+            if inspect.isfunction(func):
+                _function_owners.setdefault(func, WeakSet()).add(cls)
+                annotations = AnnotationUtils.get_annotations(func)
+                if annotations:
+                    self.annotated_functions.append((name, func))
+                    for a in annotations:
+                        for t in type(a).__mro__:
+                            if issubclass(t, Annotation):
+                                self._functions_by_annotation.setdefault(t, []).append((name, func, a))
+
+    def get_annotated_functions(self, annotation_type: Type[Annotation]) -> List[Tuple[str, Callable, Annotation]]:
+        return self._functions_by_annotation.get(annotation_type, [])
+
+
+_member_indexes = WeakKeyDictionary()
+# the classes whose indexes contain each function
+_function_owners = WeakKeyDictionary()
+_member_index_lock = threading.RLock()
@@ -1,36 +1,93 @@
+import logging
 from importlib import import_module
+from os.path import join
+from typing import Optional, Tuple
 
 from flask import Blueprint, Flask
 
-from guniflask.config.app_settings import Settings
+from guniflask.beans.startup_profiler import StartupProfiler
+from guniflask.config.app_settings import Settings, getbool, getint
 from guniflask.config.env import app_name_from_env
 from guniflask.config.load_utils import load_app_settings
+from guniflask.context.annotation_config_registry import ModuleBeanDefinitionScanner
 from guniflask.security_config.authentication_config import AuthenticationConfiguration
 from guniflask.security_config.web_security_config import WebSecurityConfiguration
 from guniflask.utils.path import walk_modules
+from guniflask.utils.scan_index import ModuleScanIndex
 from guniflask.web.context import WebApplicationContext
+from guniflask.web.event_multicaster import WebAsyncEventMulticaster
 from guniflask.web.health_check import HealthCheckConfiguration
+from guniflask.web.json_codec import JsonCodecProvider, create_json_codec
 from guniflask.web.scheduling_config import WebAsyncConfiguration, WebSchedulingConfiguration
 
+log = logging.getLogger(__name__)
+
 
 class AppInitializer:
     def __init__(self):
         self.name = app_name_from_env()
         app_settings = load_app_settings(self.name)
         self.settings = Settings(app_settings)
+        self._scan_index = None
 
     def init(self, app=None, with_context=True):
         if app is None:
             app = Flask(self.name)
         self._make_settings(app)
+        self._scan_index = self._load_scan_index()
         if with_context:
             self._create_bean_context(app)
         self._init_app(app)
         with app.app_context():
             self._register_blueprints(app)
             self._refresh_bean_context(app)
+        if self._scan_index is not None and self._scan_index.modified:
+            self._scan_index.save()
         return app
 
+    def build_scan_index(self, index_file: str = None) -> ModuleScanIndex:
+        """
+        Import all the modules of the app and save the index of the modules containing components or blueprints.
+        """
+        app = Flask(self.name)
+        self._make_settings(app)
+        self._init_app(app)
+        index_file = index_file or self._get_scan_index_file()
+        if index_file is None:
+            raise ValueError('Cannot locate the scan index file without the home of the project, '
+                             'please specify the file or set GUNIFLASK_HOME')
+        scan_index = self._create_scan_index(index_file)
+        with app.app_context():
+            scan_index.build(self.settings['app_name'])
+        scan_index.save()
+        return scan_index
+
+    def _load_scan_index(self):
+        if not self.settings.get_by_prefix('guniflask.scan_index'):
+            return
+        index_file = self._get_scan_index_file()
+        if index_file is None:
+            log.warning('The scan index is disabled since the home of the project is unknown, '
+                        'please configure the path of the index file by "guniflask.scan_index"')
+            return
+        scan_index = self._create_scan_index(index_file)
+        scan_index.load()
+        return scan_index
+
+    def _get_scan_index_file(self) -> Optional[str]:
+        index_file = self.settings.get_by_prefix('guniflask.scan_index')
+        if isinstance(index_file, str):
+            return index_file
+        home = self.settings.get('home')
+        if home:
+            return join(home, '.scan_index.json')
+
+    def _create_scan_index(self, index_file: str) -> ModuleScanIndex:
+        return ModuleScanIndex(index_file, detectors={
+            'components': ModuleBeanDefinitionScanner.contains_components,
+            'blueprints': self._contains_blueprints,
+        })
+
     def _make_settings(self, app):
         app_module = self._get_app_module()
         _make_settings = getattr(app_module, 'make_settings', None)
@@ -43,6 +100,7 @@ class AppInitializer:
         for k, v in self.settings.items():
             if k.isupper():
                 app.config[k] = v
+        self._init_json_provider(app)
 
         app_module = self._get_app_module()
         _init_app = getattr(app_module, 'init_app', None)
@@ -50,11 +108,39 @@ class AppInitializer:
             s = self.settings
             _init_app(app, s)
 
+    def _init_json_provider(self, app):
+        json_codec = self.settings.get_by_prefix('guniflask.json_codec')
+        if json_codec:
+            if isinstance(json_codec, bool):
+                json_codec = 'auto'
+            app.json = JsonCodecProvider(app, create_json_codec(json_codec))
+
     def _create_bean_context(self, app):
         bean_context = WebApplicationContext(app)
+        bean_context.set_default_lazy_init(bool(getbool(self.settings.get_by_prefix('guniflask.lazy_init'))))
+        parallel_init, max_workers = self._get_parallel_init()
+        if parallel_init:
+            bean_context.set_parallel_instantiation(True, max_workers=max_workers)
+        if self.settings.get_by_prefix('guniflask.startup_profile'):
+            bean_context.set_startup_profiler(StartupProfiler())
+        if self._scan_index is not None:
+            bean_context.set_scan_index(self._scan_index)
+        async_listener_config = self.settings.get_by_prefix('guniflask.async_listener')
+        if async_listener_config:
+            if isinstance(async_listener_config, bool):
+                async_listener_config = {}
+            bean_context.set_event_multicaster(WebAsyncEventMulticaster(bean_context, **async_listener_config))
         self._auto_configure_bean_context(bean_context)
         setattr(app, 'bean_context', bean_context)
 
+    def _get_parallel_init(self) -> Tuple[bool, Optional[int]]:
+        parallel_init = self.settings.get_by_prefix('guniflask.parallel_init')
+        if not isinstance(parallel_init, bool):
+            max_workers = getint(parallel_init)
+            if max_workers is not None:
+                return max_workers > 0, max_workers
+        return bool(getbool(parallel_init)), None
+
     def _auto_configure_bean_context(self, bean_context: WebApplicationContext):
         bean_context.register(AuthenticationConfiguration)
         bean_context.register(WebSecurityConfiguration)
@@ -67,6 +153,17 @@ class AppInitializer:
             bean_context: WebApplicationContext = getattr(app, 'bean_context')
             bean_context.scan(self.settings['app_name'])
             bean_context.refresh()
+            if bean_context.startup_profiler is not None:
+                self._report_startup_profile(bean_context.startup_profiler)
+
+    def _report_startup_profile(self, startup_profiler: StartupProfiler):
+        config = self.settings.get_by_prefix('guniflask.startup_profile')
+        if not isinstance(config, dict):
+            config = {}
+        startup_profiler.log_summary(log, n=config.get('top', 10))
+        output = config.get('output')
+        if output:
+            startup_profiler.export(output, format=config.get('format'))
 
     def _register_blueprints(self, app):
         """
@@ -75,7 +172,11 @@ class AppInitializer:
         registered_blueprints = set()
 
         def iter_blueprints():
-            for module in walk_modules(self.settings['app_name']):
+            if self._scan_index is None:
+                modules = walk_modules(self.settings['app_name'])
+            else:
+                modules = self._scan_index.walk_modules(self.settings['app_name'], 'blueprints')
+            for module in modules:
                 for obj in vars(module).values():
                     if isinstance(obj, Blueprint) and obj not in registered_blueprints:
                         yield obj
@@ -86,5 +187,12 @@ class AppInitializer:
 
         del registered_blueprints
 
+    @staticmethod
+    def _contains_blueprints(module) -> bool:
+        for obj in vars(module).values():
+            if isinstance(obj, Blueprint):
+                return True
+        return False
+
     def _get_app_module(self):
         return import_module(self.settings['app_name'] + '.app')
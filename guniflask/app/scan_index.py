@@ -0,0 +1,27 @@
+"""
+Prebuild the module scan index of the app, e.g. at deploy time, so that the workers only import
+the modules containing components or blueprints on startup.
+
+Usage: python -m guniflask.app.scan_index [-o INDEX_FILE]
+"""
+import argparse
+
+from guniflask.app.initializer import AppInitializer
+from guniflask.config.env import load_app_env
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m guniflask.app.scan_index',
+                                     description='Build the module scan index of the app.')
+    parser.add_argument('-o', '--output', dest='index_file',
+                        help='the index file, defaults to the file configured by "guniflask.scan_index"')
+    args = parser.parse_args(argv)
+
+    load_app_env()
+    app_initializer = AppInitializer()
+    scan_index = app_initializer.build_scan_index(args.index_file)
+    print(f'Built the module scan index: {scan_index.index_file}')
+
+
+if __name__ == '__main__':
+    main()
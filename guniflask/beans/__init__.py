@@ -9,4 +9,7 @@ from .lifecycle import DisposableBean
 from .lifecycle import InitializingBean
 from .lifecycle import SmartInitializingSingleton
 from .post_processor import BeanPostProcessor
+from .proxy import BeanProxy
+from .scope import Scope
+from .scope import ThreadScope
 from .singleton_registry import SingletonBeanRegistry
@@ -1,55 +1,135 @@
 import inspect
+from typing import Any, List
+from weakref import WeakKeyDictionary
 
 from guniflask.beans.errors import NoUniqueBeanDefinitionError, BeansError
-from guniflask.beans.factory import BeanFactory
+from guniflask.beans.factory import BeanFactory, ConfigurableBeanFactory
 from guniflask.data_model.typing import inspect_args, analyze_arg_type
 
 
+class InjectionPoint:
+    BY_NAME = 'by_name'
+    BY_TYPE = 'by_type'
+    LIST = 'list'
+    SET = 'set'
+    UNRESOLVABLE = 'unresolvable'
+
+    __slots__ = ('name', 'required_type', 'bean_type', 'mode', 'default', 'required')
+
+    def __init__(self, name: str, required_type: Any, bean_type: type, mode: str, default: Any):
+        self.name = name
+        self.required_type = required_type
+        self.bean_type = bean_type
+        self.mode = mode
+        self.default = default
+        self.required = default is inspect._empty
+
+
+class InjectionPlan:
+    __slots__ = ('injection_points',)
+
+    def __init__(self, injection_points: List[InjectionPoint]):
+        self.injection_points = injection_points
+
+
+_injection_plans = WeakKeyDictionary()
+
+
 class ConstructorResolver:
     def __init__(self, bean_factory: BeanFactory):
         self._bean_factory = bean_factory
+        if isinstance(bean_factory, ConfigurableBeanFactory):
+            self._get_bean = bean_factory.get_injectable_bean
+        else:
+            self._get_bean = bean_factory.get_bean
 
     def instantiate(self, func):
-        args, hints = inspect_args(func)
+        plan = self.get_injection_plan(func)
 
         args_value = []
         kwargs_value = {}
-        for name, default in args.items():
-            required_type = hints.get(name)
-            v = self._resolve_arg(name, required_type)
-            if default is inspect._empty:
+        for p in plan.injection_points:
+            v = self._resolve_injection_point(p)
+            if p.required:
                 if v is None:
-                    raise ValueError(f'The argument named "{name}" cannot be resolved')
+                    raise ValueError(f'The argument named "{p.name}" cannot be resolved')
                 args_value.append(v)
             else:
                 if v is None:
-                    kwargs_value[name] = default
+                    kwargs_value[p.name] = p.default
                 else:
-                    kwargs_value[name] = v
+                    kwargs_value[p.name] = v
 
         return func(*args_value, **kwargs_value)
 
-    def _resolve_arg(self, arg, required_type):
-        bean = None
-        arg_ = analyze_arg_type(required_type)
+    @staticmethod
+    def get_injection_plan(func) -> InjectionPlan:
+        """
+        Get the injection plan of a callable, which is compiled once and cached per function object.
+        The plan of a bound method is cached on its underlying function.
+        """
+        if inspect.ismethod(func):
+            key, index = func.__func__, 1
+        else:
+            key, index = func, 0
+        try:
+            plans = _injection_plans.get(key)
+        except TypeError:
+            return ConstructorResolver._compile_injection_plan(func)
+        if plans is None:
+            plans = [None, None]
+            _injection_plans[key] = plans
+        plan = plans[index]
+        if plan is None:
+            plan = ConstructorResolver._compile_injection_plan(func)
+            plans[index] = plan
+        return plan
 
-        if arg_.outer_type is None:
+    @staticmethod
+    def _compile_injection_plan(func) -> InjectionPlan:
+        args, hints = inspect_args(func)
+        injection_points = []
+        for name, default in args.items():
+            required_type = hints.get(name)
+            arg_ = analyze_arg_type(required_type)
+            bean_type = None
+            if arg_.outer_type is None:
+                mode = InjectionPoint.BY_NAME
+            elif inspect.isclass(arg_.outer_type):
+                bean_type = arg_.outer_type
+                if arg_.is_list():
+                    mode = InjectionPoint.LIST
+                elif arg_.is_set():
+                    mode = InjectionPoint.SET
+                elif arg_.is_singleton():
+                    mode = InjectionPoint.BY_TYPE
+                else:
+                    mode = InjectionPoint.UNRESOLVABLE
+            else:
+                mode = InjectionPoint.UNRESOLVABLE
+            injection_points.append(InjectionPoint(name, required_type, bean_type, mode, default))
+        return InjectionPlan(injection_points)
+
+    def _resolve_injection_point(self, p: InjectionPoint):
+        mode = p.mode
+        if mode == InjectionPoint.BY_NAME:
             try:
-                bean = self._bean_factory.get_bean(arg)
+                return self._get_bean(p.name)
             except BeansError:
-                pass
-        elif inspect.isclass(arg_.outer_type):
-            candidates = self._bean_factory.get_beans_of_type(arg_.outer_type)
-            if arg_.is_list():
-                bean = list(candidates.values())
-            elif arg_.is_set():
-                bean = set(candidates.values())
-            elif arg_.is_singleton():
-                if len(candidates) == 1:
-                    bean = list(candidates.values())[0]
-                elif len(candidates) > 1:
-                    if arg in candidates:
-                        bean = candidates[arg]
-                    else:
-                        raise NoUniqueBeanDefinitionError(required_type)
-        return bean
+                return None
+        if mode == InjectionPoint.UNRESOLVABLE:
+            return None
+
+        candidates = {}
+        for bean_name in self._bean_factory.get_bean_names_for_type(p.bean_type):
+            candidates[bean_name] = self._get_bean(bean_name, required_type=p.bean_type)
+        if mode == InjectionPoint.LIST:
+            return list(candidates.values())
+        if mode == InjectionPoint.SET:
+            return set(candidates.values())
+        if len(candidates) == 1:
+            return next(iter(candidates.values()))
+        if len(candidates) > 1:
+            if p.name in candidates:
+                return candidates[p.name]
+            raise NoUniqueBeanDefinitionError(p.required_type)
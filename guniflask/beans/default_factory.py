@@ -1,23 +1,41 @@
+import contextvars
 import inspect
+import logging
+import threading
+import time
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from functools import partial
-from typing import List, get_type_hints
+from typing import List, Set, get_type_hints
 
-from guniflask.beans.constructor_resolver import ConstructorResolver
+from guniflask.beans.constructor_resolver import ConstructorResolver, InjectionPoint
 from guniflask.beans.definition import BeanDefinition
 from guniflask.beans.definition_registry import BeanDefinitionRegistry
+from guniflask.beans.dependency_graph import BeanDependencyGraph
 from guniflask.beans.errors import BeanTypeNotDeclaredError, BeanTypeNotAllowedError, BeanCreationError, \
-    BeanNotOfRequiredTypeError, NoUniqueBeanDefinitionError
+    BeanNotOfRequiredTypeError, NoUniqueBeanDefinitionError, BeanCurrentlyInCreationError, BeansError, \
+    BeanDependencyCycleError, BeanCreationDeadlockError
 from guniflask.beans.errors import NoSuchBeanDefinitionError, BeanDefinitionStoreError
 from guniflask.beans.factory import BeanFactoryAware, BeanNameAware, ConfigurableBeanFactory
+from guniflask.beans.factory_post_processor import BeanFactoryPostProcessor
 from guniflask.beans.lifecycle import InitializingBean, SmartInitializingSingleton, DisposableBean
 from guniflask.beans.post_processor import BeanPostProcessor
+from guniflask.beans.proxy import BeanProxy
+from guniflask.beans.scope import Scope, ThreadScope
+from guniflask.beans.startup_profiler import StartupProfiler
+from guniflask.beans.startup_report import StartupReport
+from guniflask.beans.type_index import BeanTypeIndex
+
+log = logging.getLogger(__name__)
 
 
 class AbstractBeanFactory(ConfigurableBeanFactory, metaclass=ABCMeta):
     def __init__(self):
         super().__init__()
         self._bean_post_processors = []
+        self._scopes = {}
+        self._prototypes_currently_in_creation = threading.local()
+        self._default_lazy_init = False
 
     def add_bean_post_processor(self, bean_post_processor: BeanPostProcessor):
         try:
@@ -30,6 +48,17 @@ class AbstractBeanFactory(ConfigurableBeanFactory, metaclass=ABCMeta):
     def bean_post_processors(self) -> List[BeanPostProcessor]:
         return self._bean_post_processors
 
+    def register_scope(self, scope_name: str, scope: Scope):
+        if scope_name in (BeanDefinition.SCOPE_SINGLETON, BeanDefinition.SCOPE_PROTOTYPE):
+            raise ValueError(f'Cannot replace the built-in scope "{scope_name}"')
+        self._scopes[scope_name] = scope
+
+    def get_registered_scope(self, scope_name: str) -> Scope:
+        return self._scopes.get(scope_name)
+
+    def get_registered_scope_names(self) -> List[str]:
+        return list(self._scopes.keys())
+
     def get_bean(self, bean_name, required_type: type = None):
         bean = None
 
@@ -44,8 +73,14 @@ class AbstractBeanFactory(ConfigurableBeanFactory, metaclass=ABCMeta):
                     partial(self.create_bean, bean_name, bean_definition),
                 )
             elif bean_definition.is_prototype():
-                # FIXME: support prototype
-                raise RuntimeError('Do not support prototype now')
+                self._before_prototype_creation(bean_name)
+                try:
+                    bean = self.create_bean(bean_name, bean_definition)
+                finally:
+                    self._after_prototype_creation(bean_name)
+            else:
+                scope = self._get_scope(bean_name, bean_definition)
+                bean = scope.get(bean_name, partial(self.create_bean, bean_name, bean_definition))
 
         # Check if required type matches the type of the actual bean instance.
         if bean is not None and required_type is not None:
@@ -53,6 +88,60 @@ class AbstractBeanFactory(ConfigurableBeanFactory, metaclass=ABCMeta):
                 raise BeanNotOfRequiredTypeError(bean, required_type, type(bean))
         return bean
 
+    def get_injectable_bean(self, bean_name: str, required_type: type = None):
+        if self.get_singleton(bean_name) is None and self.contains_bean_definition(bean_name):
+            bean_definition = self.get_bean_definition(bean_name)
+            if bean_definition.is_singleton():
+                if self.is_lazy_init(bean_name, bean_definition):
+                    return BeanProxy(partial(self.get_bean, bean_name), bean_name=bean_name)
+            elif not bean_definition.is_prototype():
+                scope = self._get_scope(bean_name, bean_definition)
+                target_source = partial(scope.get, bean_name, partial(self.create_bean, bean_name, bean_definition))
+                return BeanProxy(target_source, bean_name=bean_name)
+        return self.get_bean(bean_name, required_type=required_type)
+
+    def set_default_lazy_init(self, default_lazy_init: bool):
+        self._default_lazy_init = default_lazy_init
+
+    @property
+    def is_default_lazy_init(self) -> bool:
+        return self._default_lazy_init
+
+    def is_lazy_init(self, bean_name: str, bean_definition: BeanDefinition) -> bool:
+        if bean_definition.lazy_init is not None:
+            return bean_definition.lazy_init
+        if not self._default_lazy_init:
+            return False
+        return not self._requires_eager_init(bean_name, bean_definition)
+
+    def _requires_eager_init(self, bean_name: str, bean_definition: BeanDefinition) -> bool:
+        """
+        Whether the bean must be created on startup even if singletons are lazily initialized by default.
+        """
+        bean_type = self._resolve_bean_type(bean_name, bean_definition)
+        if bean_type is None:
+            return True
+        return issubclass(bean_type, (SmartInitializingSingleton, BeanPostProcessor, BeanFactoryPostProcessor))
+
+    def _get_scope(self, bean_name: str, bean_definition: BeanDefinition) -> Scope:
+        scope = self._scopes.get(bean_definition.scope)
+        if scope is None:
+            raise BeansError(f'No scope registered for scope name "{bean_definition.scope}" '
+                             f'of the bean named "{bean_name}"')
+        return scope
+
+    def _before_prototype_creation(self, bean_name: str):
+        names = getattr(self._prototypes_currently_in_creation, 'names', None)
+        if names is None:
+            names = set()
+            self._prototypes_currently_in_creation.names = names
+        if bean_name in names:
+            raise BeanCurrentlyInCreationError(bean_name)
+        names.add(bean_name)
+
+    def _after_prototype_creation(self, bean_name: str):
+        self._prototypes_currently_in_creation.names.discard(bean_name)
+
     def get_bean_of_type(self, required_type: type):
         candidates = self.get_beans_of_type(required_type)
         if len(candidates) == 1:
@@ -111,27 +200,227 @@ class DefaultBeanFactory(AbstractBeanFactory, BeanDefinitionRegistry):
         self._constructor_resolver = ConstructorResolver(self)
         self._bean_definition_map = {}
         self._allow_bean_definition_overriding = True
+        self._resolved_bean_types = {}
+        self._bean_type_index = BeanTypeIndex()
+        self._bean_type_index_lock = threading.RLock()
+        self._startup_report = None
+        self._recording_startup = False
+        self._parallel_instantiation = False
+        self._parallel_instantiation_workers = None
+        self._startup_profiler = None
+        self.register_scope(BeanDefinition.SCOPE_THREAD, ThreadScope())
 
     def get_bean_names_for_type(self, required_type: type) -> List[str]:
-        names = []
-        for bean_name in self._bean_definition_map:
-            if self.is_type_match(bean_name, required_type):
-                names.append(bean_name)
-        return names
+        with self._bean_type_index_lock:
+            if not self._bean_type_index.is_built:
+                self._build_bean_type_index()
+            return list(self._bean_type_index.get_bean_names(required_type))
+
+    def get_bean_type_index_stats(self) -> dict:
+        with self._bean_type_index_lock:
+            stats = self._bean_type_index.stats()
+        stats['resolved_bean_types'] = len(self._resolved_bean_types)
+        return stats
+
+    def _invalidate_bean_type_index(self):
+        with self._bean_type_index_lock:
+            self._bean_type_index.invalidate()
+
+    def _build_bean_type_index(self):
+        bean_types = {}
+        for bean_name, bean_definition in list(self._bean_definition_map.items()):
+            bean = self.get_singleton(bean_name)
+            if bean is not None:
+                bean_types[bean_name] = type(bean)
+            else:
+                bean_types[bean_name] = self._resolve_bean_type(bean_name, bean_definition)
+        self._bean_type_index.build(bean_types)
+
+    @property
+    def startup_report(self) -> StartupReport:
+        return self._startup_report
+
+    def set_startup_profiler(self, startup_profiler: StartupProfiler = None):
+        """
+        Record the steps of the startup, including the creation of beans and the calls to post-processors.
+        """
+        self._startup_profiler = startup_profiler
+
+    @property
+    def startup_profiler(self) -> StartupProfiler:
+        return self._startup_profiler
+
+    def _startup_step(self, name: str, category: str = 'phase', **tags):
+        if self._startup_profiler is None:
+            return _noop_step
+        return self._startup_profiler.step(name, category, **tags)
 
     def pre_instantiate_singletons(self):
-        bean_names = self.get_bean_definition_names()
-        for bean_name in bean_names:
-            bean_definition = self.get_bean_definition(bean_name)
-            if bean_definition.is_singleton():
-                self.get_bean(bean_name)
+        self._startup_report = StartupReport()
+        self._recording_startup = True
+        start_time = time.perf_counter()
+        try:
+            bean_names = self.get_bean_definition_names()
+            eager_bean_names = []
+            lazy_bean_names = []
+            for bean_name in bean_names:
+                bean_definition = self.get_bean_definition(bean_name)
+                if bean_definition.is_singleton():
+                    if self.is_lazy_init(bean_name, bean_definition):
+                        lazy_bean_names.append(bean_name)
+                    else:
+                        eager_bean_names.append(bean_name)
+            if self._parallel_instantiation and len(eager_bean_names) > 1:
+                self._instantiate_singletons_in_parallel(eager_bean_names)
+            else:
+                for bean_name in eager_bean_names:
+                    self.get_bean(bean_name)
+        finally:
+            self._recording_startup = False
+            self._startup_report.total_time = time.perf_counter() - start_time
+        for bean_name in lazy_bean_names:
+            if not self.contains_singleton(bean_name):
+                self._startup_report.add_deferred_bean(bean_name)
 
         for bean_name in bean_names:
             singleton = self.get_singleton(bean_name)
             if isinstance(singleton, SmartInitializingSingleton):
                 singleton.after_singletons_instantiated()
 
+        self._startup_report.log(log)
+
+    def set_parallel_instantiation(self, parallel_instantiation: bool, max_workers: int = None):
+        """
+        Instantiate independent singletons concurrently on a thread pool when pre-instantiating singletons.
+        """
+        self._parallel_instantiation = parallel_instantiation
+        self._parallel_instantiation_workers = max_workers
+
+    def _instantiate_singletons_in_parallel(self, bean_names: List[str]):
+        graph = self.get_bean_dependency_graph(bean_names)
+        cycles = graph.find_cycles()
+        if cycles:
+            raise BeanDependencyCycleError(cycles)
+
+        waiting = {bean_name: graph.get_dependencies(bean_name) for bean_name in bean_names}
+        dependents = graph.get_dependents()
+        with ThreadPoolExecutor(max_workers=self._parallel_instantiation_workers,
+                                thread_name_prefix='bean-instantiation') as executor:
+            futures = {}
+            for bean_name in bean_names:
+                if not waiting[bean_name]:
+                    futures[self._submit_bean_creation(executor, bean_name)] = bean_name
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for f in done:
+                    bean_name = futures.pop(f)
+                    f.result()
+                    for d in dependents[bean_name]:
+                        waiting[d].discard(bean_name)
+                        if not waiting[d]:
+                            futures[self._submit_bean_creation(executor, d)] = d
+
+    def _submit_bean_creation(self, executor: ThreadPoolExecutor, bean_name: str) -> Future:
+        # create the bean in a copy of the caller's context, e.g. with the application context of Flask
+        return executor.submit(contextvars.copy_context().run, self.get_bean, bean_name)
+
+    def get_bean_dependency_graph(self, bean_names: List[str] = None) -> BeanDependencyGraph:
+        """
+        Build the dependency graph of the beans from their constructors, factory beans and injection methods.
+        The dependencies on prototype beans are replaced by the dependencies of the prototype beans.
+        """
+        if bean_names is None:
+            bean_names = self.get_bean_definition_names()
+        graph = BeanDependencyGraph()
+        prototype_dependencies = {}
+        for bean_name in bean_names:
+            dependencies = set()
+            for d in self._resolve_bean_dependencies(bean_name):
+                if self.contains_bean_definition(d) and self.get_bean_definition(d).is_prototype():
+                    dependencies.update(self._resolve_prototype_dependencies(d, prototype_dependencies))
+                else:
+                    dependencies.add(d)
+            graph.add_bean(bean_name, dependencies)
+        return graph
+
+    def _resolve_prototype_dependencies(self, bean_name: str, resolved: dict) -> Set[str]:
+        if bean_name in resolved:
+            return resolved[bean_name]
+        resolved[bean_name] = dependencies = set()
+        for d in self._resolve_bean_dependencies(bean_name):
+            if self.contains_bean_definition(d) and self.get_bean_definition(d).is_prototype():
+                if d != bean_name:
+                    dependencies.update(self._resolve_prototype_dependencies(d, resolved))
+            else:
+                dependencies.add(d)
+        return dependencies
+
+    def _resolve_bean_dependencies(self, bean_name: str) -> Set[str]:
+        bean_definition = self.get_bean_definition(bean_name)
+        dependencies = set()
+        if bean_definition.factory_bean_name is not None:
+            dependencies.add(bean_definition.factory_bean_name)
+        for func, is_method in self._get_injection_callables(bean_name, bean_definition):
+            injection_points = ConstructorResolver.get_injection_plan(func).injection_points
+            if is_method:
+                injection_points = injection_points[1:]
+            for p in injection_points:
+                dependencies.update(self._resolve_injection_point_dependencies(p))
+        return dependencies
+
+    def _get_injection_callables(self, bean_name: str, bean_definition: BeanDefinition) -> list:
+        """
+        Get the callables whose arguments are injected when creating the bean,
+        with a flag indicating whether the first argument is bound to an instance.
+        """
+        callables = []
+        source = bean_definition.source
+        if inspect.isclass(source):
+            callables.append((source, False))
+        elif inspect.isfunction(source):
+            is_method = False
+            if bean_definition.factory_bean_name is not None:
+                factory_bean_type = self._resolve_bean_type(bean_definition.factory_bean_name,
+                                                            self.get_bean_definition(bean_definition.factory_bean_name))
+                attr = inspect.getattr_static(factory_bean_type, source.__name__, None)
+                is_method = not isinstance(attr, staticmethod)
+            callables.append((source, is_method))
+        elif inspect.ismethod(source):
+            callables.append((source, False))
+        bean_type = self._resolve_bean_type(bean_name, bean_definition)
+        if bean_type is not None:
+            for post_processor in self.bean_post_processors:
+                for method in post_processor.determine_injection_methods(bean_type, bean_name):
+                    callables.append((method, True))
+        return callables
+
+    def _resolve_injection_point_dependencies(self, p: InjectionPoint) -> List[str]:
+        if p.mode == InjectionPoint.BY_NAME:
+            if self.contains_bean_definition(p.name):
+                return [p.name]
+            return []
+        if p.mode == InjectionPoint.UNRESOLVABLE:
+            return []
+        bean_names = self.get_bean_names_for_type(p.bean_type)
+        if p.mode == InjectionPoint.BY_TYPE and len(bean_names) > 1 and p.name in bean_names:
+            return [p.name]
+        return bean_names
+
     def create_bean(self, bean_name: str, bean_definition: BeanDefinition):
+        if self._startup_profiler is not None:
+            with self._startup_profiler.step(bean_name, 'bean', scope=bean_definition.scope):
+                return self._record_bean_creation(bean_name, bean_definition)
+        return self._record_bean_creation(bean_name, bean_definition)
+
+    def _record_bean_creation(self, bean_name: str, bean_definition: BeanDefinition):
+        if self._recording_startup and bean_definition.is_singleton():
+            start_time = time.perf_counter()
+            bean = self._create_bean(bean_name, bean_definition)
+            self._startup_report.record_bean_creation(bean_name, time.perf_counter() - start_time)
+            return bean
+        return self._create_bean(bean_name, bean_definition)
+
+    def _create_bean(self, bean_name: str, bean_definition: BeanDefinition):
         bean = self._resolve_before_instantiation(bean_name, bean_definition)
         if bean is not None:
             return bean
@@ -171,22 +460,34 @@ class DefaultBeanFactory(AbstractBeanFactory, BeanDefinitionRegistry):
             raise BeanCreationError(bean_name)
         try:
             bean = self._constructor_resolver.instantiate(func)
+        except BeanCreationDeadlockError:
+            raise
         except Exception as e:
             raise BeanCreationError(bean_name, message=f'Cannot create bean named "{bean_name}"\n{e}')
         return bean
 
     def _resolve_bean_type(self, bean_name: str, bean_definition: BeanDefinition) -> type:
-        source = bean_definition.source
-        if inspect.isclass(source):
-            return source
-        if inspect.isfunction(source) or inspect.ismethod(source):
-            hints = get_type_hints(source)
-            if 'return' not in hints:
-                raise BeanTypeNotDeclaredError(bean_name)
-            bean_type = hints['return']
-            if not inspect.isclass(bean_type):
-                raise BeanTypeNotAllowedError(bean_name, bean_type)
-            return bean_type
+        resolved = self._resolved_bean_types.get(bean_name)
+        if resolved is not None and resolved[0] is bean_definition:
+            return resolved[1]
+        bean_type = super()._resolve_bean_type(bean_name, bean_definition)
+        self._resolved_bean_types[bean_name] = (bean_definition, bean_type)
+        return bean_type
+
+    def _add_singleton(self, bean_name, singleton_obj):
+        with self._bean_type_index_lock:
+            super()._add_singleton(bean_name, singleton_obj)
+            if self._bean_type_index.is_built and bean_name in self._bean_definition_map:
+                if type(singleton_obj) is not self._bean_type_index.get_bean_type(bean_name):
+                    self._bean_type_index.update_bean_type(bean_name, type(singleton_obj))
+
+    def _remove_singleton(self, bean_name):
+        with self._bean_type_index_lock:
+            super()._remove_singleton(bean_name)
+            if self._bean_type_index.is_built and bean_name in self._bean_definition_map:
+                bean_type = self._resolved_bean_types.get(bean_name, (None, None))[1]
+                if bean_type is not self._bean_type_index.get_bean_type(bean_name):
+                    self._bean_type_index.update_bean_type(bean_name, bean_type)
 
     def _resolve_before_instantiation(self, bean_name: str, bean_definition: BeanDefinition):
         bean = None
@@ -217,27 +518,45 @@ class DefaultBeanFactory(AbstractBeanFactory, BeanDefinitionRegistry):
 
     def _apply_bean_post_processors_before_instantiation(self, bean_type: type, bean_name: str):
         for post_processor in self.bean_post_processors:
-            result = post_processor.post_process_before_instantiation(bean_type, bean_name)
+            if self._startup_profiler is None:
+                result = post_processor.post_process_before_instantiation(bean_type, bean_name)
+            else:
+                result = self._invoke_post_processor_hook(post_processor.post_process_before_instantiation, bean_type, bean_name)
             if result is not None:
                 return result
 
     def _apply_bean_post_processors_before_initialization(self, bean, bean_name: str):
         for post_processor in self.bean_post_processors:
-            result = post_processor.post_process_before_initialization(bean, bean_name)
+            if self._startup_profiler is None:
+                result = post_processor.post_process_before_initialization(bean, bean_name)
+            else:
+                result = self._invoke_post_processor_hook(post_processor.post_process_before_initialization, bean, bean_name)
             if result is not None:
                 bean = result
         return bean
 
     def _apply_bean_post_processors_after_initialization(self, bean, bean_name: str):
         for post_processor in self.bean_post_processors:
-            result = post_processor.post_process_after_initialization(bean, bean_name)
+            if self._startup_profiler is None:
+                result = post_processor.post_process_after_initialization(bean, bean_name)
+            else:
+                result = self._invoke_post_processor_hook(post_processor.post_process_after_initialization, bean, bean_name)
             if result is not None:
                 bean = result
         return bean
 
+    def _invoke_post_processor_hook(self, hook, arg, bean_name: str):
+        with self._startup_profiler.step(f'{type(hook.__self__).__name__}.{hook.__name__}', 'post_processor',
+                                         bean_name=bean_name):
+            return hook(arg, bean_name)
+
     def _register_disposable_bean_if_necessary(self, bean_name: str, bean, bean_definition: BeanDefinition):
-        if bean_definition.is_singleton() and isinstance(bean, DisposableBean):
-            self.register_disposable_bean(bean_name, bean)
+        if isinstance(bean, DisposableBean):
+            if bean_definition.is_singleton():
+                self.register_disposable_bean(bean_name, bean)
+            elif not bean_definition.is_prototype():
+                scope = self._get_scope(bean_name, bean_definition)
+                scope.register_destruction_callback(bean_name, bean.destroy)
 
     def set_allow_bean_definition_overriding(self, allow_bean_definition_overriding: bool):
         self._allow_bean_definition_overriding = allow_bean_definition_overriding
@@ -252,6 +571,8 @@ class DefaultBeanFactory(AbstractBeanFactory, BeanDefinitionRegistry):
             if not self.is_allow_bean_definition_overriding:
                 raise BeanDefinitionStoreError(f'A bean named "{bean_name}" is already bound')
         self._bean_definition_map[bean_name] = bean_definition
+        self._resolved_bean_types.pop(bean_name, None)
+        self._invalidate_bean_type_index()
 
     def get_bean_definition(self, bean_name: str) -> BeanDefinition:
         bean_definition = self._bean_definition_map.get(bean_name)
@@ -269,3 +590,16 @@ class DefaultBeanFactory(AbstractBeanFactory, BeanDefinitionRegistry):
         if bean_name not in self._bean_definition_map:
             raise NoSuchBeanDefinitionError(bean_name)
         self._bean_definition_map.pop(bean_name)
+        self._resolved_bean_types.pop(bean_name, None)
+        self._invalidate_bean_type_index()
+
+
+class _NoopStep:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_noop_step = _NoopStep()
@@ -1,11 +1,14 @@
 class BeanDefinition:
     SCOPE_SINGLETON = 'singleton'
     SCOPE_PROTOTYPE = 'prototype'
+    SCOPE_REQUEST = 'request'
+    SCOPE_THREAD = 'thread'
 
     def __init__(self, source):
         self._source = source
         self.scope = self.SCOPE_SINGLETON
         self.factory_bean_name = None
+        self.lazy_init = None
 
     @property
     def source(self):
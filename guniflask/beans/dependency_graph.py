@@ -0,0 +1,101 @@
+from typing import Dict, List, Set
+
+
+class BeanDependencyGraph:
+    """
+    Graph of the dependencies between beans, in which each bean points to the beans it depends on.
+    """
+
+    def __init__(self):
+        self._dependencies: Dict[str, Set[str]] = {}
+
+    def add_bean(self, bean_name: str, dependencies=None):
+        if bean_name not in self._dependencies:
+            self._dependencies[bean_name] = set()
+        if dependencies:
+            self._dependencies[bean_name].update(dependencies)
+
+    @property
+    def bean_names(self) -> List[str]:
+        return list(self._dependencies.keys())
+
+    def get_dependencies(self, bean_name: str) -> Set[str]:
+        """
+        Get the dependencies of the bean which are also in the graph.
+        """
+        return {d for d in self._dependencies.get(bean_name, ()) if d in self._dependencies}
+
+    def get_dependents(self) -> Dict[str, List[str]]:
+        dependents = {bean_name: [] for bean_name in self._dependencies}
+        for bean_name in self._dependencies:
+            for d in self.get_dependencies(bean_name):
+                dependents[d].append(bean_name)
+        return dependents
+
+    def find_cycles(self) -> List[List[str]]:
+        """
+        Find the strongly connected components which form cycles, using Tarjan's algorithm.
+        Each cycle is returned as a path whose first bean is repeated at the end.
+        """
+        index = {}
+        low_link = {}
+        stack = []
+        on_stack = set()
+        components = []
+        counter = [0]
+
+        for root in self._dependencies:
+            if root in index:
+                continue
+            index[root] = low_link[root] = counter[0]
+            counter[0] += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(sorted(self.get_dependencies(root))))]
+            while work:
+                node, it = work[-1]
+                for d in it:
+                    if d not in index:
+                        index[d] = low_link[d] = counter[0]
+                        counter[0] += 1
+                        stack.append(d)
+                        on_stack.add(d)
+                        work.append((d, iter(sorted(self.get_dependencies(d)))))
+                        break
+                    if d in on_stack:
+                        low_link[node] = min(low_link[node], index[d])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[node])
+                    if low_link[node] == index[node]:
+                        component = []
+                        while True:
+                            n = stack.pop()
+                            on_stack.discard(n)
+                            component.append(n)
+                            if n == node:
+                                break
+                        if len(component) > 1 or node in self._dependencies[node]:
+                            components.append(component)
+
+        return [self._find_cycle_path(set(c)) for c in components]
+
+    def _find_cycle_path(self, component: Set[str]) -> List[str]:
+        start = min(component)
+        path = [start]
+        visited = {start}
+        node = start
+        while True:
+            candidates = sorted(d for d in self.get_dependencies(node) if d in component)
+            if start in candidates:
+                path.append(start)
+                return path
+            node = next((d for d in candidates if d not in visited), candidates[0])
+            if node in visited:
+                path = path[path.index(node):]
+                path.append(node)
+                return path
+            visited.add(node)
+            path.append(node)
@@ -30,6 +30,14 @@ class BeanCurrentlyInCreationError(BeanCreationError):
                                             'Is there an unresolvable circular reference?"')
 
 
+class BeanCreationDeadlockError(BeanCreationError):
+    def __init__(self, bean_name, cycle):
+        self.cycle = cycle
+        waits = ', '.join(f'thread "{t}" waits for bean "{b}" created by thread "{cycle[(i + 1) % len(cycle)][0]}"'
+                          for i, (t, b) in enumerate(cycle))
+        super().__init__(bean_name, message=f'Deadlock detected when creating the bean named "{bean_name}": {waits}')
+
+
 class BeanNotOfRequiredTypeError(BeansError):
     def __init__(self, bean_name, required_type, actual_type):
         self.bean_name = bean_name
@@ -50,3 +58,17 @@ class BeanTypeNotAllowedError(BeansError):
         self.bean_name = bean_name
         self.bean_type = bean_type
         super().__init__(f'The type "{bean_type}" of bean named "{bean_name}" is not a allowed')
+
+
+class ScopeNotActiveError(BeansError):
+    def __init__(self, bean_name, scope_name):
+        self.bean_name = bean_name
+        self.scope_name = scope_name
+        super().__init__(f'Scope "{scope_name}" is not active for the bean named "{bean_name}"')
+
+
+class BeanDependencyCycleError(BeansError):
+    def __init__(self, cycles):
+        self.cycles = cycles
+        paths = '; '.join(' -> '.join(c) for c in cycles)
+        super().__init__(f'Circular dependencies between beans: {paths}')
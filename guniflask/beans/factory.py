@@ -2,6 +2,7 @@ from abc import ABCMeta, abstractmethod
 from typing import List
 
 from guniflask.beans.post_processor import BeanPostProcessor
+from guniflask.beans.scope import Scope
 from guniflask.beans.singleton_registry import SingletonBeanRegistry
 
 
@@ -45,6 +46,25 @@ class ConfigurableBeanFactory(SingletonBeanRegistry, BeanFactory, metaclass=ABCM
     def add_bean_post_processor(self, bean_post_processor: BeanPostProcessor):
         pass  # pragma: no cover
 
+    @abstractmethod
+    def register_scope(self, scope_name: str, scope: Scope):
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_registered_scope(self, scope_name: str) -> Scope:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_injectable_bean(self, bean_name: str, required_type: type = None):
+        """
+        Get the bean to inject into another bean, which is a proxy if the bean lives in a custom scope.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def set_default_lazy_init(self, default_lazy_init: bool):
+        pass  # pragma: no cover
+
     @abstractmethod
     def pre_instantiate_singletons(self):
         pass  # pragma: no cover
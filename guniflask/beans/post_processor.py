@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 
 class BeanPostProcessor:
@@ -10,3 +10,10 @@ class BeanPostProcessor:
 
     def post_process_after_initialization(self, bean: Any, bean_name: str) -> Any:
         return bean
+
+    def determine_injection_methods(self, bean_type: type, bean_name: str) -> List:
+        """
+        Determine the methods of the bean type whose arguments will be injected by this post-processor,
+        which are taken into account when resolving the dependencies of the bean.
+        """
+        return []
@@ -0,0 +1,105 @@
+class BeanProxy:
+    """
+    Lightweight proxy delegating to the target returned by the target source on each access.
+
+    Used to inject beans whose instance depends on the current context (e.g. request scoped beans)
+    into beans living longer than it.
+    """
+
+    __slots__ = ('__target_source', '__bean_name')
+
+    def __init__(self, target_source, bean_name: str = None):
+        object.__setattr__(self, '_BeanProxy__target_source', target_source)
+        object.__setattr__(self, '_BeanProxy__bean_name', bean_name)
+
+    def _get_target(self):
+        return self.__target_source()
+
+    @property
+    def __class__(self):
+        return self.__target_source().__class__
+
+    def __getattr__(self, name):
+        return getattr(self.__target_source(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.__target_source(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__target_source(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.__target_source()(*args, **kwargs)
+
+    def __repr__(self):
+        try:
+            target = self.__target_source()
+        except Exception:
+            return f'<{type(self).__name__} of bean "{self.__bean_name}">'
+        return repr(target)
+
+    def __str__(self):
+        return str(self.__target_source())
+
+    def __format__(self, format_spec):
+        return format(self.__target_source(), format_spec)
+
+    def __eq__(self, other):
+        return self.__target_source() == other
+
+    def __ne__(self, other):
+        return self.__target_source() != other
+
+    def __lt__(self, other):
+        return self.__target_source() < other
+
+    def __le__(self, other):
+        return self.__target_source() <= other
+
+    def __gt__(self, other):
+        return self.__target_source() > other
+
+    def __ge__(self, other):
+        return self.__target_source() >= other
+
+    def __hash__(self):
+        return hash(self.__target_source())
+
+    def __enter__(self):
+        return self.__target_source().__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.__target_source().__exit__(exc_type, exc_val, exc_tb)
+
+    async def __aenter__(self):
+        return await self.__target_source().__aenter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self.__target_source().__aexit__(exc_type, exc_val, exc_tb)
+
+    def __bool__(self):
+        return bool(self.__target_source())
+
+    def __len__(self):
+        return len(self.__target_source())
+
+    def __iter__(self):
+        return iter(self.__target_source())
+
+    def __next__(self):
+        return next(self.__target_source())
+
+    def __reversed__(self):
+        return reversed(self.__target_source())
+
+    def __contains__(self, item):
+        return item in self.__target_source()
+
+    def __getitem__(self, key):
+        return self.__target_source()[key]
+
+    def __setitem__(self, key, value):
+        self.__target_source()[key] = value
+
+    def __delitem__(self, key):
+        del self.__target_source()[key]
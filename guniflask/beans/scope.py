@@ -0,0 +1,94 @@
+import logging
+import threading
+from abc import ABCMeta, abstractmethod
+
+log = logging.getLogger(__name__)
+
+
+class Scope(metaclass=ABCMeta):
+    @abstractmethod
+    def get(self, bean_name: str, object_factory):
+        """
+        Return the object with the given name from the current scope, creating it by the factory if not present.
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def remove(self, bean_name: str):
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def register_destruction_callback(self, bean_name: str, callback):
+        pass  # pragma: no cover
+
+
+class ScopedObjects:
+    """
+    Objects and destruction callbacks held by a single scope instance, e.g. a request or a thread.
+    """
+
+    __slots__ = ('objects', 'destruction_callbacks')
+
+    def __init__(self):
+        self.objects = {}
+        self.destruction_callbacks = {}
+
+    def get(self, bean_name: str, object_factory):
+        obj = self.objects.get(bean_name)
+        if obj is None:
+            obj = object_factory()
+            if obj is not None:
+                self.objects[bean_name] = obj
+        return obj
+
+    def remove(self, bean_name: str):
+        obj = self.objects.pop(bean_name, None)
+        callback = self.destruction_callbacks.pop(bean_name, None)
+        if callback is not None:
+            try:
+                callback()
+            except Exception:
+                log.error(f'Failed to destroy the scoped bean named "{bean_name}"', exc_info=True)
+        return obj
+
+    def register_destruction_callback(self, bean_name: str, callback):
+        self.destruction_callbacks[bean_name] = callback
+
+    def destroy(self):
+        for bean_name in list(self.destruction_callbacks.keys()):
+            self.remove(bean_name)
+        self.objects.clear()
+
+
+class ThreadScope(Scope):
+    """
+    Scope holding an instance of the bean per thread (or per greenlet if threading is patched by gevent).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, bean_name: str, object_factory):
+        return self._get_scoped_objects().get(bean_name, object_factory)
+
+    def remove(self, bean_name: str):
+        return self._get_scoped_objects().remove(bean_name)
+
+    def register_destruction_callback(self, bean_name: str, callback):
+        self._get_scoped_objects().register_destruction_callback(bean_name, callback)
+
+    def destroy(self):
+        """
+        Destroy the objects held by the current thread.
+        """
+        scoped_objects = getattr(self._local, 'scoped_objects', None)
+        if scoped_objects is not None:
+            del self._local.scoped_objects
+            scoped_objects.destroy()
+
+    def _get_scoped_objects(self) -> ScopedObjects:
+        scoped_objects = getattr(self._local, 'scoped_objects', None)
+        if scoped_objects is None:
+            scoped_objects = ScopedObjects()
+            self._local.scoped_objects = scoped_objects
+        return scoped_objects
@@ -1,7 +1,8 @@
 import logging
+import threading
 from typing import List
 
-from guniflask.beans.errors import BeanCurrentlyInCreationError
+from guniflask.beans.errors import BeanCurrentlyInCreationError, BeanCreationDeadlockError
 from guniflask.beans.lifecycle import DisposableBean
 
 log = logging.getLogger(__name__)
@@ -12,6 +13,10 @@ class SingletonBeanRegistry:
         self._singleton_objects = {}
         self._singletons_currently_in_creation = set()
         self._disposable_beans = {}
+        self._singleton_lock = threading.RLock()
+        self._singleton_creation_locks = {}
+        self._singleton_creation_owners = {}
+        self._singleton_creation_waits = {}
 
     def register_singleton(self, bean_name: str, singleton_obj):
         old_object = self._singleton_objects.get(bean_name)
@@ -26,15 +31,71 @@ class SingletonBeanRegistry:
     def get_singleton_from_factory(self, bean_name: str, singleton_factory):
         singleton_obj = self._singleton_objects.get(bean_name)
         if singleton_obj is None:
-            self._before_singleton_creation(bean_name)
+            if self._singleton_creation_owners.get(bean_name) == threading.get_ident():
+                raise BeanCurrentlyInCreationError(bean_name)
+            lock = self._get_singleton_creation_lock(bean_name)
+            self._acquire_singleton_creation_lock(bean_name, lock)
             try:
-                singleton_obj = singleton_factory()
+                singleton_obj = self._singleton_objects.get(bean_name)
+                if singleton_obj is None:
+                    self._before_singleton_creation(bean_name)
+                    try:
+                        singleton_obj = singleton_factory()
+                    finally:
+                        self._after_singleton_creation(bean_name)
+                    if singleton_obj is not None:
+                        self._add_singleton(bean_name, singleton_obj)
             finally:
-                self._after_singleton_creation(bean_name)
-            if singleton_obj is not None:
-                self._add_singleton(bean_name, singleton_obj)
+                self._singleton_creation_owners.pop(bean_name, None)
+                lock.release()
         return singleton_obj
 
+    def _get_singleton_creation_lock(self, bean_name: str):
+        lock = self._singleton_creation_locks.get(bean_name)
+        if lock is None:
+            with self._singleton_lock:
+                lock = self._singleton_creation_locks.get(bean_name)
+                if lock is None:
+                    lock = threading.Lock()
+                    self._singleton_creation_locks[bean_name] = lock
+        return lock
+
+    def _acquire_singleton_creation_lock(self, bean_name: str, lock):
+        ident = threading.get_ident()
+        if not lock.acquire(blocking=False):
+            with self._singleton_lock:
+                self._singleton_creation_waits[ident] = (threading.current_thread().name, bean_name)
+                cycle = self._find_singleton_creation_deadlock(ident)
+                if cycle is not None:
+                    del self._singleton_creation_waits[ident]
+                    raise BeanCreationDeadlockError(bean_name, cycle)
+            try:
+                lock.acquire()
+            finally:
+                with self._singleton_lock:
+                    del self._singleton_creation_waits[ident]
+        self._singleton_creation_owners[bean_name] = ident
+
+    def _find_singleton_creation_deadlock(self, ident):
+        """
+        Follow the threads waiting for the singletons being created by other threads.
+        Return the list of (thread name, bean name) if the current thread is waiting for itself.
+        """
+        cycle = []
+        visited = set()
+        t = ident
+        while t not in visited:
+            visited.add(t)
+            wait = self._singleton_creation_waits.get(t)
+            if wait is None:
+                return
+            cycle.append(wait)
+            t = self._singleton_creation_owners.get(wait[1])
+            if t is None:
+                return
+            if t == ident:
+                return cycle
+
     def contains_singleton(self, bean_name: str) -> bool:
         return bean_name in self._singleton_objects
 
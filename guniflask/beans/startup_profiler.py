@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+class StartupStep:
+    """
+    A timed span of the startup, e.g. a phase of refreshing the context, the creation of a bean,
+    or a call to a post-processor.
+    """
+
+    __slots__ = ('name', 'category', 'tags', 'parent', 'thread_id', 'thread_name', 'start', 'end')
+
+    def __init__(self, name: str, category: str, tags: dict, parent: Optional['StartupStep']):
+        self.name = name
+        self.category = category
+        self.tags = tags
+        self.parent = parent
+        current_thread = threading.current_thread()
+        self.thread_id = current_thread.ident
+        self.thread_name = current_thread.name
+        self.start = time.perf_counter()
+        self.end = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class _ActiveStep:
+    __slots__ = ('_profiler', '_step')
+
+    def __init__(self, profiler: 'StartupProfiler', step: StartupStep):
+        self._profiler = profiler
+        self._step = step
+
+    def __enter__(self) -> StartupStep:
+        return self._step
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler._end_step(self._step)
+
+
+class StartupProfiler:
+    """
+    Record the nested steps of the startup, which can be exported as a Chrome trace or a speedscope profile.
+    """
+
+    CHROME = 'chrome'
+    SPEEDSCOPE = 'speedscope'
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._steps: List[StartupStep] = []
+        self._steps_lock = threading.Lock()
+        self._local = threading.local()
+
+    def step(self, name: str, category: str, **tags) -> _ActiveStep:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        s = StartupStep(name, category, tags, stack[-1] if stack else None)
+        stack.append(s)
+        return _ActiveStep(self, s)
+
+    def _end_step(self, s: StartupStep):
+        s.end = time.perf_counter()
+        self._local.stack.pop()
+        with self._steps_lock:
+            self._steps.append(s)
+
+    @property
+    def steps(self) -> List[StartupStep]:
+        with self._steps_lock:
+            return sorted(self._steps, key=lambda x: x.start)
+
+    def get_slowest_beans(self, n: int = 10) -> List[dict]:
+        """
+        Get the beans which took the longest time to create.
+        The self time of a bean excludes the time spent on creating the beans it depends on.
+        """
+        steps = self.steps
+        nested_time = defaultdict(float)
+        for s in steps:
+            if s.category == 'bean' and s.parent is not None:
+                p = s.parent
+                while p is not None and p.category != 'bean':
+                    p = p.parent
+                if p is not None:
+                    nested_time[id(p)] += s.duration
+        beans: Dict[str, dict] = {}
+        for s in steps:
+            if s.category == 'bean':
+                b = beans.get(s.name)
+                if b is None:
+                    b = beans[s.name] = {'bean_name': s.name, 'count': 0, 'total_time': 0.0, 'self_time': 0.0}
+                b['count'] += 1
+                b['total_time'] += s.duration
+                b['self_time'] += s.duration - nested_time[id(s)]
+        return sorted(beans.values(), key=lambda x: x['self_time'], reverse=True)[:n]
+
+    def summary(self, n: int = 10) -> str:
+        lines = []
+        for s in self.steps:
+            if s.category == 'phase':
+                lines.append(f'{s.name}: {s.duration * 1000:.1f}ms')
+        slowest_beans = self.get_slowest_beans(n)
+        if slowest_beans:
+            lines.append(f'Top {len(slowest_beans)} slowest beans (self / total):')
+            for b in slowest_beans:
+                lines.append(f'  {b["bean_name"]}: {b["self_time"] * 1000:.1f}ms / {b["total_time"] * 1000:.1f}ms')
+        return '\n'.join(lines)
+
+    def log_summary(self, logger: logging.Logger, n: int = 10, level=logging.INFO):
+        logger.log(level, 'Startup profile:\n%s', self.summary(n))
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for s in self.steps:
+            threads[s.thread_id] = s.thread_name
+            events.append({
+                'name': s.name,
+                'cat': s.category,
+                'ph': 'X',
+                'ts': (s.start - self._origin) * 1e6,
+                'dur': s.duration * 1e6,
+                'pid': pid,
+                'tid': s.thread_id,
+                'args': {k: str(v) for k, v in s.tags.items()},
+            })
+        for tid, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_speedscope(self, name: str = 'startup') -> dict:
+        frames = []
+        frame_index = {}
+        children = defaultdict(list)
+        roots = defaultdict(list)
+        thread_names = {}
+        for s in self.steps:
+            thread_names[s.thread_id] = s.thread_name
+            if s.parent is None:
+                roots[s.thread_id].append(s)
+            else:
+                children[id(s.parent)].append(s)
+
+        def frame_of(s):
+            key = (s.name, s.category)
+            i = frame_index.get(key)
+            if i is None:
+                i = frame_index[key] = len(frames)
+                frames.append({'name': s.name, 'file': s.category})
+            return i
+
+        def add_events(s, events):
+            i = frame_of(s)
+            events.append({'type': 'O', 'frame': i, 'at': (s.start - self._origin) * 1000})
+            for c in children[id(s)]:
+                add_events(c, events)
+            events.append({'type': 'C', 'frame': i, 'at': (s.end - self._origin) * 1000})
+
+        profiles = []
+        for thread_id, thread_roots in roots.items():
+            events = []
+            for s in thread_roots:
+                add_events(s, events)
+            profiles.append({
+                'type': 'evented',
+                'name': thread_names[thread_id],
+                'unit': 'milliseconds',
+                'startValue': events[0]['at'],
+                'endValue': events[-1]['at'],
+                'events': events,
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'guniflask',
+            'shared': {'frames': frames},
+            'profiles': profiles,
+        }
+
+    def export(self, path: str, format: str = None):
+        """
+        Export the steps to a file, in the speedscope format if the file name ends with ".speedscope.json",
+        otherwise in the Chrome trace format.
+        """
+        if format is None:
+            format = self.SPEEDSCOPE if path.endswith('.speedscope.json') else self.CHROME
+        if format == self.SPEEDSCOPE:
+            data = self.to_speedscope()
+        elif format == self.CHROME:
+            data = self.to_chrome_trace()
+        else:
+            raise ValueError(f'Unsupported format of startup profile: {format}')
+        with open(path, 'w') as f:
+            json.dump(data, f)
@@ -0,0 +1,37 @@
+import logging
+from typing import Dict, List
+
+
+class StartupReport:
+    """
+    Report of the singletons instantiated when the bean factory pre-instantiates singletons.
+
+    The creation time of a bean includes the time spent on creating the beans it depends on.
+    """
+
+    def __init__(self):
+        self.deferred_beans: List[str] = []
+        self.bean_creation_times: Dict[str, float] = {}
+        self.total_time: float = 0.0
+
+    def record_bean_creation(self, bean_name: str, elapsed: float):
+        self.bean_creation_times[bean_name] = elapsed
+
+    def add_deferred_bean(self, bean_name: str):
+        self.deferred_beans.append(bean_name)
+
+    def log(self, logger: logging.Logger, level=logging.INFO):
+        logger.log(level, 'Instantiated %d singletons in %.3fs, deferred %d lazy singletons',
+                   len(self.bean_creation_times), self.total_time, len(self.deferred_beans))
+        if logger.isEnabledFor(logging.DEBUG):
+            for bean_name, elapsed in self.bean_creation_times.items():
+                logger.debug('Created singleton bean "%s" in %.3fs', bean_name, elapsed)
+            for bean_name in self.deferred_beans:
+                logger.debug('Deferred lazy singleton bean "%s"', bean_name)
+
+    def to_dict(self) -> dict:
+        return {
+            'total_time': self.total_time,
+            'bean_creation_times': dict(self.bean_creation_times),
+            'deferred_beans': list(self.deferred_beans),
+        }
@@ -0,0 +1,118 @@
+import inspect
+from typing import Dict, List, Optional
+
+
+class BeanTypeIndex:
+    """
+    Index from types to the names of the beans matching them.
+
+    The index is built from the effective type of each bean, i.e. the type of the singleton
+    if it has been created, otherwise the type declared by its bean definition.
+    Types whose metaclass is exactly ``type`` are looked up through the MRO of the bean types,
+    other types (ABCs, protocols) may customize ``issubclass`` and are matched by scanning.
+    """
+
+    def __init__(self):
+        self._bean_types: Optional[Dict[str, type]] = None
+        self._bean_order: Dict[str, int] = {}
+        self._mro_index: Dict[type, List[str]] = {}
+        self._names_for_type: Dict[type, List[str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._rebuilds = 0
+        self._invalidations = 0
+        self._updates = 0
+
+    @property
+    def is_built(self) -> bool:
+        return self._bean_types is not None
+
+    def build(self, bean_types: Dict[str, Optional[type]]):
+        """
+        :param bean_types: effective bean types in bean definition order
+        """
+        mro_index = {}
+        for bean_name, bean_type in bean_types.items():
+            if bean_type is None:
+                continue
+            for t in inspect.getmro(bean_type):
+                if t not in mro_index:
+                    mro_index[t] = []
+                mro_index[t].append(bean_name)
+        self._bean_types = bean_types
+        self._bean_order = {bean_name: i for i, bean_name in enumerate(bean_types)}
+        self._mro_index = mro_index
+        self._names_for_type = {}
+        self._rebuilds += 1
+
+    def get_bean_type(self, bean_name: str) -> Optional[type]:
+        if self._bean_types is not None:
+            return self._bean_types.get(bean_name)
+
+    def get_bean_names(self, required_type: type) -> List[str]:
+        assert self._bean_types is not None, 'The bean type index has not been built'
+        names = self._names_for_type.get(required_type)
+        if names is not None:
+            self._hits += 1
+            return names
+        self._misses += 1
+        if type(required_type) is type:
+            names = self._mro_index.get(required_type, [])
+        else:
+            names = [
+                bean_name
+                for bean_name, bean_type in self._bean_types.items()
+                if bean_type is not None and issubclass(bean_type, required_type)
+            ]
+        self._names_for_type[required_type] = names
+        return names
+
+    def update_bean_type(self, bean_name: str, bean_type: Optional[type]):
+        """
+        Update the effective type of an indexed bean in place,
+        only the types in the MRO of either the old or the new type but not both are touched.
+        """
+        assert self._bean_types is not None, 'The bean type index has not been built'
+        old_mro = inspect.getmro(self._bean_types[bean_name]) if self._bean_types.get(bean_name) else ()
+        new_mro = inspect.getmro(bean_type) if bean_type is not None else ()
+        for t in old_mro:
+            if t not in new_mro:
+                names = self._mro_index[t]
+                names.remove(bean_name)
+                if not names:
+                    del self._mro_index[t]
+                self._names_for_type.pop(t, None)
+        order = self._bean_order
+        for t in new_mro:
+            if t not in old_mro:
+                names = self._mro_index.setdefault(t, [])
+                i = len(names)
+                while i > 0 and order[names[i - 1]] > order[bean_name]:
+                    i -= 1
+                names.insert(i, bean_name)
+                self._names_for_type.pop(t, None)
+        self._bean_types[bean_name] = bean_type
+        # the lookups of the types customizing issubclass are scanned again
+        for t in [t for t in self._names_for_type if type(t) is not type]:
+            del self._names_for_type[t]
+        self._updates += 1
+
+    def invalidate(self):
+        if self._bean_types is not None:
+            self._invalidations += 1
+        self._bean_types = None
+        self._bean_order = {}
+        self._mro_index = {}
+        self._names_for_type = {}
+
+    def stats(self) -> dict:
+        return {
+            'indexed_beans': len(self._bean_types) if self._bean_types is not None else 0,
+            'indexed_types': len(self._mro_index),
+            'cached_lookups': len(self._names_for_type),
+            'hits': self._hits,
+            'misses': self._misses,
+            'rebuilds': self._rebuilds,
+            'invalidations': self._invalidations,
+            'updates': self._updates,
+        }
@@ -1,3 +1,4 @@
+from .annotation import async_listener
 from .annotation import autowired
 from .annotation import bean
 from .annotation import component
@@ -6,7 +7,9 @@ from .annotation import conditional
 from .annotation import configuration
 from .annotation import controller
 from .annotation import include
+from .annotation import lazy
 from .annotation import repository
+from .annotation import scope
 from .annotation import service
 from .annotation_config_registry import AnnotatedBeanDefinitionReader
 from .annotation_config_registry import AnnotationConfigRegistry
@@ -20,4 +23,5 @@ from .event import ApplicationEvent
 from .event import ContextClosedEvent
 from .event import ContextRefreshedEvent
 from .event_listener import ApplicationEventListener
+from .event_multicaster import AsyncEventMulticaster
 from .event_publisher import ApplicationEventPublisher
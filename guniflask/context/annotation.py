@@ -147,6 +147,61 @@ def controller(name: str = None):
     return wrap_func
 
 
+class Scope(Annotation):
+    def __init__(self, value: str):
+        super().__init__(value=value)
+
+
+def scope(value: str):
+    def wrap_func(func):
+        AnnotationUtils.add_annotation(func, Scope(value))
+        return func
+
+    return wrap_func
+
+
+class Lazy(Annotation):
+    def __init__(self, value: bool = True):
+        super().__init__(value=value)
+
+
+def lazy(value: bool = True):
+    def wrap_func(func):
+        AnnotationUtils.add_annotation(func, Lazy(value))
+        return func
+
+    if inspect.isclass(value) or inspect.isfunction(value):
+        f = value
+        value = True
+        return wrap_func(f)
+    return wrap_func
+
+
+class AsyncListener(Annotation):
+    def __init__(self, executor: str = None, ordered: bool = False):
+        super().__init__(executor=executor, ordered=ordered)
+
+
+def async_listener(executor: str = None, ordered: bool = False):
+    """
+    Dispatch the events to the listener asynchronously.
+
+    :param executor: the name of the ``AsyncExecutor`` bean, the events are dispatched on the pool of
+                     the event multicaster by default
+    :param ordered: whether the events are handled one by one in the order of publishing
+    """
+
+    def wrap_func(func):
+        AnnotationUtils.add_annotation(func, AsyncListener(executor=executor, ordered=ordered))
+        return func
+
+    if inspect.isclass(executor) or inspect.isfunction(executor):
+        f = executor
+        executor = None
+        return wrap_func(f)
+    return wrap_func
+
+
 class Include(Annotation):
     def __init__(self, values: Collection = None):
         super().__init__(values=values)
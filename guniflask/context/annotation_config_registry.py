@@ -6,9 +6,11 @@ from guniflask.beans.definition import BeanDefinition
 from guniflask.beans.definition_registry import BeanDefinitionRegistry
 from guniflask.context.annotation import Component
 from guniflask.context.annotation_config_utils import AnnotationConfigUtils
+from guniflask.context.bean_definition_utils import process_common_definition_annotations
 from guniflask.context.bean_name_generator import AnnotationBeanNameGenerator
 from guniflask.context.condition_evaluator import ConditionEvaluator
 from guniflask.utils.path import walk_modules
+from guniflask.utils.scan_index import ModuleScanIndex
 
 
 class AnnotationConfigRegistry(metaclass=ABCMeta):
@@ -33,9 +35,11 @@ class AnnotatedBeanDefinitionReader:
             self.register_bean(e)
 
     def register_bean(self, annotated_element, name=None):
-        if self._condition_evaluator.should_skip(AnnotationUtils.get_annotation_metadata(annotated_element)):
+        annotation_metadata = AnnotationUtils.get_annotation_metadata(annotated_element)
+        if self._condition_evaluator.should_skip(annotation_metadata):
             return
         bean_definition = BeanDefinition(annotated_element)
+        process_common_definition_annotations(bean_definition, annotation_metadata)
         bean_name = name or self._bean_name_generator.generate_bean_name(bean_definition, self._registry)
         self._registry.register_bean_definition(bean_name, bean_definition)
 
@@ -49,6 +53,7 @@ class ModuleBeanDefinitionScanner:
         self.include_annotation_config = True
         self._bean_name_generator = AnnotationBeanNameGenerator()
         self._condition_evaluator = ConditionEvaluator(registry)
+        self._scan_index = None
 
     def scan(self, *base_modules):
         self._scan(*base_modules)
@@ -58,9 +63,20 @@ class ModuleBeanDefinitionScanner:
     def set_bean_name_generator(self, bean_name_generator):
         self._bean_name_generator = bean_name_generator
 
+    def set_scan_index(self, scan_index: ModuleScanIndex):
+        """
+        Only import the modules containing components according to the scan index,
+        in which the kind of members detected by ``contains_components`` is named "components".
+        """
+        self._scan_index = scan_index
+
     def _scan(self, *base_modules):
         for base_module in base_modules:
-            for module in walk_modules(base_module):
+            if self._scan_index is None:
+                modules = walk_modules(base_module)
+            else:
+                modules = self._scan_index.walk_modules(base_module, 'components')
+            for module in modules:
                 candidates = self._find_candidate_components(module)
                 for bean_definition in candidates:
                     bean_name = self._bean_name_generator.generate_bean_name(bean_definition, self._registry)
@@ -78,8 +94,19 @@ class ModuleBeanDefinitionScanner:
                         if obj_id not in selected_id:
                             selected_id.add(obj_id)
                             bean_definition = BeanDefinition(obj)
+                            process_common_definition_annotations(bean_definition, annotation_metadata)
                             candidates.append(bean_definition)
         return candidates
 
+    @staticmethod
+    def contains_components(module) -> bool:
+        for obj in vars(module).values():
+            if inspect.isclass(obj) or inspect.isfunction(obj):
+                if obj.__module__ == module.__name__:
+                    annotation_metadata = AnnotationUtils.get_annotation_metadata(obj)
+                    if annotation_metadata is not None and annotation_metadata.is_annotated(Component):
+                        return True
+        return False
+
     def _is_candidate_component(self, metadata: AnnotationMetadata):
         return metadata.is_annotated(Component) and not self._condition_evaluator.should_skip(metadata)
@@ -1,6 +1,5 @@
-import inspect
 from collections import defaultdict
-from typing import Optional
+from typing import List, Optional
 
 from guniflask.annotation import AnnotationUtils
 from guniflask.beans.constructor_resolver import ConstructorResolver
@@ -22,12 +21,11 @@ class AutowiredAnnotationBeanPostProcessor(BeanPostProcessor, BeanFactoryAware):
         self._constructor_resolver = ConstructorResolver(bean_factory)
 
     def post_process_before_instantiation(self, bean_type: type, bean_name: str):
-        for m in dir(bean_type):
-            method = getattr(bean_type, m)
-            if inspect.isfunction(method):
-                a = AnnotationUtils.get_annotation(method, Autowired)
-                if a is not None:
-                    self._autowired_methods[bean_name].append(m)
+        for m, method, a in AnnotationUtils.get_annotated_methods(bean_type, Autowired):
+            self._autowired_methods[bean_name].append(m)
+
+    def determine_injection_methods(self, bean_type: type, bean_name: str) -> List:
+        return [method for m, method, a in AnnotationUtils.get_annotated_methods(bean_type, Autowired)]
 
     def post_process_before_initialization(self, bean, bean_name: str):
         if bean_name in self._autowired_methods:
@@ -0,0 +1,14 @@
+from guniflask.annotation import AnnotationMetadata
+from guniflask.beans.definition import BeanDefinition
+from guniflask.context.annotation import Lazy, Scope
+
+
+def process_common_definition_annotations(bean_definition: BeanDefinition, metadata: AnnotationMetadata):
+    if metadata is None:
+        return
+    scope = metadata.get_annotation(Scope)
+    if scope is not None:
+        bean_definition.scope = scope['value']
+    lazy = metadata.get_annotation(Lazy)
+    if lazy is not None:
+        bean_definition.lazy_init = lazy['value']
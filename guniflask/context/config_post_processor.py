@@ -1,4 +1,3 @@
-import inspect
 from importlib import import_module
 
 from guniflask.annotation import AnnotationMetadata, AnnotationUtils
@@ -8,6 +7,7 @@ from guniflask.beans.factory_post_processor import BeanDefinitionRegistryPostPro
 from guniflask.beans.name_generator import BeanNameGenerator
 from guniflask.beans.singleton_registry import SingletonBeanRegistry
 from guniflask.context.annotation import Bean, Component, Configuration, Include
+from guniflask.context.bean_definition_utils import process_common_definition_annotations
 from guniflask.context.bean_name_generator import AnnotationBeanNameGenerator
 from guniflask.context.condition_evaluator import ConditionEvaluator
 from guniflask.context.config_constants import *
@@ -76,12 +76,9 @@ class ConfigurationClassBeanDefinitionReader:
         if meta_data.is_annotated(Include):
             self._load_bean_definition_for_included_config(meta_data)
 
-        for m in dir(source):
-            func = getattr(source, m)
-            if inspect.isfunction(func):
-                method_metadata = AnnotationUtils.get_annotation_metadata(func)
-                if method_metadata is not None and method_metadata.is_annotated(Bean):
-                    self._load_bean_definition_for_bean_method(bean_name, method_metadata)
+        for m, func, a in AnnotationUtils.get_annotated_methods(source, Bean):
+            method_metadata = AnnotationUtils.get_annotation_metadata(func)
+            self._load_bean_definition_for_bean_method(bean_name, method_metadata)
 
     def _load_bean_definition_for_bean_method(self, factory_bean_name: str, method_metadata: AnnotationMetadata):
         if self._condition_evaluator.should_skip(method_metadata):
@@ -90,6 +87,7 @@ class ConfigurationClassBeanDefinitionReader:
         method_name = method.__name__
         bean_definition = BeanDefinition(method)
         bean_definition.factory_bean_name = factory_bean_name
+        process_common_definition_annotations(bean_definition, method_metadata)
         attributes = method_metadata.get_annotation(Bean).attributes
         bean_name = attributes.get('name') or method_name
         self._registry.register_bean_definition(bean_name, bean_definition)
@@ -106,5 +104,6 @@ class ConfigurationClassBeanDefinitionReader:
                 if self._condition_evaluator.should_skip(config_cls_metadata):
                     continue
                 bean_definition = BeanDefinition(config_cls)
+                process_common_definition_annotations(bean_definition, config_cls_metadata)
                 bean_name = self._include_bean_name_generator.generate_bean_name(bean_definition, self._registry)
                 self._registry.register_bean_definition(bean_name, bean_definition)
@@ -11,6 +11,7 @@ from guniflask.context.config_constants import *
 from guniflask.context.context_aware_processor import BeanContextAwareProcessor
 from guniflask.context.event import ApplicationEvent, ContextRefreshedEvent, ContextClosedEvent
 from guniflask.context.event_listener import ApplicationEventListener
+from guniflask.context.event_multicaster import AsyncEventMulticaster
 from guniflask.context.event_publisher import ApplicationEventPublisher
 
 log = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ class DefaultBeanContext(DefaultBeanFactory, BeanContext):
         self._bean_factory_post_processors = []
         self._app_listeners = set()
         self._app_event_publisher = None
+        self._event_multicaster = None
 
     def add_bean_factory_post_processor(self, post_processor: BeanFactoryPostProcessor):
         self._bean_factory_post_processors.append(post_processor)
@@ -31,15 +33,26 @@ class DefaultBeanContext(DefaultBeanFactory, BeanContext):
         return self._bean_factory_post_processors
 
     def refresh(self):
+        with self._startup_step('refresh'):
+            self._refresh()
+
+    def _refresh(self):
         self._prepare_bean_factory()
         try:
-            self._post_process_bean_factory()
-            self._invoke_bean_factory_post_processors()
-            self._register_bean_post_processors()
-            self._init_application_event_publisher()
-            self._register_application_listeners()
-            self._finish_bean_factory_initialization()
-            self._finish_refresh()
+            with self._startup_step('post_process_bean_factory'):
+                self._post_process_bean_factory()
+            with self._startup_step('invoke_bean_factory_post_processors'):
+                self._invoke_bean_factory_post_processors()
+            with self._startup_step('register_bean_post_processors'):
+                self._register_bean_post_processors()
+            with self._startup_step('init_application_event_publisher'):
+                self._init_application_event_publisher()
+            with self._startup_step('register_application_listeners'):
+                self._register_application_listeners()
+            with self._startup_step('finish_bean_factory_initialization'):
+                self._finish_bean_factory_initialization()
+            with self._startup_step('finish_refresh'):
+                self._finish_refresh()
         except Exception:
             log.error('Exception encountered during context initialization', exc_info=True)
             self._destroy_beans()
@@ -47,8 +60,16 @@ class DefaultBeanContext(DefaultBeanFactory, BeanContext):
 
     def close(self):
         self.publish_event(ContextClosedEvent(self))
+        if self._event_multicaster is not None:
+            self._event_multicaster.shutdown()
         self._destroy_beans()
 
+    def set_event_multicaster(self, event_multicaster: AsyncEventMulticaster):
+        """
+        Set the multicaster to dispatch the events to the listeners annotated with ``@async_listener``.
+        """
+        self._event_multicaster = event_multicaster
+
     def add_application_listener(self, listener: ApplicationEventListener):
         self._app_listeners.add(listener)
 
@@ -64,15 +85,19 @@ class DefaultBeanContext(DefaultBeanFactory, BeanContext):
     def _invoke_bean_factory_post_processors(self):
         def invoke_bean_factory_post_processors(post_processors, factory):
             for post_processor in post_processors:
-                post_processor.post_process_bean_factory(factory)
+                with self._startup_step(f'{type(post_processor).__name__}.post_process_bean_factory',
+                                        'post_processor'):
+                    post_processor.post_process_bean_factory(factory)
 
         def invoke_bean_definition_registry_post_processors(post_processors, registry):
             for post_processor in post_processors:
-                post_processor.post_process_bean_definition_registry(registry)
+                with self._startup_step(f'{type(post_processor).__name__}.post_process_bean_definition_registry',
+                                        'post_processor'):
+                    post_processor.post_process_bean_definition_registry(registry)
 
-        for post_processor in self.bean_factory_post_processors:
-            if isinstance(post_processor, BeanDefinitionRegistryPostProcessor):
-                post_processor.post_process_bean_definition_registry(self)
+        invoke_bean_definition_registry_post_processors(
+            [p for p in self.bean_factory_post_processors if isinstance(p, BeanDefinitionRegistryPostProcessor)],
+            self)
 
         post_processor_beans = list(self.get_beans_of_type(BeanFactoryPostProcessor).values())
         regular_post_processors = []
@@ -93,9 +118,15 @@ class DefaultBeanContext(DefaultBeanFactory, BeanContext):
         register_bean_post_processors(self, post_processor_beans)
 
     def _init_application_event_publisher(self):
-        self._app_event_publisher = ApplicationEventPublisher(self)
+        if self._event_multicaster is None:
+            self._event_multicaster = self._create_event_multicaster()
+        self.register_singleton(APPLICATION_EVENT_MULTICASTER, self._event_multicaster)
+        self._app_event_publisher = ApplicationEventPublisher(self, event_multicaster=self._event_multicaster)
         self.register_singleton(APPLICATION_EVENT_PUBLISHER, self._app_event_publisher)
 
+    def _create_event_multicaster(self) -> AsyncEventMulticaster:
+        return AsyncEventMulticaster(self)
+
     def _register_application_listeners(self):
         for listener in self._app_listeners:
             self._app_event_publisher.add_application_listener(listener)
@@ -123,7 +154,11 @@ class AnnotationConfigBeanContext(DefaultBeanContext, AnnotationConfigRegistry):
         self._reader.register(*annotated_elements)
 
     def scan(self, *base_modules):
-        self._scanner.scan(*base_modules)
+        with self._startup_step('scan', modules=', '.join(base_modules)):
+            self._scanner.scan(*base_modules)
+
+    def set_scan_index(self, scan_index):
+        self._scanner.set_scan_index(scan_index)
 
     def set_bean_name_generator(self, bean_name_generator):
         self._reader.set_bean_name_generator(bean_name_generator)
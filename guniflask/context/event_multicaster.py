@@ -0,0 +1,297 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from itertools import count
+from typing import Dict, List
+
+from guniflask.beans.factory import BeanFactory
+from guniflask.context.annotation import AsyncListener
+from guniflask.context.event import ApplicationEvent
+
+log = logging.getLogger(__name__)
+
+
+class ListenerMetrics:
+    def __init__(self, listener_name: str):
+        self.listener_name = listener_name
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.caller_runs = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+
+    def record_submitted(self):
+        with self._lock:
+            self.submitted += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_caller_runs(self):
+        with self._lock:
+            self.caller_runs += 1
+
+    def record_finished(self, elapsed: float, failed: bool):
+        with self._lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.total_time += elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'listener': self.listener_name,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'caller_runs': self.caller_runs,
+                'pending': max(0, self.submitted + self.caller_runs - finished),
+                'total_time': self.total_time,
+                'avg_time': self.total_time / finished if finished else 0.0,
+                'max_time': self.max_time,
+            }
+
+
+class AsyncEventMulticaster:
+    """
+    Dispatch the events to the listeners annotated with ``@async_listener``.
+
+    The events are dispatched on the ``AsyncExecutor`` named by the annotation, or on a bounded pool of workers,
+    each of which has its own queue.
+    At most ``queue_size`` events are pending or running on each executor.
+    The events of an ordered listener are always dispatched to the same worker, so they are handled in order.
+    The metrics and the order are kept per listener class.
+
+    When the queue of a worker or an executor is full, the rejection policy decides whether to block the publisher,
+    drop the event, or handle the event in the thread of the publisher.
+    The caller-runs policy blocks the publisher for the ordered listeners to keep the order.
+
+    The events multicast after shutdown are handled in the thread of the publisher.
+    """
+
+    BLOCK = 'block'
+    DROP = 'drop'
+    CALLER_RUNS = 'caller_runs'
+
+    def __init__(self, bean_factory: BeanFactory = None, max_workers: int = 4, queue_size: int = 1000,
+                 rejection_policy: str = BLOCK):
+        if rejection_policy not in (self.BLOCK, self.DROP, self.CALLER_RUNS):
+            raise ValueError(f'Unsupported rejection policy: {rejection_policy}')
+        self._bean_factory = bean_factory
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.rejection_policy = rejection_policy
+        self._lock = threading.Lock()
+        self._queues: List[queue.Queue] = []
+        self._workers: List[threading.Thread] = []
+        self._round_robin = count()
+        self._listener_stripes = {}
+        self._serial_queues = {}
+        self._executor_permits: Dict[str, threading.BoundedSemaphore] = {}
+        self._metrics: Dict[type, ListenerMetrics] = {}
+        self._shutdown = False
+
+    def multicast(self, listener, event: ApplicationEvent, async_listener: AsyncListener):
+        metrics = self.get_listener_metrics(listener)
+        task = self._post_process_listener_task(self._make_task(listener, event, metrics))
+        if self._shutdown:
+            self._run_in_caller(listener, task, metrics)
+        elif async_listener['executor'] is not None:
+            self._submit_to_executor(listener, task, async_listener['executor'], async_listener['ordered'], metrics)
+        else:
+            self._submit_to_worker(listener, task, async_listener['ordered'], metrics)
+
+    def get_listener_metrics(self, listener) -> ListenerMetrics:
+        listener_type = type(listener)
+        metrics = self._metrics.get(listener_type)
+        if metrics is None:
+            with self._lock:
+                metrics = self._metrics.get(listener_type)
+                if metrics is None:
+                    metrics = ListenerMetrics(f'{listener_type.__module__}.{listener_type.__qualname__}')
+                    self._metrics[listener_type] = metrics
+        return metrics
+
+    def get_metrics(self) -> List[dict]:
+        return [m.to_dict() for m in list(self._metrics.values())]
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._shutdown = True
+            queues, workers = self._queues, self._workers
+            self._queues, self._workers = [], []
+        for q in queues:
+            q.put(None)
+        if wait:
+            for w in workers:
+                w.join()
+
+    def _make_task(self, listener, event: ApplicationEvent, metrics: ListenerMetrics):
+        def task():
+            start_time = time.perf_counter()
+            failed = False
+            try:
+                listener.on_application_event(event)
+            except Exception:
+                failed = True
+                log.error('Failed to handle the event %s by the listener %s', event, listener, exc_info=True)
+            metrics.record_finished(time.perf_counter() - start_time, failed)
+
+        return task
+
+    def _post_process_listener_task(self, task):
+        return task
+
+    def _submit_to_worker(self, listener, task, ordered: bool, metrics: ListenerMetrics):
+        queues = self._get_queues()
+        if not queues:
+            self._run_in_caller(listener, task, metrics)
+            return
+        if ordered:
+            q = queues[self._get_listener_stripe(listener, len(queues))]
+        else:
+            q = queues[next(self._round_robin) % len(queues)]
+        if self._blocks(ordered):
+            metrics.record_submitted()
+            q.put(task)
+            return
+        try:
+            q.put_nowait(task)
+        except queue.Full:
+            self._reject(listener, task, metrics)
+        else:
+            metrics.record_submitted()
+
+    def _submit_to_executor(self, listener, task, executor_name: str, ordered: bool, metrics: ListenerMetrics):
+        executor = self._bean_factory.get_bean(executor_name)
+        permits = self._get_executor_permits(executor_name)
+        if self._blocks(ordered):
+            permits.acquire()
+        elif not permits.acquire(blocking=False):
+            self._reject(listener, task, metrics)
+            return
+
+        def bounded_task():
+            try:
+                task()
+            finally:
+                permits.release()
+
+        metrics.record_submitted()
+        try:
+            if ordered:
+                self._get_serial_queue(listener, executor).submit(bounded_task)
+            else:
+                executor.submit(bounded_task)
+        except BaseException:
+            permits.release()
+            raise
+
+    def _blocks(self, ordered: bool) -> bool:
+        return self.rejection_policy == self.BLOCK or (ordered and self.rejection_policy == self.CALLER_RUNS)
+
+    def _reject(self, listener, task, metrics: ListenerMetrics):
+        if self.rejection_policy == self.DROP:
+            metrics.record_dropped()
+            log.debug('Dropped an event of the listener %s since the queue is full', listener)
+        else:
+            metrics.record_caller_runs()
+            task()
+
+    @staticmethod
+    def _run_in_caller(listener, task, metrics: ListenerMetrics):
+        log.debug('Handle an event of the listener %s in the caller since the multicaster is shut down', listener)
+        metrics.record_caller_runs()
+        task()
+
+    def _get_queues(self) -> List[queue.Queue]:
+        queues = self._queues
+        if not queues:
+            with self._lock:
+                if not self._queues and not self._shutdown:
+                    for i in range(self.max_workers):
+                        q = queue.Queue(self.queue_size)
+                        w = threading.Thread(target=self._work, args=(q,), name=f'event-multicaster-{i}', daemon=True)
+                        w.start()
+                        self._queues.append(q)
+                        self._workers.append(w)
+                queues = self._queues
+        return queues
+
+    def _get_listener_stripe(self, listener, n: int) -> int:
+        listener_type = type(listener)
+        stripe = self._listener_stripes.get(listener_type)
+        if stripe is None:
+            with self._lock:
+                stripe = self._listener_stripes.setdefault(listener_type, len(self._listener_stripes) % n)
+        return stripe
+
+    def _get_executor_permits(self, executor_name: str) -> threading.BoundedSemaphore:
+        permits = self._executor_permits.get(executor_name)
+        if permits is None:
+            with self._lock:
+                permits = self._executor_permits.get(executor_name)
+                if permits is None:
+                    permits = threading.BoundedSemaphore(self.queue_size)
+                    self._executor_permits[executor_name] = permits
+        return permits
+
+    def _get_serial_queue(self, listener, executor) -> '_SerialTaskQueue':
+        listener_type = type(listener)
+        serial_queue = self._serial_queues.get(listener_type)
+        if serial_queue is None:
+            with self._lock:
+                serial_queue = self._serial_queues.get(listener_type)
+                if serial_queue is None:
+                    serial_queue = _SerialTaskQueue(executor)
+                    self._serial_queues[listener_type] = serial_queue
+        return serial_queue
+
+    @staticmethod
+    def _work(q: queue.Queue):
+        while True:
+            task = q.get()
+            if task is None:
+                break
+            task()
+
+
+class _SerialTaskQueue:
+    """
+    Run the tasks on an executor one by one in the order of submitting.
+    """
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._tasks = deque()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def submit(self, task):
+        with self._lock:
+            self._tasks.append(task)
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    self._running = False
+                    return
+                task = self._tasks.popleft()
+            task()
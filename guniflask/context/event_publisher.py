@@ -1,37 +1,103 @@
-from typing import Type
+from typing import Dict, List, Optional, Tuple, Type
 
+from guniflask.annotation import AnnotationUtils
 from guniflask.beans.factory import BeanFactory
+from guniflask.beans.singleton_registry import SingletonBeanRegistry
+from guniflask.context.annotation import AsyncListener
 from guniflask.context.event import ApplicationEvent
 from guniflask.context.event_listener import ApplicationEventListener
+from guniflask.context.event_multicaster import AsyncEventMulticaster
 from guniflask.data_model.typing import inspect_args
 
 
 class ApplicationEventPublisher:
-    def __init__(self, bean_factory: BeanFactory):
+    """
+    Publish events to the listeners accepting them.
+
+    The listeners of each type of events are resolved on the first publish of the type and cached in a dispatch index,
+    which is cleared when adding listeners.
+    The listener beans are fetched from the bean factory on every publish unless they are singletons.
+    The listeners annotated with ``@async_listener`` are dispatched by the event multicaster if it is set.
+    """
+
+    def __init__(self, bean_factory: BeanFactory, event_multicaster: AsyncEventMulticaster = None):
         self._bean_factory = bean_factory
-        self._app_listeners = set()
-        self._app_listener_beans = set()
+        self._event_multicaster = event_multicaster
+        self._app_listeners = {}
+        self._app_listener_beans = {}
+        self._listener_types: Dict[type, Tuple[Optional[Type[ApplicationEvent]], Optional[AsyncListener]]] = {}
+        self._dispatch_index: Dict[type, List[tuple]] = {}
+
+    @property
+    def event_multicaster(self) -> Optional[AsyncEventMulticaster]:
+        return self._event_multicaster
 
     def add_application_listener(self, listener: ApplicationEventListener):
-        self._app_listeners.add(listener)
+        self._app_listeners[listener] = None
+        self._dispatch_index = {}
 
     def add_application_listener_bean(self, bean_name: str):
-        self._app_listener_beans.add(bean_name)
+        self._app_listener_beans[bean_name] = None
+        self._dispatch_index = {}
 
     def publish_event(self, event: ApplicationEvent):
-        for listener in self._get_application_listeners():
-            assert isinstance(listener, ApplicationEventListener)
-            accepted_event_type = self._resolve_accepted_event_type(listener.on_application_event)
-            if accepted_event_type is None or isinstance(event, accepted_event_type):
+        event_type = type(event)
+        listeners = self._dispatch_index.get(event_type)
+        if listeners is None:
+            listeners = self._resolve_listeners(event_type)
+            self._dispatch_index[event_type] = listeners
+        for listener, async_listener in listeners:
+            if listener.__class__ is str:
+                listener = self._get_listener_bean(listener)
+                if listener is None:
+                    continue
+                accepted_event_type, async_listener = self._get_listener_type_info(listener)
+                if accepted_event_type is not None and not issubclass(event_type, accepted_event_type):
+                    continue
+            if async_listener is None or self._event_multicaster is None:
                 listener.on_application_event(event)
+            else:
+                self._event_multicaster.multicast(listener, event, async_listener)
 
-    def _get_application_listeners(self):
+    def _resolve_listeners(self, event_type: type) -> List[tuple]:
+        """
+        Resolve the listeners accepting the type of events along with their ``@async_listener`` annotations,
+        in which the listener beans that are not singletons are kept as bean names.
+        """
+        listeners = []
         for listener in self._app_listeners:
-            yield listener
+            self._add_listener_if_accepted(listeners, listener, event_type)
         for bean_name in self._app_listener_beans:
-            listener = self._bean_factory.get_bean(bean_name, required_type=ApplicationEventListener)
-            if listener is not None:
-                yield listener
+            listener = self._get_listener_bean(bean_name)
+            if listener is None:
+                continue
+            if self._is_singleton(bean_name, listener):
+                self._add_listener_if_accepted(listeners, listener, event_type)
+            else:
+                listeners.append((bean_name, None))
+        return listeners
+
+    def _add_listener_if_accepted(self, listeners: list, listener, event_type: type):
+        accepted_event_type, async_listener = self._get_listener_type_info(listener)
+        if accepted_event_type is None or issubclass(event_type, accepted_event_type):
+            listeners.append((listener, async_listener))
+
+    def _get_listener_bean(self, bean_name: str):
+        return self._bean_factory.get_bean(bean_name, required_type=ApplicationEventListener)
+
+    def _is_singleton(self, bean_name: str, listener) -> bool:
+        return isinstance(self._bean_factory, SingletonBeanRegistry) \
+               and self._bean_factory.get_singleton(bean_name) is listener
+
+    def _get_listener_type_info(self, listener) -> Tuple[Optional[Type[ApplicationEvent]], Optional[AsyncListener]]:
+        assert isinstance(listener, ApplicationEventListener)
+        listener_type = type(listener)
+        info = self._listener_types.get(listener_type)
+        if info is None:
+            info = (self._resolve_accepted_event_type(listener.on_application_event),
+                    AnnotationUtils.get_annotation(listener_type, AsyncListener))
+            self._listener_types[listener_type] = info
+        return info
 
     def _resolve_accepted_event_type(self, method) -> Type[ApplicationEvent]:
         args, hints = inspect_args(method)
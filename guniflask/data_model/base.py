@@ -1,10 +1,14 @@
+import inspect
+import types
 from enum import Enum
-from typing import Union, List, Set, Any
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple, Union, get_args, get_origin
 
 from pydantic import BaseModel
 
+from guniflask.data_model.typing import _get_type_adapter
 from guniflask.orm.base_model import BaseModelMixin
-from guniflask.utils.rule import make_ignore_rule_for_field, make_only_rule_for_field
+from guniflask.orm.model_utils import models_to_dicts
+from guniflask.utils.rule import FieldRule, make_field_rule
 
 
 class DataModel(BaseModel):
@@ -13,65 +17,8 @@ class DataModel(BaseModel):
             ignore: Union[str, List[str], Set[str]] = None,
             only: Union[str, List[str], Set[str]] = None,
     ) -> dict:
-        ignore = make_ignore_rule_for_field(ignore)
-        only = make_only_rule_for_field(only)
-        return self.__to_dict(ignore, only)
-
-    def __to_dict(
-            self,
-            ignore: Set[str],
-            only: Set[str],
-            _prefix: str = '',
-    ) -> dict:
-        data = {}
-        for k, v in self.__dict__.items():
-            if _in_set(_prefix, k, ignore):
-                continue
-            if only and not _in_set(_prefix, k, only):
-                continue
-            data[k] = self.__get_value_from(
-                v,
-                ignore=ignore,
-                only=only,
-                _prefix=_new_prefix(_prefix, k),
-            )
-        return data
-
-    def __get_value_from(
-            self,
-            v: Any,
-            ignore: Set[str],
-            only: Set[str],
-            _prefix: str = '',
-    ) -> Any:
-        if isinstance(v, DataModel):
-            return v.__to_dict(ignore=ignore, only=only, _prefix=_prefix)
-        if isinstance(v, dict):
-            data = {}
-            for _k, _v in v.items():
-                if _in_set(_prefix, _k, ignore):
-                    continue
-                if only and not _in_set(_prefix, _k, only):
-                    continue
-                data[_k] = self.__get_value_from(
-                    _v,
-                    ignore=ignore,
-                    only=only,
-                    _prefix=_new_prefix(_prefix, _k),
-                )
-            return data
-        if isinstance(v, (list, set, tuple)):
-            return [
-                self.__get_value_from(
-                    _v,
-                    ignore=ignore,
-                    only=only,
-                    _prefix=_prefix,
-                ) for _v in v
-            ]
-        if isinstance(v, Enum):
-            return v.value
-        return v
+        rule = make_field_rule(ignore, only)
+        return _get_serializer(type(self), rule)(self)
 
     @classmethod
     def from_dict(cls, obj: dict):
@@ -95,34 +42,116 @@ class DataModel(BaseModel):
             )
         return super().from_orm(obj)
 
+    @classmethod
+    def from_orm_many(
+            cls,
+            rows: Iterable[Any],
+            ignore: Union[str, List[str], Set[str]] = None,
+            only: Union[str, List[str], Set[str]] = None,
+            include: Union[str, List[str], Set[str]] = None,
+            trusted: bool = False,
+    ) -> list:
+        """
+        Convert the rows of a query result to models in batch.
+
+        The ORM models are converted to dicts with the rules resolved once for each mapper,
+        and the other rows are read by attributes.
+        The models are validated at once by the cached type adapter of the list of the models.
+        If the rows are trusted, the models and the nested models are constructed without validation,
+        which keeps the values as they are but is usually slower than the batch validation.
+        """
+        rows = list(rows)
+        models = [r for r in rows if isinstance(r, BaseModelMixin)]
+        if models:
+            dicts = iter(models_to_dicts(models, ignore=ignore, only=only, include=include))
+            rows = [next(dicts) if isinstance(r, BaseModelMixin) else r for r in rows]
+        if trusted and len(models) == len(rows):
+            return [_construct_model(cls, d) for d in rows]
+        adapter, _ = _get_type_adapter(List[cls])
+        return adapter.validate_python(rows, from_attributes=True)
+
+
+_ATOMIC_TYPES = frozenset([str, int, float, bool, bytes, type(None)])
+
+
+def _get_serializer(cls: type, rule: FieldRule) -> Callable[[Any], dict]:
+    serializer = rule.plans.get(cls)
+    if serializer is None:
+        serializer = _compile_serializer(cls, rule)
+        rule.plans[cls] = serializer
+    return serializer
+
+
+def _compile_serializer(cls: type, rule: FieldRule) -> Callable[[Any], dict]:
+    fields = [(k, rule.child(k)) for k in cls.model_fields if rule.accepts(k)]
+
+    def serialize(obj) -> dict:
+        d = obj.__dict__
+        data = {}
+        for k, r in fields:
+            if k in d:
+                v = d[k]
+                data[k] = v if type(v) in _ATOMIC_TYPES else _to_value(v, r)
+        return data
 
-def _expand_rule_set(rule: Set[str]) -> dict:
+    return serialize
+
+
+def _construct_model(cls: type, data: dict):
+    nested_fields = _get_nested_model_fields(cls)
+    if nested_fields:
+        data = dict(data)
+        for k, (model_cls, many) in nested_fields.items():
+            v = data.get(k)
+            if many and isinstance(v, (list, set, tuple)):
+                data[k] = [_construct_model(model_cls, i) if isinstance(i, dict) else i for i in v]
+            elif isinstance(v, dict):
+                data[k] = _construct_model(model_cls, v)
+    return cls.model_construct(**data)
+
+
+def _get_nested_model_fields(cls: type) -> Dict[str, Tuple[type, bool]]:
+    """
+    Get the fields of the nested models, along with whether the fields are lists or sets of the models.
+    """
+    try:
+        return _nested_model_fields[cls]
+    except KeyError:
+        pass
     result = {}
-    for r in rule:
-        s = r.split('.')
-        m = result
-        for i in s[:-1]:
-            if i not in m:
-                m[i] = {}
-            m = m[i]
-        if s[-1] not in m:
-            m[s[-1]] = None
+    for k, field in cls.model_fields.items():
+        dtype = field.annotation
+        if get_origin(dtype) in _UNION_TYPES:
+            args = [a for a in get_args(dtype) if a is not type(None)]
+            if len(args) == 1:
+                dtype = args[0]
+        many = False
+        if get_origin(dtype) in (list, set, tuple) and get_args(dtype):
+            dtype = get_args(dtype)[0]
+            many = True
+        if inspect.isclass(dtype) and issubclass(dtype, BaseModel):
+            result[k] = (dtype, many)
+    _nested_model_fields[cls] = result
     return result
 
 
-def _make_ignore_rule(ignore: Union[str, List[str], Set[str]]) -> dict:
-    return _expand_rule_set(make_ignore_rule_for_field(ignore))
-
+_nested_model_fields: Dict[type, Dict[str, Tuple[type, bool]]] = {}
 
-def _make_only_rule(only: Union[str, List[str], Set[str]]) -> dict:
-    return _expand_rule_set(make_only_rule_for_field(only))
+# X | Y is only supported since Python 3.10
+_UNION_TYPES = (Union,) + ((types.UnionType,) if hasattr(types, 'UnionType') else ())
 
 
-def _in_set(prefix: str, key: str, s: set):
-    return _new_prefix(prefix, key) in s
-
-
-def _new_prefix(prefix: str, key: str):
-    if not prefix:
-        return key
-    return prefix + '.' + key
+def _to_value(v: Any, rule: FieldRule) -> Any:
+    if type(v) in _ATOMIC_TYPES:
+        return v
+    if isinstance(v, DataModel):
+        return _get_serializer(type(v), rule)(v)
+    if isinstance(v, dict):
+        if rule.is_empty:
+            return {_k: _to_value(_v, rule) for _k, _v in v.items()}
+        return {_k: _to_value(_v, rule.child(_k)) for _k, _v in v.items() if rule.accepts(_k)}
+    if isinstance(v, (list, set, tuple)):
+        return [_to_value(_v, rule) for _v in v]
+    if isinstance(v, Enum):
+        return v.value
+    return v
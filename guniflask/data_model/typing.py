@@ -2,10 +2,11 @@ import builtins
 import datetime as dt
 import inspect
 from collections import OrderedDict
-from typing import Any, get_type_hints
+from functools import lru_cache
+from typing import Any, Dict, Tuple, get_type_hints
 from typing import List, Set, Mapping, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from pydantic.v1.typing import get_origin, get_args
 
 from guniflask.utils.datatime import convert_to_datetime
@@ -17,8 +18,14 @@ def parse_json(source: Any, dtype: Any = None) -> Any:
     if source is None:
         return
 
+    adapter, is_collection = _get_type_adapter(dtype)
+    if adapter is not None:
+        if is_collection and not isinstance(source, List):
+            source = [source]
+        return adapter.validate_python(source)
+
     target = None
-    arg_ = ArgType(dtype)
+    arg_ = analyze_arg_type(dtype)
 
     if (arg_.is_list() or arg_.is_set()) and not isinstance(source, List):
         source = [source]
@@ -29,7 +36,7 @@ def parse_json(source: Any, dtype: Any = None) -> Any:
                 return arg_.outer_type(**source)
 
             target = arg_.outer_type()
-            type_hints = get_type_hints(arg_.outer_type)
+            type_hints = _get_type_hints(arg_.outer_type)
             for k, v in source.items():
                 v_t = type_hints.get(k)
                 vv = parse_json(v, dtype=v_t)
@@ -76,6 +83,53 @@ def parse_json(source: Any, dtype: Any = None) -> Any:
     return target
 
 
+_type_adapters: Dict[Any, Tuple[Optional[TypeAdapter], bool]] = {}
+
+_type_hints: Dict[type, dict] = {}
+
+
+def _get_type_adapter(dtype: Any) -> Tuple[Optional[TypeAdapter], bool]:
+    """
+    Get the cached pydantic type adapter of the type composed of pydantic models and containers,
+    along with whether the type is a list or set.
+    """
+    try:
+        return _type_adapters[dtype]
+    except KeyError:
+        pass
+    except TypeError:
+        return None, False
+    if _is_validated_by_pydantic(dtype):
+        origin = get_origin(dtype)
+        result = TypeAdapter(dtype), inspect.isclass(origin) and issubclass(origin, (List, Set))
+    else:
+        result = None, False
+    _type_adapters[dtype] = result
+    return result
+
+
+def _is_validated_by_pydantic(dtype: Any) -> bool:
+    if inspect.isclass(dtype):
+        return issubclass(dtype, BaseModel)
+    origin = get_origin(dtype)
+    if not inspect.isclass(origin):
+        return False
+    args = get_args(dtype)
+    if issubclass(origin, (List, Set)):
+        return len(args) == 1 and _is_validated_by_pydantic(args[0])
+    if issubclass(origin, Mapping):
+        return len(args) == 2 and args[0] is str and _is_validated_by_pydantic(args[1])
+    return False
+
+
+def _get_type_hints(cls: type) -> dict:
+    type_hints = _type_hints.get(cls)
+    if type_hints is None:
+        type_hints = get_type_hints(cls)
+        _type_hints[cls] = type_hints
+    return type_hints
+
+
 def inspect_args(func):
     signature = inspect.signature(func)
     parameters = signature.parameters
@@ -103,13 +157,39 @@ class ArgTypeShape:
 
 
 class ArgType:
+    """
+    The immutable analysis of an argument type, the instances returned by ``analyze_arg_type`` are interned.
+
+    The ``outer_type`` of a union is a tuple of the analyzed types of the arguments in the order of declaration.
+    """
+
+    __slots__ = ('arg_type', 'shape', 'outer_type', '_hash')
+
     def __init__(self, arg_type):
-        self.arg_type = arg_type
+        shape, outer_type = self._analyze_arg_type(arg_type)
+        object.__setattr__(self, 'arg_type', arg_type)
+        object.__setattr__(self, 'shape', shape)
+        object.__setattr__(self, 'outer_type', outer_type)
+        object.__setattr__(self, '_hash', hash((shape, outer_type)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
 
-        self.shape = ArgTypeShape.SINGLETON
-        self.outer_type = arg_type
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
 
-        self._analyze_arg_type(arg_type)
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ArgType):
+            return NotImplemented
+        return self.shape is other.shape and self.outer_type == other.outer_type
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.arg_type!r})'
 
     def is_singleton(self):
         return self.shape is ArgTypeShape.SINGLETON
@@ -126,9 +206,10 @@ class ArgType:
     def is_union(self):
         return self.shape is ArgTypeShape.UNION
 
-    def _analyze_arg_type(self, arg_type: Optional[type]):
+    @classmethod
+    def _analyze_arg_type(cls, arg_type: Optional[type]) -> tuple:
         if arg_type is None:
-            return
+            return ArgTypeShape.SINGLETON, None
 
         origin = get_origin(arg_type)
         if origin:
@@ -142,9 +223,7 @@ class ArgType:
                     if arg is not None:
                         allow_types.append(arg)
 
-                self.shape = ArgTypeShape.UNION
-                self.outer_type = [self._get_arg_type(t) for t in allow_types]
-                return
+                return ArgTypeShape.UNION, tuple(cls._get_arg_type(t) for t in allow_types)
 
             if inspect.isclass(origin):
                 if issubclass(origin, List):
@@ -154,14 +233,14 @@ class ArgType:
                         vt = args[0]
                         if not inspect.isclass(vt):
                             vt = None
-                        dtype = self._get_arg_type(vt)
+                        dtype = cls._get_arg_type(vt)
                 elif issubclass(origin, Mapping):
                     shape = ArgTypeShape.DICT
                     args = get_args(arg_type)
                     if args and len(args) == 2:
                         kt = args[0]
                         vt = args[1]
-                        dtype = (self._get_arg_type(kt), self._get_arg_type(vt))
+                        dtype = (cls._get_arg_type(kt), cls._get_arg_type(vt))
                     else:
                         dtype = (None, None)
                 elif issubclass(origin, Set):
@@ -171,39 +250,48 @@ class ArgType:
                         vt = args[0]
                         if not inspect.isclass(vt):
                             vt = None
-                        dtype = self._get_arg_type(vt)
+                        dtype = cls._get_arg_type(vt)
             if shape is None:
                 raise AssertionError(f'Unsupported generic argument type: {arg_type}')
-            self.shape = shape
-            self.outer_type = dtype
-            return
+            return shape, dtype
 
         if isinstance(arg_type, str):
             if hasattr(builtins, arg_type):
                 arg_type = getattr(builtins, arg_type)
-                self.outer_type = arg_type
 
         if not inspect.isclass(arg_type):
             raise AssertionError(f'Non-generic argument type must be a class, but got: {arg_type}')
         if issubclass(arg_type, List):
-            self.shape = ArgTypeShape.LIST
-            self.outer_type = None
-        elif issubclass(arg_type, Mapping):
-            self.shape = ArgTypeShape.DICT
-            self.outer_type = (None, None)
-        elif issubclass(arg_type, Set):
-            self.shape = ArgTypeShape.SET
-            self.outer_type = None
-
-    def _get_arg_type(self, arg_type):
+            return ArgTypeShape.LIST, None
+        if issubclass(arg_type, Mapping):
+            return ArgTypeShape.DICT, (None, None)
+        if issubclass(arg_type, Set):
+            return ArgTypeShape.SET, None
+        return ArgTypeShape.SINGLETON, arg_type
+
+    @staticmethod
+    def _get_arg_type(arg_type):
         try:
-            result = self.__class__(arg_type)
+            result = analyze_arg_type(arg_type)
         except Exception:
-            result = self.__class__(None)
+            result = analyze_arg_type(None)
         if result.is_singleton():
             return result.outer_type
         return result
 
 
-def analyze_arg_type(arg_type: Optional[type]) -> ArgType:
+ARG_TYPE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=ARG_TYPE_CACHE_SIZE)
+def _get_interned_arg_type(arg_type, key) -> ArgType:
     return ArgType(arg_type)
+
+
+def analyze_arg_type(arg_type: Optional[type]) -> ArgType:
+    try:
+        # unions compare equal regardless of the order of the arguments, which is kept by the args
+        return _get_interned_arg_type(arg_type, (get_origin(arg_type), get_args(arg_type)))
+    except TypeError:
+        # unhashable type
+        return ArgType(arg_type)
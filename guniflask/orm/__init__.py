@@ -1,6 +1,10 @@
 from .base_model import BaseModelMixin
+from .export import iter_query_batches
+from .export import stream_query
 from .model_utils import dict_to_model
 from .model_utils import model_to_dict
+from .model_utils import models_to_dicts
 from .model_utils import result_to_dict
+from .model_utils import results_to_dicts
 from .model_utils import update_model_by_dict
 from .sqlalchemy_wrapper import wrap_sqlalchemy_model
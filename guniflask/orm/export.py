@@ -0,0 +1,83 @@
+from itertools import islice
+from typing import Iterator, List, Union
+
+import sqlalchemy
+from sqlalchemy import Select
+from sqlalchemy.orm import Query, Session
+
+from guniflask.orm.model_utils import _get_plan, _model_to_dict, results_to_dicts
+from guniflask.utils.rule import make_field_rule
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_query_batches(
+        query: Union[Query, Select],
+        session: Session = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ignore=None,
+        only=None,
+        include=None,
+) -> Iterator[List[dict]]:
+    """
+    Fetch the rows of a query in batches by server-side cursors if the database supports,
+    and yield each batch of rows converted to dicts.
+
+    The query of a single model is rewritten to select the columns in the plan of the mapper directly
+    if no relationship is included, so that the rows are converted without loading the models.
+    A ``Select`` is executed by the given session.
+    """
+    if isinstance(query, Select) and session is None:
+        raise ValueError('The session is required to execute a Select')
+    rule = None
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1 and descriptions[0]['entity'] is not None \
+            and descriptions[0]['type'] is descriptions[0]['entity']:
+        model_cls = descriptions[0]['entity']
+        rule = make_field_rule(ignore, only or None, include)
+        plan = _get_plan(model_cls, rule)
+        if plan.columns and not plan.relationships and not sqlalchemy.inspect(model_cls).polymorphic_map:
+            columns = [getattr(model_cls, k).label(k) for k, _ in plan.columns]
+            if isinstance(query, Query):
+                query = query.with_entities(*columns)
+            else:
+                query = query.with_only_columns(*columns)
+            rule = ignore = only = None
+
+    if isinstance(query, Query):
+        rows = iter(query.yield_per(batch_size))
+        batches = iter(lambda: list(islice(rows, batch_size)), [])
+    else:
+        result = session.execute(query, execution_options={'yield_per': batch_size})
+        if rule is not None:
+            result = result.scalars()
+        batches = result.partitions(batch_size)
+
+    if rule is not None:
+        for batch in batches:
+            yield [_model_to_dict(model, rule) for model in batch]
+    else:
+        for batch in batches:
+            yield results_to_dicts(batch, ignore=ignore, only=only)
+
+
+def stream_query(
+        query: Union[Query, Select],
+        session: Session = None,
+        stream_format: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ignore=None,
+        only=None,
+        include=None,
+):
+    """
+    Stream the rows of a query as a JSON array or NDJSON, which can be returned by a view function directly.
+    The format is negotiated by the Accept header if not given.
+    """
+    # imported here to avoid the circular import with guniflask.web
+    from guniflask.web.response_stream import stream_batches
+
+    return stream_batches(
+        iter_query_batches(query, session=session, batch_size=batch_size, ignore=ignore, only=only, include=include),
+        stream_format=stream_format,
+    )
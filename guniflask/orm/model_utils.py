@@ -1,9 +1,12 @@
 import datetime as dt
+import itertools
+import operator
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import sqlalchemy
 
 from guniflask.utils.datatime import convert_to_datetime, local_tz_info
-from guniflask.utils.rule import make_ignore_rule_for_field, make_include_rule_for_field, make_only_rule_for_field
+from guniflask.utils.rule import FieldRule, make_field_rule, make_ignore_rule_for_field, make_only_rule_for_field
 
 
 class DictRecursionError(Exception):
@@ -11,71 +14,90 @@ class DictRecursionError(Exception):
 
 
 def model_to_dict(model, ignore=None, only=None, include=None):
-    return _model_to_dict(model, ignore=ignore, only=only, include=include)
-
-
-def _model_to_dict(model, ignore=None, only=None, include=None, __prefix='', __exists=None) -> dict:
-    if __exists is None:
-        __exists = set()
-    if model in __exists:
+    return _model_to_dict(model, make_field_rule(ignore, only or None, include))
+
+
+def models_to_dicts(models: Iterable, ignore=None, only=None, include=None) -> List[dict]:
+    """
+    Convert the models to dicts, of which the rules are built once and the keys are resolved once for each mapper.
+    """
+    rule = make_field_rule(ignore, only or None, include)
+    return [_model_to_dict(model, rule) for model in models]
+
+
+class _MapperPlan:
+    """
+    The keys of a mapped class resolved by the rules at a level of the nested models.
+    """
+
+    __slots__ = ('columns', 'relationships', 'fields')
+
+    def __init__(self, model_cls, rule: FieldRule):
+        mapper = sqlalchemy.inspect(model_cls)
+        # (key, whether the values may be datetime) of the columns to dump
+        self.columns: List[Tuple[str, bool]] = []
+        # (key, rule of the related models) of the included relationships to dump
+        self.relationships: List[Tuple[str, FieldRule]] = []
+        # key -> (whether the value is datetime, the related class, rule of the related models) of the fields to load
+        self.fields: Dict[str, Tuple[bool, Optional[type], FieldRule]] = {}
+        for key, prop in mapper.column_attrs.items():
+            if rule.accepts(key):
+                column_type = prop.columns[0].type
+                self.columns.append((key, _may_be_datetime(column_type)))
+                self.fields[key] = (isinstance(column_type, sqlalchemy.DateTime), None, rule.child(key))
+        for key, prop in mapper.relationships.items():
+            if rule.accepts(key):
+                if key in rule.include:
+                    self.relationships.append((key, rule.child(key)))
+                self.fields[key] = (False, prop.mapper.class_, rule.child(key))
+
+
+def _get_plan(model_cls, rule: FieldRule) -> _MapperPlan:
+    plan = rule.plans.get(model_cls)
+    if plan is None:
+        plan = _MapperPlan(model_cls, rule)
+        rule.plans[model_cls] = plan
+    return plan
+
+
+def _may_be_datetime(column_type) -> bool:
+    try:
+        return issubclass(column_type.python_type, dt.datetime)
+    except NotImplementedError:
+        return True
+
+
+def _model_to_dict(model, rule: FieldRule, exists: set = None) -> dict:
+    if exists is not None and model in exists:
         raise DictRecursionError
-    __exists.add(model)
-
-    mapper = sqlalchemy.inspect(model).mapper
-    col_attrs = mapper.column_attrs
-    relationships = mapper.relationships
 
+    plan = _get_plan(type(model), rule)
     d = {}
-    ignore_set = make_ignore_rule_for_field(ignore)
-    only_set = make_only_rule_for_field(only)
-    include_set = make_include_rule_for_field(include)
-    keys = list(col_attrs.keys())
-    for k in relationships.keys():
-        if _new_prefix(__prefix, k) in include_set:
-            keys.append(k)
-    for key in keys:
-        if _in_set(__prefix, key, ignore_set):
-            continue
-        if only and not _in_set(__prefix, key, only_set):
+    for key, may_be_datetime in plan.columns:
+        v = getattr(model, key)
+        if may_be_datetime and isinstance(v, dt.datetime) and v.tzinfo is None:
+            v = v.replace(tzinfo=local_tz_info)
+        d[key] = v
+    if not plan.relationships:
+        return d
+
+    if exists is None:
+        exists = set()
+    exists.add(model)
+    for key, child_rule in plan.relationships:
+        if not hasattr(model, key):
             continue
-
-        if key in col_attrs:
-            v = getattr(model, key)
-            if isinstance(v, dt.datetime) and v.tzinfo is None:
-                v = v.replace(tzinfo=local_tz_info)
+        v = getattr(model, key)
+        try:
+            if v:
+                if isinstance(v, (list, set)):
+                    v = [_model_to_dict(obj, child_rule, exists) for obj in v]
+                else:
+                    v = _model_to_dict(v, child_rule, exists)
             d[key] = v
-        elif key in relationships:
-            if not hasattr(model, key):
-                continue
-            v = getattr(model, key)
-            try:
-                if v:
-                    if isinstance(v, (list, set)):
-                        t = [
-                            _model_to_dict(
-                                obj,
-                                ignore=ignore_set,
-                                only=only_set,
-                                include=include_set,
-                                __prefix=_new_prefix(__prefix, key),
-                                __exists=__exists,
-                            )
-                            for obj in v
-                        ]
-                        v = t
-                    else:
-                        v = _model_to_dict(
-                            v,
-                            ignore=ignore_set,
-                            only=only_set,
-                            include=include_set,
-                            __prefix=_new_prefix(__prefix, key),
-                            __exists=__exists,
-                        )
-                d[key] = v
-            except DictRecursionError:
-                pass
-    __exists.remove(model)
+        except DictRecursionError:
+            pass
+    exists.remove(model)
     return d
 
 
@@ -94,104 +116,120 @@ def result_to_dict(result, ignore=None, only=None) -> dict:
     return res
 
 
+def results_to_dicts(result, ignore=None, only=None, columnar: bool = False) -> Union[List[dict], Dict[str, list]]:
+    """
+    Convert the rows of a query result to dicts, or to a dict of the lists of the values of each column
+    if ``columnar`` is True.
+
+    The projected keys are resolved once from the keys of the result,
+    and only the columns of which the values in the first row are datetime or None are checked for the naive datetime.
+    """
+    rows = iter(result)
+    first = next(rows, None)
+    if hasattr(result, 'keys'):
+        keys = list(result.keys())
+    elif first is not None:
+        keys = list(first._fields)
+    else:
+        keys = []
+    ignore_set = make_ignore_rule_for_field(ignore)
+    only_set = make_only_rule_for_field(only)
+    indexes = [i for i, k in enumerate(keys) if k not in ignore_set and (not only or k in only_set)]
+    keys = [keys[i] for i in indexes]
+    if first is None:
+        return {k: [] for k in keys} if columnar else []
+
+    project = _make_projection(indexes, len(first))
+    first = project(first)
+    datetime_positions = [i for i, v in enumerate(first) if v is None or isinstance(v, dt.datetime)]
+    rows = itertools.chain((first,), map(project, rows))
+
+    if columnar:
+        columns = [list(c) for c in zip(*rows)] or [[] for _ in keys]
+        for i in datetime_positions:
+            columns[i] = [_set_local_tz(v) for v in columns[i]]
+        return dict(zip(keys, columns))
+
+    if not datetime_positions:
+        return [dict(zip(keys, row)) for row in rows]
+    datetime_keys = [keys[i] for i in datetime_positions]
+    res = []
+    for row in rows:
+        d = dict(zip(keys, row))
+        for k in datetime_keys:
+            v = d[k]
+            if isinstance(v, dt.datetime) and v.tzinfo is None:
+                d[k] = v.replace(tzinfo=local_tz_info)
+        res.append(d)
+    return res
+
+
+def _make_projection(indexes: List[int], size: int) -> Callable[[Sequence], Sequence]:
+    if len(indexes) == size:
+        return lambda row: row
+    if len(indexes) == 1:
+        i = indexes[0]
+        return lambda row: (row[i],)
+    if not indexes:
+        return lambda row: ()
+    return operator.itemgetter(*indexes)
+
+
+def _set_local_tz(v):
+    if isinstance(v, dt.datetime) and v.tzinfo is None:
+        return v.replace(tzinfo=local_tz_info)
+    return v
+
+
 def dict_to_model(dict_obj: dict, model_cls, ignore=None, only=None):
-    return _dict_to_model(dict_obj, model_cls, ignore=ignore, only=only)
+    return _dict_to_model(dict_obj, model_cls, make_field_rule(ignore, only or None))
 
 
-def _dict_to_model(dict_obj: dict, model_cls, ignore=None, only=None, __prefix=''):
-    mapper = sqlalchemy.inspect(model_cls).mapper
-    col_attrs = mapper.column_attrs
-    relationships = mapper.relationships
-    ignore_set = make_ignore_rule_for_field(ignore)
-    only_set = make_only_rule_for_field(only)
+def _dict_to_model(dict_obj: dict, model_cls, rule: FieldRule):
+    fields = _get_plan(model_cls, rule).fields
     kwargs = {}
-    for key in dict_obj:
-        if key in col_attrs or key in relationships:
-            if _in_set(__prefix, key, ignore_set):
-                continue
-            if only and not _in_set(__prefix, key, only_set):
-                continue
-            v = dict_obj[key]
-            if key in relationships:
-                if isinstance(v, dict):
-                    obj_cls = relationships[key].mapper.class_
-                    v = _dict_to_model(
-                        v,
-                        obj_cls,
-                        ignore=ignore_set,
-                        only=only_set,
-                        __prefix=_new_prefix(__prefix, key),
-                    )
-                elif isinstance(v, (list, set)):
-                    obj_cls = relationships[key].mapper.class_
-                    t = [
-                        _dict_to_model(
-                            obj,
-                            obj_cls,
-                            ignore=ignore_set,
-                            only=only_set,
-                            __prefix=_new_prefix(__prefix, key),
-                        )
-                        for obj in v
-                    ]
-                    v = t
-            elif key in col_attrs:
-                if isinstance(getattr(model_cls, key).type, sqlalchemy.DateTime):
-                    v = convert_to_datetime(v)
-            kwargs[key] = v
+    for key, v in dict_obj.items():
+        field = fields.get(key)
+        if field is None:
+            continue
+        is_datetime, obj_cls, child_rule = field
+        if obj_cls is not None:
+            if isinstance(v, dict):
+                v = _dict_to_model(v, obj_cls, child_rule)
+            elif isinstance(v, (list, set)):
+                v = [_dict_to_model(obj, obj_cls, child_rule) for obj in v]
+        elif is_datetime:
+            v = convert_to_datetime(v)
+        kwargs[key] = v
     model = model_cls(**kwargs)
     return model
 
 
 def update_model_by_dict(model, dict_obj: dict, ignore=None, only=None):
-    _update_model_by_dict(model, dict_obj, ignore=ignore, only=only)
+    _update_model_by_dict(model, dict_obj, make_field_rule(ignore, only or None))
 
 
-def _update_model_by_dict(model, dict_obj: dict, ignore=None, only=None, __prefix=''):
-    mapper = sqlalchemy.inspect(model).mapper
-    col_attrs = mapper.column_attrs
-    relationships = mapper.relationships
-    ignore_set = make_ignore_rule_for_field(ignore)
-    only_set = make_only_rule_for_field(only)
-    for key in dict_obj:
-        if key in col_attrs or key in relationships:
-            if _in_set(__prefix, key, ignore_set):
-                continue
-            if only and not _in_set(__prefix, key, only_set):
-                continue
-            v = dict_obj[key]
-            if key in relationships:
-                if isinstance(v, dict):
-                    obj = getattr(model, key)
-                    if obj:
-                        _update_model_by_dict(
-                            obj,
-                            v,
-                            ignore=ignore_set,
-                            only=only_set,
-                            __prefix=_new_prefix(__prefix, key),
-                        )
-                        v = obj
-                    else:
-                        obj_cls = relationships[key].mapper.class_
-                        v = _dict_to_model(
-                            v,
-                            obj_cls,
-                            ignore=ignore_set,
-                            only=only_set,
-                            __prefix=_new_prefix(__prefix, key),
-                        )
-                elif isinstance(v, (list, set)):
-                    # FIXME
-                    raise RuntimeError(f'do not support to update a list: "{_new_prefix(__prefix, key)}"')
-            elif key in col_attrs:
-                if isinstance(col_attrs[key].class_attribute.type, sqlalchemy.DateTime):
-                    v = convert_to_datetime(v)
-            setattr(model, key, v)
-
-
-def _in_set(prefix: str, key: str, s: set):
-    return _new_prefix(prefix, key) in s
+def _update_model_by_dict(model, dict_obj: dict, rule: FieldRule, __prefix=''):
+    fields = _get_plan(type(model), rule).fields
+    for key, v in dict_obj.items():
+        field = fields.get(key)
+        if field is None:
+            continue
+        is_datetime, obj_cls, child_rule = field
+        if obj_cls is not None:
+            if isinstance(v, dict):
+                obj = getattr(model, key)
+                if obj:
+                    _update_model_by_dict(obj, v, child_rule, __prefix=_new_prefix(__prefix, key))
+                    v = obj
+                else:
+                    v = _dict_to_model(v, obj_cls, child_rule)
+            elif isinstance(v, (list, set)):
+                # FIXME
+                raise RuntimeError(f'do not support to update a list: "{_new_prefix(__prefix, key)}"')
+        elif is_datetime:
+            v = convert_to_datetime(v)
+        setattr(model, key, v)
 
 
 def _new_prefix(prefix: str, key: str):
@@ -1,4 +1,3 @@
-import inspect
 import logging
 from functools import partial, update_wrapper
 
@@ -17,19 +16,19 @@ class AsyncPostProcessor(BeanPostProcessor, BeanFactoryAware, SmartInitializingS
     def __init__(self):
         self.bean_factory = None
         self._async_methods = []
+        self._registration_finished = False
 
     def set_bean_factory(self, bean_factory: BeanFactory):
         self.bean_factory = bean_factory
 
     def post_process_after_initialization(self, bean, bean_name: str):
-        bean_type = bean.__class__
-        for m in dir(bean_type):
-            func = getattr(bean_type, m)
-            if inspect.isfunction(func):
-                a = AnnotationUtils.get_annotation(func, AsyncRun)
-                if a is not None:
-                    method = getattr(bean, m)
-                    self._async_methods.append((a, bean, method))
+        for m, func, a in AnnotationUtils.get_annotated_methods(bean.__class__, AsyncRun):
+            method = getattr(bean, m)
+            if self._registration_finished:
+                # lazily initialized beans are created after the registration
+                self._process_async(a, bean, method)
+            else:
+                self._async_methods.append((a, bean, method))
         return bean
 
     def after_singletons_instantiated(self):
@@ -40,6 +39,8 @@ class AsyncPostProcessor(BeanPostProcessor, BeanFactoryAware, SmartInitializingS
             'Bean factory must be set to find async executors'
         for async_run, bean, method in self._async_methods:
             self._process_async(async_run, bean, method)
+        self._async_methods = []
+        self._registration_finished = True
 
     def _process_async(self, async_run: AsyncRun, bean, method):
         if async_run['executor'] is None:
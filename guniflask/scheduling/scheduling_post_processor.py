@@ -1,5 +1,4 @@
 import datetime as dt
-import inspect
 
 from guniflask.annotation import AnnotationUtils
 from guniflask.beans.factory import BeanFactory, BeanFactoryAware
@@ -20,14 +19,9 @@ class ScheduledPostProcessor(BeanPostProcessor, BeanFactoryAware, SmartInitializ
         self.bean_factory = bean_factory
 
     def post_process_after_initialization(self, bean, bean_name: str):
-        bean_type = bean.__class__
-        for m in dir(bean_type):
-            func = getattr(bean_type, m)
-            if inspect.isfunction(func):
-                a = AnnotationUtils.get_annotation(func, Scheduled)
-                if a is not None:
-                    method = getattr(bean, m)
-                    self._scheduled_tasks.append((a, method))
+        for m, func, a in AnnotationUtils.get_annotated_methods(bean.__class__, Scheduled):
+            method = getattr(bean, m)
+            self._scheduled_tasks.append((a, method))
         return bean
 
     def after_singletons_instantiated(self):
@@ -1,4 +1,7 @@
-from typing import Union, List, Set
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Union
+
+FIELD_RULE_CACHE_SIZE = 256
 
 
 def _make_rule_set(rule: Union[str, List[str], Set[str]]):
@@ -29,3 +32,96 @@ def make_only_rule_for_field(field: Union[str, List[str], Set[str]]) -> set:
             for i in range(1, len(t)):
                 s.add('.'.join(t[:i]))
     return s
+
+
+class FieldRule:
+    """
+    The ignore, only and include rules of the fields resolved into a tree by the dotted paths,
+    of which each node holds the rules of the keys at a level of the nested objects.
+
+    The compiled plans of the classes under the rules can be cached in ``plans``.
+    """
+
+    __slots__ = ('ignore', 'only', 'include', 'children', 'default', 'plans')
+
+    def __init__(self, restricted: bool = False, default: 'FieldRule' = None):
+        self.ignore: Set[str] = set()
+        self.only: Optional[Set[str]] = set() if restricted else None
+        self.include: Set[str] = set()
+        self.children: Dict[str, FieldRule] = {}
+        self.default = default if default is not None else self
+        self.plans: Dict[Hashable, object] = {}
+
+    def accepts(self, key) -> bool:
+        return key not in self.ignore and (self.only is None or key in self.only)
+
+    def child(self, key) -> 'FieldRule':
+        return self.children.get(key, self.default)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.ignore and self.only is None and not self.include and not self.children
+
+    def _add_path(self, path: str) -> Tuple['FieldRule', str]:
+        *parents, key = path.split('.')
+        node = self
+        for p in parents:
+            if p not in node.children:
+                node.children[p] = FieldRule(restricted=node.only is not None, default=node.default)
+            node = node.children[p]
+        return node, key
+
+
+_EMPTY_RULE = FieldRule()
+
+_EMPTY_ONLY_RULE = FieldRule(restricted=True)
+
+
+def make_field_rule(
+        ignore: Union[str, List[str], Set[str]] = None,
+        only: Union[str, List[str], Set[str]] = None,
+        include: Union[str, List[str], Set[str]] = None,
+) -> FieldRule:
+    """
+    Return the tree of the ignore, only and include rules, which is cached by the rules.
+    """
+    return _get_field_rule(_make_rule_key(ignore), _make_rule_key(only), _make_rule_key(include))
+
+
+def _make_rule_key(rule):
+    if rule is None or isinstance(rule, str):
+        return rule
+    if isinstance(rule, (set, frozenset)):
+        return frozenset(rule)
+    return tuple(rule)
+
+
+@lru_cache(maxsize=FIELD_RULE_CACHE_SIZE)
+def _get_field_rule(ignore, only, include) -> FieldRule:
+    ignore = make_ignore_rule_for_field(_restore_rule(ignore))
+    only = make_only_rule_for_field(_restore_rule(only))
+    include = make_include_rule_for_field(_restore_rule(include))
+    if not ignore and not only and not include:
+        return _EMPTY_RULE
+    if only:
+        root = FieldRule(restricted=True, default=_EMPTY_ONLY_RULE)
+    else:
+        root = FieldRule(default=_EMPTY_RULE)
+    for path in ignore:
+        node, key = root._add_path(path)
+        node.ignore.add(key)
+    for path in only:
+        node, key = root._add_path(path)
+        node.only.add(key)
+    for path in include:
+        node, key = root._add_path(path)
+        node.include.add(key)
+    return root
+
+
+def _restore_rule(rule):
+    if isinstance(rule, frozenset):
+        return set(rule)
+    if isinstance(rule, tuple):
+        return list(rule)
+    return rule
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+from importlib import import_module
+from importlib.machinery import all_suffixes
+from importlib.util import find_spec
+from os.path import isdir, isfile, join
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from guniflask.utils.path import walk_modules
+
+log = logging.getLogger(__name__)
+
+
+class ModuleScanIndex:
+    """
+    Persistent index of the modules in packages, which records the kinds of members each module contains,
+    so that only the modules containing a kind of members need to be imported when scanning the packages.
+
+    Each module is keyed by the modification time, the size and the hash of its source file,
+    the modules which are new or have been changed are imported and indexed again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_file: str, detectors: Dict[str, Callable[[ModuleType], bool]]):
+        """
+        :param index_file: the file to persist the index
+        :param detectors: the functions to detect whether a module contains a kind of members
+        """
+        self.index_file = index_file
+        self._detectors = detectors
+        self._modules: Dict[str, dict] = {}
+        self._checked = set()
+        self._modified = False
+
+    @property
+    def modified(self) -> bool:
+        return self._modified
+
+    def load(self) -> bool:
+        if not isfile(self.index_file):
+            return False
+        try:
+            with open(self.index_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            log.warning('Failed to load the module scan index: %s', self.index_file, exc_info=True)
+            return False
+        if data.get('version') != self.VERSION or sorted(data.get('kinds', [])) != sorted(self._detectors):
+            return False
+        self._modules = data['modules']
+        return True
+
+    def save(self):
+        data = {'version': self.VERSION, 'kinds': sorted(self._detectors), 'modules': self._modules}
+        tmp_file = f'{self.index_file}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            log.warning('Failed to save the module scan index: %s', self.index_file, exc_info=True)
+        else:
+            self._modified = False
+
+    def walk_modules(self, base_module: str, kind: str) -> List[ModuleType]:
+        """
+        Import and return the modules in the package which contain the kind of members.
+        """
+        module_files = find_module_files(base_module)
+        if module_files is None:
+            modules = walk_modules(base_module)
+            for module in modules:
+                self._checked.add(module.__name__)
+            return [m for m in modules if self._detectors[kind](m)]
+
+        modules = []
+        for name, path in module_files:
+            entry = self._get_entry(name, path)
+            if entry is None:
+                entry = self._index_module(name, path, import_module(name))
+            if kind in entry['kinds']:
+                modules.append(import_module(name))
+        self._remove_missing_modules(base_module, {name for name, _ in module_files})
+        return modules
+
+    def build(self, base_module: str):
+        """
+        Import all the modules in the package and index them.
+        """
+        module_files = find_module_files(base_module)
+        if module_files is None:
+            raise ValueError(f'Cannot find the source files of the package: {base_module}')
+        for name, path in module_files:
+            self._index_module(name, path, import_module(name))
+        self._remove_missing_modules(base_module, {name for name, _ in module_files})
+
+    def _get_entry(self, name: str, path: str) -> Optional[dict]:
+        entry = self._modules.get(name)
+        if entry is None or entry['file'] != path:
+            return
+        if name in self._checked:
+            return entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        if entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            if entry['hash'] != file_hash(path):
+                return
+            entry['mtime'] = stat.st_mtime_ns
+            entry['size'] = stat.st_size
+            self._modified = True
+        self._checked.add(name)
+        return entry
+
+    def _index_module(self, name: str, path: str, module: ModuleType) -> dict:
+        stat = os.stat(path)
+        entry = {
+            'file': path,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': file_hash(path),
+            'kinds': [kind for kind, detector in sorted(self._detectors.items()) if detector(module)],
+        }
+        self._modules[name] = entry
+        self._checked.add(name)
+        self._modified = True
+        return entry
+
+    def _remove_missing_modules(self, base_module: str, names: set):
+        prefix = base_module + '.'
+        for name in list(self._modules):
+            if (name == base_module or name.startswith(prefix)) and name not in names:
+                del self._modules[name]
+                self._modified = True
+
+
+def find_module_files(base_module: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    Find the source files of the module and its submodules without importing them,
+    in the same order as ``walk_modules``.
+    Return None if the module is not located in regular files and directories.
+    """
+    spec = find_spec(base_module)
+    if spec is None or not spec.has_location or not spec.origin or not isfile(spec.origin):
+        return
+    files = [(base_module, spec.origin)]
+    if spec.submodule_search_locations is not None:
+        for path in spec.submodule_search_locations:
+            _find_submodule_files(base_module, path, files)
+    return files
+
+
+def _find_submodule_files(package: str, path: str, files: list):
+    suffixes = all_suffixes()
+    names = set()
+    for filename in sorted(os.listdir(path)):
+        full_path = join(path, filename)
+        if isdir(full_path):
+            if not filename.isidentifier():
+                continue
+            init_file = _find_init_file(full_path, suffixes)
+            if init_file is not None and filename not in names:
+                names.add(filename)
+                files.append((f'{package}.{filename}', init_file))
+                _find_submodule_files(f'{package}.{filename}', full_path, files)
+            continue
+        for suffix in suffixes:
+            if filename.endswith(suffix):
+                name = filename[:-len(suffix)]
+                if name.isidentifier() and name != '__init__' and name not in names:
+                    names.add(name)
+                    files.append((f'{package}.{name}', full_path))
+                break
+
+
+def _find_init_file(path: str, suffixes: List[str]) -> Optional[str]:
+    for suffix in suffixes:
+        init_file = join(path, '__init__' + suffix)
+        if isfile(init_file):
+            return init_file
+
+
+def file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
@@ -22,5 +22,11 @@ from .request_annotation import PathVariable
 from .request_annotation import RequestBody
 from .request_annotation import RequestHeader
 from .request_annotation import RequestParam
+from .request_scope import RequestScope
 from .request_filter import RequestFilter
 from .request_filter import RequestFilterChain
+from .response_stream import ServerSentEvent
+from .response_stream import stream_batches
+from .response_stream import stream_json_array
+from .response_stream import stream_ndjson
+from .response_stream import stream_sse
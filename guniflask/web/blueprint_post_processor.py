@@ -4,7 +4,7 @@ import logging
 from functools import update_wrapper
 from typing import Optional
 
-from flask import Blueprint as FlaskBlueprint, request, current_app
+from flask import Blueprint as FlaskBlueprint, request, current_app, after_this_request
 from pydantic import BaseModel
 
 from guniflask.annotation import AnnotationUtils
@@ -22,9 +22,14 @@ from guniflask.web.request_annotation import FilePartInfo, FormValueInfo, Reques
 from guniflask.web.request_annotation import PathVariableInfo
 from guniflask.web.request_annotation import RequestBody, RequestBodyInfo
 from guniflask.web.request_annotation import RequestParam, RequestParamInfo
+from guniflask.web.request_stream import DEFAULT_CHUNK_SIZE, DEFAULT_SPOOL_MAX_SIZE, StreamKind
+from guniflask.web.request_stream import iter_chunks, iter_ndjson, resolve_stream_type, spool_stream
+from guniflask.web.response_stream import is_streamable, make_stream_response
 
 log = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 class BlueprintPostProcessor(BeanPostProcessor, ApplicationEventListener):
     def __init__(self):
@@ -42,20 +47,18 @@ class BlueprintPostProcessor(BeanPostProcessor, ApplicationEventListener):
             b = FlaskBlueprint(bean_name, bean.__module__,
                                url_prefix=annotation['url_prefix'], **options)
             annotation['blueprint'] = b
-            for m in dir(bean_type):
-                func = getattr(bean_type, m)
-                if inspect.isfunction(func):
-                    method = getattr(bean, m)
-                    try:
-                        self._resolve_route(b, method)
-                        self._resolve_method_def_filter(b, method)
-                    except Exception:
-                        log.error(
-                            "Failed to resolve the route function '%s' in blueprint '%s'",
-                            m,
-                            bean_type.__name__,
-                        )
-                        raise
+            for m, func in AnnotationUtils.get_member_index(bean_type).annotated_functions:
+                method = getattr(bean, m)
+                try:
+                    self._resolve_route(b, method)
+                    self._resolve_method_def_filter(b, method)
+                except Exception:
+                    log.error(
+                        "Failed to resolve the route function '%s' in blueprint '%s'",
+                        m,
+                        bean_type.__name__,
+                    )
+                    raise
             self.blueprints.append(b)
         return bean
 
@@ -72,16 +75,30 @@ class BlueprintPostProcessor(BeanPostProcessor, ApplicationEventListener):
 
     def _wrap_view_func(self, rule: str, method):
         params, param_names = self._resolve_method_parameters(rule, method)
+        bind = self._compile_request_binder(params, param_names)
 
         def wrapper(**kwargs):
             try:
-                method_kwargs = self._resolve_method_kwargs(kwargs, params, param_names)
+                method_kwargs = bind(kwargs)
             except Exception as e:
                 raise RequestValidationError(e)
-            return method(**method_kwargs)
+            return self._make_response(method(**method_kwargs))
 
         return update_wrapper(wrapper, method)
 
+    def _make_response(self, rv):
+        """
+        Serialize the pydantic models returned by view functions directly, without building intermediate dicts,
+        and stream the items of the generators or iterators returned by view functions.
+        """
+        if isinstance(rv, BaseModel):
+            return current_app.response_class(rv.model_dump_json(), mimetype='application/json')
+        if is_streamable(rv):
+            return make_stream_response(rv)
+        if isinstance(rv, tuple) and rv and (isinstance(rv[0], BaseModel) or is_streamable(rv[0])):
+            return (self._make_response(rv[0]),) + rv[1:]
+        return rv
+
     def _resolve_method_def_filter(self, blueprint, method):
         a = AnnotationUtils.get_annotation(method, MethodDefFilter)
         if a is None:
@@ -119,8 +136,11 @@ class BlueprintPostProcessor(BeanPostProcessor, ApplicationEventListener):
             if not isinstance(default, FieldInfo):
                 if arg in type_hints:
                     arg_type = type_hints[arg]
-                    arg_ = analyze_arg_type(arg_type)
-                    if arg_.is_dict():
+                    if resolve_stream_type(arg_type) is not None:
+                        arg_ = None
+                    else:
+                        arg_ = analyze_arg_type(arg_type)
+                    if arg_ is None or arg_.is_dict():
                         annotation = RequestBody()
                     else:
                         annotation = RequestParam()
@@ -138,126 +158,268 @@ class BlueprintPostProcessor(BeanPostProcessor, ApplicationEventListener):
 
         return params, param_names
 
-    def _resolve_method_kwargs(self, kwargs: dict, params: dict, param_names: dict) -> dict:
+    def _compile_request_binder(self, params: dict, param_names: dict):
         """
-        :param kwargs: kwargs injected by Flask
+        Compile the binding of the view function parameters into a function converting the kwargs injected by Flask
+        into the kwargs of the view function, in which each parameter is bound by a precompiled extractor.
+
         :param params: view function parameters
         :param param_names: names of the above parameters
         """
-        result = {}
-        for k, v in kwargs.items():
-            if k in param_names:
-                k = param_names[k]
-            if k not in params:
-                raise AssertionError(f'Unhandled parameter: {k}={v}')
-            if params[k].dtype is not None:
-                try:
-                    v = params[k].dtype(v)
-                except ValueError:
-                    pass
-            result[k] = v
+        path_params = {}
         for k, p in params.items():
-            if k in result:
-                continue
-            name = p.name or k
-            if isinstance(p, PathVariableInfo):
+            path_params[k] = (k, p.dtype)
+        for name, k in param_names.items():
+            path_params[name] = (k, params[k].dtype)
+        binders = []
+        for k, p in params.items():
+            binders.append((k, self._compile_param_extractor(k, p), self._compile_missing_param_handler(k, p)))
+
+        def bind(kwargs: dict) -> dict:
+            result = {}
+            for name, v in kwargs.items():
+                if name not in path_params:
+                    raise AssertionError(f'Unhandled parameter: {name}={v}')
+                k, dtype = path_params[name]
+                if dtype is not None:
+                    try:
+                        v = dtype(v)
+                    except ValueError:
+                        pass
+                result[k] = v
+            for k, extract, handle_missing in binders:
+                if k in result:
+                    continue
+                v = extract()
+                if v is _MISSING:
+                    v = handle_missing()
+                result[k] = v
+            return result
+
+        return bind
+
+    def _compile_param_extractor(self, k: str, p: FieldInfo):
+        """
+        Compile the extractor of a parameter, which returns ``_MISSING`` if the parameter is not given.
+        """
+        name = p.name or k
+        dtype = p.dtype
+
+        if isinstance(p, PathVariableInfo):
+            def extract():
                 raise AssertionError(f'No such path variable: {name}')
 
-            if isinstance(p, RequestParamInfo):
-                if inspect.isclass(p.dtype) and issubclass(p.dtype, BaseModel):
-                    v = parse_json(request.args, dtype=p.dtype)
-                    result[k] = v
-                else:
-                    if name in request.args:
-                        arg_ = analyze_arg_type(p.dtype)
-                        if arg_.is_list():
-                            v = request.args.getlist(name)
-                            if arg_.outer_type:
-                                for i in range(len(v)):
-                                    v[i] = self._read_value(v[i], arg_.outer_type)
-                        elif arg_.is_singleton():
-                            v = request.args.get(name)
-                            if p.dtype is not None:
-                                v = self._read_value(v, p.dtype)
-                        else:
-                            raise AssertionError(f'Unsupported type of parameter "{name}": {p.dtype}')
-                        if v is not None:
-                            result[k] = v
-            elif isinstance(p, RequestBodyInfo):
-                if inspect.isclass(p.dtype) and issubclass(p.dtype, bytes):
-                    result[k] = request.data
-                else:
-                    v = parse_json(request.json, dtype=p.dtype)
-                    if v is not None:
-                        result[k] = v
-            elif isinstance(p, FilePartInfo):
-                file = request.files.get(name)
-                if file is not None:
-                    if p.dtype == bytes:
-                        result[k] = file.read()
-                    else:
-                        result[k] = file
-            elif isinstance(p, FormValueInfo):
-                arg_ = analyze_arg_type(p.dtype)
-                if arg_.is_list():
-                    v = request.form.getlist(name)
-                    if arg_.outer_type:
-                        for i in range(len(v)):
-                            v[i] = self._read_value(v[i], arg_.outer_type)
-                elif arg_.is_singleton():
-                    v = request.form.get(name)
-                    if p.dtype is not None:
-                        v = self._read_value(v, p.dtype)
-                else:
-                    raise AssertionError(f'Unsupported type of parameter "{name}": {p.dtype}')
-                if v is not None:
-                    result[k] = v
-            elif isinstance(p, RequestHeaderInfo):
-                arg_ = analyze_arg_type(p.dtype)
-                if arg_.is_list():
-                    v = request.headers.getlist(name)
-                    if arg_.outer_type:
-                        for i in range(len(v)):
-                            v[i] = self._read_value(v[i], arg_.outer_type)
-                elif arg_.is_singleton():
-                    v = request.headers.get(name)
-                    if p.dtype is not None:
-                        v = self._read_value(v, p.dtype)
-                else:
-                    raise AssertionError(f'Unsupported type of header "{name}": {p.dtype}')
-                if v is not None:
-                    result[k] = v
-            elif isinstance(p, CookieValueInfo):
+        elif isinstance(p, RequestParamInfo):
+            if inspect.isclass(dtype) and issubclass(dtype, BaseModel):
+                def extract():
+                    return parse_json(request.args, dtype=dtype)
+            else:
+                extract = self._compile_multi_dict_extractor(_get_request_args, name, dtype, 'parameter',
+                                                             check_contains=True)
+
+        elif isinstance(p, RequestBodyInfo):
+            stream_type = resolve_stream_type(dtype)
+            if stream_type is not None:
+                extract = self._compile_stream_extractor(_get_request_stream, stream_type, p)
+            elif inspect.isclass(dtype) and issubclass(dtype, bytes):
+                def extract():
+                    return request.data
+            elif inspect.isclass(dtype) and issubclass(dtype, BaseModel):
+                def extract():
+                    if request.is_json:
+                        data = request.get_data(cache=True)
+                        if data.strip() not in (b'', b'null'):
+                            return dtype.model_validate_json(data)
+                    v = parse_json(request.json, dtype=dtype)
+                    return _MISSING if v is None else v
+            else:
+                def extract():
+                    v = parse_json(request.json, dtype=dtype)
+                    return _MISSING if v is None else v
+
+        elif isinstance(p, FilePartInfo):
+            stream_type = resolve_stream_type(dtype)
+            if stream_type is not None:
+                def get_file_stream():
+                    file = request.files.get(name)
+                    if file is None:
+                        return _MISSING
+                    return file.stream
+
+                extract = self._compile_stream_extractor(get_file_stream, stream_type, p)
+            else:
+                read_bytes = dtype == bytes
+
+                def extract():
+                    file = request.files.get(name)
+                    if file is None:
+                        return _MISSING
+                    return file.read() if read_bytes else file
+
+        elif isinstance(p, FormValueInfo):
+            extract = self._compile_multi_dict_extractor(_get_request_form, name, dtype, 'parameter')
+
+        elif isinstance(p, RequestHeaderInfo):
+            extract = self._compile_multi_dict_extractor(_get_request_headers, name, dtype, 'header')
+
+        elif isinstance(p, CookieValueInfo):
+            read_value = self._compile_value_reader(dtype)
+
+            def extract():
                 v = request.cookies.get(name)
-                if v is not None:
-                    if p.dtype is not None:
-                        v = self._read_value(v, p.dtype)
-                    result[k] = v
-
-            if k not in result:
-                if p.required:
-                    if isinstance(p, RequestBodyInfo):
-                        raise AssertionError('Request body not given or in wrong format')
-                    else:
-                        raise AssertionError(f'Parameter not given: {name}')
-                result[k] = p.default
-        return result
+                if v is None:
+                    return _MISSING
+                return read_value(v)
 
-    def _read_value(self, v: Optional[str], dtype: type):
-        if v is None:
-            return
-        if dtype == bool:
-            try:
-                return bool(int(v))
-            except (ValueError, TypeError):
-                if v in ("True", "true"):
-                    return True
-                if v in ("False", "false"):
-                    return False
-        elif dtype == dt.datetime:
-            return convert_to_datetime(v)
         else:
+            def extract():
+                return _MISSING
+
+        return extract
+
+    def _compile_stream_extractor(self, get_stream, stream_type: tuple, p: FieldInfo):
+        """
+        Compile the extractor of a streaming parameter, the chunk size and the memory threshold of spooled files
+        can be set by the ``chunk_size`` and ``spool_max_size`` options of the parameter.
+        """
+        kind, item_type = stream_type
+        chunk_size = p.extra.get('chunk_size', DEFAULT_CHUNK_SIZE)
+
+        if kind == StreamKind.CHUNKS:
+            def convert(stream):
+                return iter_chunks(stream, chunk_size)
+        elif kind == StreamKind.SPOOLED:
+            spool_max_size = p.extra.get('spool_max_size', DEFAULT_SPOOL_MAX_SIZE)
+
+            def convert(stream):
+                f = spool_stream(stream, max_size=spool_max_size, chunk_size=chunk_size)
+
+                @after_this_request
+                def close_spooled_file(response):
+                    response.call_on_close(f.close)
+                    return response
+
+                return f
+        elif kind == StreamKind.NDJSON:
+            def convert(stream):
+                return iter_ndjson(stream, item_type, loads=current_app.json.loads)
+        else:
+            def convert(stream):
+                return stream
+
+        def extract():
+            stream = get_stream()
+            if stream is _MISSING:
+                return _MISSING
+            return convert(stream)
+
+        return extract
+
+    def _compile_multi_dict_extractor(self, get_source, name: str, dtype, kind: str, check_contains: bool = False):
+        arg_ = analyze_arg_type(dtype)
+        if arg_.is_list():
+            if arg_.outer_type:
+                read_item = self._compile_value_reader(arg_.outer_type)
+
+                def read(source):
+                    return [read_item(i) for i in source.getlist(name)]
+            else:
+                def read(source):
+                    return source.getlist(name)
+        elif arg_.is_singleton():
+            read_value = self._compile_value_reader(dtype)
+
+            def read(source):
+                v = read_value(source.get(name))
+                return _MISSING if v is None else v
+        else:
+            def read(source):
+                raise AssertionError(f'Unsupported type of {kind} "{name}": {dtype}')
+
+        if check_contains:
+            def extract():
+                source = get_source()
+                if name not in source:
+                    return _MISSING
+                return read(source)
+        else:
+            def extract():
+                return read(get_source())
+
+        return extract
+
+    def _compile_missing_param_handler(self, k: str, p: FieldInfo):
+        if p.required:
+            if isinstance(p, RequestBodyInfo):
+                message = 'Request body not given or in wrong format'
+            else:
+                message = f'Parameter not given: {p.name or k}'
+
+            def handle_missing():
+                raise AssertionError(message)
+        else:
+            default = p.default
+
+            def handle_missing():
+                return default
+
+        return handle_missing
+
+    def _compile_value_reader(self, dtype):
+        """
+        Compile the function reading a value of the given type from a string.
+        """
+        if dtype is None:
+            return _read_raw_value
+        if dtype == bool:
+            return _read_bool_value
+        if dtype == dt.datetime:
+            return _read_datetime_value
+
+        def read_value(v: Optional[str]):
+            if v is None:
+                return
             try:
                 return dtype(v)
             except (ValueError, TypeError):
                 raise AssertionError(f'Failed to read value, type: {dtype.__name__}, value: {v}')
+
+        return read_value
+
+
+def _get_request_stream():
+    return request.stream
+
+
+def _get_request_args():
+    return request.args
+
+
+def _get_request_form():
+    return request.form
+
+
+def _get_request_headers():
+    return request.headers
+
+
+def _read_raw_value(v: Optional[str]):
+    return v
+
+
+def _read_bool_value(v: Optional[str]):
+    if v is None:
+        return
+    try:
+        return bool(int(v))
+    except (ValueError, TypeError):
+        if v in ("True", "true"):
+            return True
+        if v in ("False", "false"):
+            return False
+
+
+def _read_datetime_value(v: Optional[str]):
+    if v is None:
+        return
+    return convert_to_datetime(v)
@@ -0,0 +1,239 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Type
+
+from werkzeug.http import parse_accept_header
+
+
+class Compressor:
+    """
+    Compress the response body of an encoding at a given level, either at once or incrementally.
+    """
+
+    encoding = None
+
+    def __init__(self, level: int = None):
+        self.level = level
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def compress(self, data: bytes) -> bytes:
+        c = self.compressobj()
+        return c.compress(data) + c.flush()
+
+    def compressobj(self):
+        """
+        Return an object with the methods ``compress(data)`` and ``flush()``,
+        of which ``flush(sync=True)`` emits all the pending data without ending the stream.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def compress_stream(self, chunks: Iterable[bytes], sync_flush: bool = False) -> Iterator[bytes]:
+        """
+        Compress the chunks incrementally, and flush the compressed data of each chunk if ``sync_flush`` is True.
+        """
+        c = self.compressobj()
+        for chunk in chunks:
+            data = c.compress(chunk)
+            if sync_flush:
+                data += c.flush(sync=True)
+            if data:
+                yield data
+        yield c.flush()
+
+
+class GzipCompressor(Compressor):
+    encoding = 'gzip'
+
+    def __init__(self, level: int = None):
+        super().__init__(6 if level is None else level)
+
+    def compressobj(self):
+        return _ZlibCompressObj(zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS))
+
+
+class _ZlibCompressObj:
+    def __init__(self, c):
+        self._c = c
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self, sync: bool = False) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH if sync else zlib.Z_FINISH)
+
+
+class BrotliCompressor(Compressor):
+    encoding = 'br'
+
+    def __init__(self, level: int = None):
+        super().__init__(4 if level is None else level)
+        self._brotli = _import_brotli()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return _import_brotli() is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self.level)
+
+    def compressobj(self):
+        return _BrotliCompressObj(self._brotli.Compressor(quality=self.level))
+
+
+class _BrotliCompressObj:
+    def __init__(self, c):
+        self._c = c
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self, sync: bool = False) -> bytes:
+        return self._c.flush() if sync else self._c.finish()
+
+
+def _import_brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        pass
+    try:
+        import brotlicffi
+        return brotlicffi
+    except ImportError:
+        pass
+
+
+class ZstdCompressor(Compressor):
+    encoding = 'zstd'
+
+    def __init__(self, level: int = None):
+        super().__init__(3 if level is None else level)
+        import zstandard
+
+        self._zstd = zstandard
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import zstandard
+        except ImportError:
+            return False
+        return True
+
+    def compress(self, data: bytes) -> bytes:
+        return self._create_cctx().compress(data)
+
+    def compressobj(self):
+        return _ZstdCompressObj(self._create_cctx().compressobj(), self._zstd)
+
+    def _create_cctx(self):
+        # a compression context cannot be shared by concurrent or interleaved streams
+        return self._zstd.ZstdCompressor(level=self.level)
+
+
+class _ZstdCompressObj:
+    def __init__(self, c, zstd):
+        self._c = c
+        self._zstd = zstd
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self, sync: bool = False) -> bytes:
+        return self._c.flush(self._zstd.COMPRESSOBJ_FLUSH_BLOCK if sync else self._zstd.COMPRESSOBJ_FLUSH_FINISH)
+
+
+COMPRESSORS: Dict[str, Type[Compressor]] = {
+    ZstdCompressor.encoding: ZstdCompressor,
+    BrotliCompressor.encoding: BrotliCompressor,
+    GzipCompressor.encoding: GzipCompressor,
+}
+
+
+def get_available_encodings() -> List[str]:
+    """
+    Return the encodings of which the libraries are available, in the order of preference.
+    """
+    return [k for k, v in COMPRESSORS.items() if v.is_available()]
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: List[str]) -> Optional[str]:
+    """
+    Select the encoding with the highest q-value in the Accept-Encoding header,
+    the encodings are preferred in the given order when they have the same q-value.
+
+    Only gzip is selected if the header is absent, and None is returned if no encoding is acceptable.
+    """
+    if accept_encoding is None:
+        return 'gzip' if 'gzip' in encodings else None
+    accept = parse_accept_header(accept_encoding)
+    best = None
+    best_q = 0
+    for encoding in encodings:
+        q = accept.quality(encoding)
+        if q > best_q:
+            best = encoding
+            best_q = q
+    return best
+
+
+class CompressionCache:
+    """
+    The LRU cache of compressed bodies bounded by the total size of the bodies.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: Hashable, data: bytes):
+        if len(data) > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size,
+                'max_size': self.max_size,
+            }
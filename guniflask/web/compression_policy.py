@@ -0,0 +1,179 @@
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+DEFAULT_MIN_LEVELS = {'gzip': 1, 'br': 1, 'zstd': 1}
+
+DEFAULT_MAX_LEVELS = {'gzip': 9, 'br': 9, 'zstd': 12}
+
+FAST_ENCODINGS = ['zstd', 'gzip', 'br']
+
+LOW_LATENCY_TYPES = {
+    'text/event-stream',
+}
+
+
+class AdaptiveCompressionOption(BaseModel):
+    min_levels: Union[Dict[str, int], None] = None
+    max_levels: Union[Dict[str, int], None] = None
+    low_load: float = 0.3
+    high_load: float = 0.8
+    skip_load: float = 0.95
+    large_body_size: int = 1024 * 1024
+    skip_min_length: int = 256 * 1024
+    sample_interval: float = 1.0
+    smoothing: float = 0.5
+    queue_time_limit: Union[float, None] = None
+
+
+class LoadMonitor:
+    """
+    Measure the load of the worker as a number between 0 and 1, which is the rolling average of the CPU utilization
+    of the process, or the ratio of the rolling average of the request queue time to ``queue_time_limit``
+    if it is higher.
+    """
+
+    def __init__(self, sample_interval: float = 1.0, smoothing: float = 0.5, queue_time_limit: float = None):
+        self.sample_interval = sample_interval
+        self.smoothing = smoothing
+        self.queue_time_limit = queue_time_limit
+        self.cpu_load = 0.0
+        self.queue_time = 0.0
+        self._last_wall_time = time.monotonic()
+        self._last_cpu_time = time.process_time()
+        self._lock = threading.Lock()
+
+    def get_load(self) -> float:
+        now = time.monotonic()
+        if now - self._last_wall_time >= self.sample_interval:
+            self._sample_cpu_load(now)
+        load = self.cpu_load
+        if self.queue_time_limit:
+            load = max(load, self.queue_time / self.queue_time_limit)
+        return min(load, 1.0)
+
+    def record_queue_time(self, queue_time: float):
+        with self._lock:
+            self.queue_time = self.smoothing * max(queue_time, 0.0) + (1 - self.smoothing) * self.queue_time
+
+    def _sample_cpu_load(self, now: float):
+        with self._lock:
+            wall_time = now - self._last_wall_time
+            if wall_time < self.sample_interval:
+                return
+            cpu_time = time.process_time()
+            utilization = min((cpu_time - self._last_cpu_time) / wall_time, 1.0)
+            self.cpu_load = self.smoothing * utilization + (1 - self.smoothing) * self.cpu_load
+            self._last_wall_time = now
+            self._last_cpu_time = cpu_time
+
+
+def parse_request_start(value: str, now: float = None) -> Optional[float]:
+    """
+    Parse the request queue time in seconds from the X-Request-Start header set by the proxy,
+    in the form of ``t=<timestamp>`` or ``<timestamp>`` in seconds, milliseconds or microseconds.
+    """
+    if value.startswith('t='):
+        value = value[2:]
+    try:
+        start = float(value)
+    except ValueError:
+        return
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+    if now is None:
+        now = time.time()
+    return max(now - start, 0.0)
+
+
+class AdaptiveCompressionPolicy:
+    """
+    Select the encoding and the level of compression by the load of the worker, the size and the type of the body.
+
+    The levels are lowered from the max levels to the min levels linearly as the load rises from ``low_load``
+    to ``high_load``, and twice as fast for the bodies larger than ``large_body_size`` or streamed.
+    The fastest encodings are preferred when the load reaches ``high_load``,
+    and the bodies larger than ``skip_min_length`` or streamed are not compressed when the load reaches
+    ``skip_load``.
+    The low-latency types such as Server-Sent Events are always compressed at the min levels.
+    The max levels default to the given static levels of the encodings.
+    """
+
+    def __init__(self, option: AdaptiveCompressionOption = None, load_monitor: LoadMonitor = None,
+                 levels: Dict[str, int] = None):
+        if option is None:
+            option = AdaptiveCompressionOption()
+        self.option = option
+        self.min_levels = dict(DEFAULT_MIN_LEVELS)
+        if option.min_levels:
+            self.min_levels.update(option.min_levels)
+        self.max_levels = dict(DEFAULT_MAX_LEVELS)
+        if levels:
+            self.max_levels.update(levels)
+        if option.max_levels:
+            self.max_levels.update(option.max_levels)
+        if load_monitor is None:
+            load_monitor = LoadMonitor(sample_interval=option.sample_interval,
+                                       smoothing=option.smoothing,
+                                       queue_time_limit=option.queue_time_limit)
+        self.load_monitor = load_monitor
+        self._selected_levels: Dict[str, int] = {}
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def get_encodings(self, encodings: List[str]) -> List[str]:
+        """
+        Reorder the encodings in the order of preference by the current load.
+        """
+        if self.load_monitor.get_load() < self.option.high_load:
+            return encodings
+        return [e for e in FAST_ENCODINGS if e in encodings] + [e for e in encodings if e not in FAST_ENCODINGS]
+
+    def select_level(self, encoding: str, size: Optional[int], mimetype: str) -> Optional[int]:
+        """
+        Select the level of compression, or return None if the body should not be compressed.
+        The selection is not counted in the metrics until it is recorded by ``record_level``.
+
+        :param encoding: the negotiated encoding
+        :param size: the size of the body, which is None if the body is streamed
+        :param mimetype: the type of the body
+        """
+        min_level = self.min_levels.get(encoding, 1)
+        max_level = max(self.max_levels.get(encoding, min_level), min_level)
+        if mimetype in LOW_LATENCY_TYPES:
+            return min_level
+        load = self.load_monitor.get_load()
+        if load >= self.option.skip_load and (size is None or size >= self.option.skip_min_length):
+            return
+        span = self.option.high_load - self.option.low_load
+        if span > 0:
+            ratio = (load - self.option.low_load) / span
+        else:
+            ratio = 1.0 if load >= self.option.high_load else 0.0
+        if size is None or size >= self.option.large_body_size:
+            ratio *= 2
+        ratio = min(max(ratio, 0.0), 1.0)
+        return round(max_level - (max_level - min_level) * ratio)
+
+    def record_level(self, encoding: str, level: Optional[int]):
+        """
+        Record the level of compression which is actually used, or None if the body is not compressed.
+        """
+        with self._lock:
+            if level is None:
+                self._skipped += 1
+            else:
+                key = f'{encoding}:{level}'
+                self._selected_levels[key] = self._selected_levels.get(key, 0) + 1
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                'load': self.load_monitor.get_load(),
+                'levels': dict(self._selected_levels),
+                'skipped': self._skipped,
+            }
@@ -1,15 +1,21 @@
 from flask import Flask
 
+from guniflask.annotation import AnnotationUtils
 from guniflask.beans.definition import BeanDefinition
 from guniflask.context.default_bean_context import AnnotationConfigBeanContext
+from guniflask.scheduling.annotation import Scheduled
+from guniflask.web.bind_annotation import Blueprint
 from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
 from guniflask.web.config_constants import *
+from guniflask.web.event_multicaster import WebAsyncEventMulticaster
+from guniflask.web.request_scope import RequestScope
 
 
 class WebApplicationContext(AnnotationConfigBeanContext):
     def __init__(self, app: Flask):
         super().__init__()
         self.app = app
+        self.register_scope(BeanDefinition.SCOPE_REQUEST, RequestScope(app))
 
     def _post_process_bean_factory(self):
         super()._post_process_bean_factory()
@@ -17,3 +23,17 @@ class WebApplicationContext(AnnotationConfigBeanContext):
         if not self.contains_bean_definition(BLUEPRINT_POST_PROCESSOR):
             bean_definition = BeanDefinition(BlueprintPostProcessor)
             self.register_bean_definition(BLUEPRINT_POST_PROCESSOR, bean_definition)
+
+    def _create_event_multicaster(self) -> WebAsyncEventMulticaster:
+        return WebAsyncEventMulticaster(self)
+
+    def _requires_eager_init(self, bean_name: str, bean_definition: BeanDefinition) -> bool:
+        if super()._requires_eager_init(bean_name, bean_definition):
+            return True
+        bean_type = self._resolve_bean_type(bean_name, bean_definition)
+        # blueprints and scheduled tasks are registered on startup
+        if AnnotationUtils.get_annotation(bean_type, Blueprint) is not None:
+            return True
+        if AnnotationUtils.get_annotated_methods(bean_type, Scheduled):
+            return True
+        return False
@@ -0,0 +1,12 @@
+from flask import has_app_context
+
+from guniflask.context.event_multicaster import AsyncEventMulticaster
+from guniflask.utils.context import run_with_context
+
+
+class WebAsyncEventMulticaster(AsyncEventMulticaster):
+
+    def _post_process_listener_task(self, task):
+        if has_app_context():
+            task = run_with_context(task)
+        return super()._post_process_listener_task(task)
@@ -1,8 +1,13 @@
-import gzip
-from typing import List, Union
+import hashlib
+from typing import Dict, List, Optional, Union
 
+from flask import request
 from pydantic import BaseModel
 
+from guniflask.web.compression import COMPRESSORS, CompressionCache, Compressor, get_available_encodings, \
+    negotiate_encoding
+from guniflask.web.compression_policy import AdaptiveCompressionOption, AdaptiveCompressionPolicy, \
+    parse_request_start
 from guniflask.web.request_filter import RequestFilter
 
 
@@ -10,6 +15,11 @@ class GzipOption(BaseModel):
     compress_level: int = 6
     compress_types: Union[List[str], None] = None
     compress_min_length: int = 1024
+    compress_encodings: Union[List[str], None] = None
+    compress_levels: Union[Dict[str, int], None] = None
+    compress_cache_size: int = 0
+    etag: bool = False
+    adaptive: Union[AdaptiveCompressionOption, bool, None] = None
 
 
 DEFAULT_COMPRESS_TYPES = [
@@ -20,29 +30,156 @@ DEFAULT_COMPRESS_TYPES = [
     'text/xml',
 ]
 
+SYNC_FLUSH_TYPES = {
+    'text/event-stream',
+}
+
 
 class GzipFilter(RequestFilter):
+    """
+    Compress the responses in the encoding negotiated by the Accept-Encoding header,
+    which is one of zstd, br and gzip in the order of preference by default, if the libraries are available.
+
+    The streamed responses are compressed incrementally and the Server-Sent Events are flushed by each chunk.
+
+    The other responses can be cached by the hash of the body, the encoding and the level after being compressed,
+    and tagged with strong ETags so that the requests with matched If-None-Match are responded by 304 directly.
+
+    The levels of compression are fixed unless the adaptive policy is enabled,
+    which selects the encodings and the levels by the load of the worker, the size and the type of the body.
+    """
 
     def __init__(self, **kwargs):
         self.option = GzipOption(**kwargs)
         if not self.option.compress_types:
             self.option.compress_types = DEFAULT_COMPRESS_TYPES
+        available_encodings = get_available_encodings()
+        if self.option.compress_encodings:
+            self.encodings = [e for e in self.option.compress_encodings if e in available_encodings]
+        else:
+            self.encodings = available_encodings
+        levels = {'gzip': self.option.compress_level}
+        if self.option.compress_levels:
+            levels.update(self.option.compress_levels)
+        self.compressors: Dict[str, Compressor] = {e: COMPRESSORS[e](levels.get(e)) for e in self.encodings}
+        self._level_compressors: Dict[tuple, Compressor] = {}
+        self.cache: Optional[CompressionCache] = None
+        if self.option.compress_cache_size > 0:
+            self.cache = CompressionCache(self.option.compress_cache_size)
+        self.policy: Optional[AdaptiveCompressionPolicy] = None
+        adaptive = self.option.adaptive
+        if adaptive:
+            self.policy = AdaptiveCompressionPolicy(adaptive if isinstance(adaptive, AdaptiveCompressionOption)
+                                                    else None,
+                                                    levels=levels)
+
+    def get_cache_metrics(self) -> Optional[dict]:
+        if self.cache is not None:
+            return self.cache.get_metrics()
+
+    def get_policy_metrics(self) -> Optional[dict]:
+        if self.policy is not None:
+            return self.policy.get_metrics()
+
+    def before_request(self):
+        if self.policy is not None and self.policy.load_monitor.queue_time_limit:
+            request_start = request.headers.get('X-Request-Start')
+            if request_start:
+                queue_time = parse_request_start(request_start)
+                if queue_time is not None:
+                    self.policy.load_monitor.record_queue_time(queue_time)
 
     def after_request(self, response):
         return self._gzip_compress(response)
 
     def _gzip_compress(self, response):
-        if response.mimetype not in self.option.compress_types \
-                or response.content_length < self.option.compress_min_length \
-                or "Content-Encoding" in response.headers:
+        if not self._is_compressible(response):
             return response
+        response.vary.add('Accept-Encoding')
 
-        response.set_data(
-            gzip.compress(
-                response.get_data(),
-                compresslevel=self.option.compress_level,
+        encoding = self._negotiate_encoding()
+        if response.is_streamed:
+            compressor = self._select_compressor(encoding, response)
+            if compressor is None:
+                return response
+            self._record_level(encoding, compressor)
+            chunks = response.response
+            response.response = compressor.compress_stream(
+                response.iter_encoded(),
+                sync_flush=response.mimetype in SYNC_FLUSH_TYPES,
             )
-        )
-        response.headers['Content-Encoding'] = 'gzip'
+            if hasattr(chunks, 'close'):
+                response.call_on_close(chunks.close)
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = encoding
+            return response
+
+        data = response.get_data()
+        digest = None
+        if self.cache is not None or self.option.etag:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        tagged = self.option.etag and 'ETag' not in response.headers
+        if tagged:
+            response.set_etag(digest if encoding is None else f'{digest}-{encoding}')
+            if request.if_none_match:
+                response.make_conditional(request)
+                if response.status_code == 304:
+                    return response
+        # the level is selected after the conditional request is handled
+        compressor = self._select_compressor(encoding, response)
+        if compressor is None:
+            if tagged and encoding is not None:
+                response.set_etag(digest)
+            return response
+
+        compressed = None
+        key = (digest, encoding, compressor.level)
+        if self.cache is not None:
+            compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compressor.compress(data)
+            self._record_level(encoding, compressor)
+            if self.cache is not None:
+                self.cache.put(key, compressed)
+        response.set_data(compressed)
         response.headers['Content-Length'] = response.content_length
+        response.headers['Content-Encoding'] = encoding
         return response
+
+    def _negotiate_encoding(self) -> Optional[str]:
+        encodings = self.encodings
+        if self.policy is not None:
+            encodings = self.policy.get_encodings(encodings)
+        return negotiate_encoding(request.headers.get('Accept-Encoding'), encodings)
+
+    def _select_compressor(self, encoding: Optional[str], response) -> Optional[Compressor]:
+        if encoding is None:
+            return
+        if self.policy is None:
+            return self.compressors[encoding]
+        size = None if response.is_streamed else response.content_length
+        level = self.policy.select_level(encoding, size, response.mimetype)
+        if level is None:
+            self.policy.record_level(encoding, None)
+            return
+        key = (encoding, level)
+        compressor = self._level_compressors.get(key)
+        if compressor is None:
+            compressor = COMPRESSORS[encoding](level)
+            self._level_compressors[key] = compressor
+        return compressor
+
+    def _record_level(self, encoding: str, compressor: Compressor):
+        if self.policy is not None:
+            self.policy.record_level(encoding, compressor.level)
+
+    def _is_compressible(self, response) -> bool:
+        if response.mimetype not in self.option.compress_types \
+                or "Content-Encoding" in response.headers \
+                or response.direct_passthrough \
+                or response.status_code in (204, 206, 304) \
+                or response.status_code < 200:
+            return False
+        if response.is_streamed:
+            return True
+        return response.content_length >= self.option.compress_min_length
@@ -0,0 +1,190 @@
+import dataclasses
+import datetime as dt
+import decimal
+import json
+import uuid
+from enum import Enum
+from typing import Any, Dict, Type, Union
+
+from flask.json.provider import JSONProvider
+from pydantic import BaseModel
+
+
+class JsonCodec:
+    """
+    Encode objects to JSON and decode JSON to objects.
+
+    Besides the types supported by JSON, the codecs support datetime, date, time, Enum, set, Decimal, UUID,
+    dataclasses and pydantic models including ``DataModel``.
+    The pydantic models are serialized by their own serializers without building intermediate dicts.
+    """
+
+    name = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError  # pragma: no cover
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        raise NotImplementedError  # pragma: no cover
+
+
+def json_default(o: Any) -> Any:
+    """
+    Convert an object not supported by JSON to a supported one.
+    """
+    if isinstance(o, BaseModel):
+        return o.model_dump(mode='json')
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, (dt.date, dt.time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _dump_model(o: BaseModel) -> bytes:
+    return o.__pydantic_serializer__.to_json(o)
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = 'stdlib'
+
+    def dumps(self, obj: Any) -> bytes:
+        if isinstance(obj, BaseModel):
+            return _dump_model(obj)
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return json.loads(s)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS
+        self._fragment = getattr(orjson, 'Fragment', None)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import orjson
+        except ImportError:
+            return False
+        return True
+
+    def dumps(self, obj: Any) -> bytes:
+        if isinstance(obj, BaseModel):
+            return _dump_model(obj)
+        return self._dumps(obj, default=self._default, option=self._option)
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return self._loads(s)
+
+    def _default(self, o: Any) -> Any:
+        if self._fragment is not None and isinstance(o, BaseModel):
+            return self._fragment(_dump_model(o))
+        return json_default(o)
+
+
+class MsgspecCodec(JsonCodec):
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+
+        self._raw = msgspec.Raw
+        self._encoder = msgspec.json.Encoder(enc_hook=self._enc_hook)
+        self._decoder = msgspec.json.Decoder()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import msgspec
+        except ImportError:
+            return False
+        return True
+
+    def dumps(self, obj: Any) -> bytes:
+        if isinstance(obj, BaseModel):
+            return _dump_model(obj)
+        return self._encoder.encode(obj)
+
+    def loads(self, s: Union[str, bytes]) -> Any:
+        return self._decoder.decode(s)
+
+    def _enc_hook(self, o: Any) -> Any:
+        if isinstance(o, BaseModel):
+            return self._raw(_dump_model(o))
+        return json_default(o)
+
+
+_json_codecs: Dict[str, Type[JsonCodec]] = {}
+
+
+def register_json_codec(codec_type: Type[JsonCodec]):
+    """
+    Register a type of JSON codecs by its name, the codecs registered later are preferred when auto-detecting.
+    """
+    _json_codecs[codec_type.name] = codec_type
+
+
+register_json_codec(StdlibJsonCodec)
+register_json_codec(MsgspecCodec)
+register_json_codec(OrjsonCodec)
+
+
+def create_json_codec(name: str = None) -> JsonCodec:
+    """
+    Create the JSON codec of the given name, or the preferred available one if the name is not given or is 'auto'.
+    """
+    if name is None or name == 'auto':
+        for codec_type in reversed(list(_json_codecs.values())):
+            if codec_type.is_available():
+                return codec_type()
+        return StdlibJsonCodec()
+    if name not in _json_codecs:
+        raise ValueError(f'Unsupported JSON codec: {name}')
+    return _json_codecs[name]()
+
+
+class JsonCodecProvider(JSONProvider):
+    """
+    The JSON provider of Flask backed by a JSON codec.
+    """
+
+    mimetype = 'application/json'
+
+    def __init__(self, app, codec: JsonCodec = None):
+        super().__init__(app)
+        if codec is None:
+            codec = create_json_codec()
+        self.codec = codec
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault('default', json_default)
+            return json.dumps(obj, **kwargs)
+        return self.codec.dumps(obj).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return self.codec.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.codec.dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,45 @@
+from flask import Flask, g, has_request_context
+
+from guniflask.beans.definition import BeanDefinition
+from guniflask.beans.errors import ScopeNotActiveError
+from guniflask.beans.scope import Scope, ScopedObjects
+
+REQUEST_SCOPED_OBJECTS = '_guniflask_request_scoped_objects'
+
+
+class RequestScope(Scope):
+    """
+    Scope holding an instance of the bean per request, which is stored on ``flask.g``
+    and destroyed when the request is torn down.
+    """
+
+    def __init__(self, app: Flask = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        app.teardown_request(self._destroy_scoped_objects)
+        app.teardown_appcontext(self._destroy_scoped_objects)
+
+    def get(self, bean_name: str, object_factory):
+        return self._get_scoped_objects(bean_name).get(bean_name, object_factory)
+
+    def remove(self, bean_name: str):
+        return self._get_scoped_objects(bean_name).remove(bean_name)
+
+    def register_destruction_callback(self, bean_name: str, callback):
+        self._get_scoped_objects(bean_name).register_destruction_callback(bean_name, callback)
+
+    def _get_scoped_objects(self, bean_name: str) -> ScopedObjects:
+        if not has_request_context():
+            raise ScopeNotActiveError(bean_name, BeanDefinition.SCOPE_REQUEST)
+        scoped_objects = g.get(REQUEST_SCOPED_OBJECTS)
+        if scoped_objects is None:
+            scoped_objects = ScopedObjects()
+            setattr(g, REQUEST_SCOPED_OBJECTS, scoped_objects)
+        return scoped_objects
+
+    def _destroy_scoped_objects(self, exc=None):
+        scoped_objects = g.pop(REQUEST_SCOPED_OBJECTS, None)
+        if scoped_objects is not None:
+            scoped_objects.destroy()
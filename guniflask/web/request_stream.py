@@ -0,0 +1,96 @@
+import collections.abc
+import inspect
+import json
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, BinaryIO, Callable, Iterator, Optional, Tuple
+
+from pydantic import BaseModel
+from pydantic.v1.typing import get_args, get_origin
+
+from guniflask.data_model.typing import parse_json
+from guniflask.web.errors import RequestValidationError
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class StreamKind:
+    CHUNKS = 'chunks'
+    STREAM = 'stream'
+    SPOOLED = 'spooled'
+    NDJSON = 'ndjson'
+
+
+def resolve_stream_type(dtype: Any) -> Optional[Tuple[str, Any]]:
+    """
+    Resolve the kind of streaming parameters by the declared type:
+
+    - ``Iterator[bytes]`` or ``Iterable[bytes]``: an iterator of chunks
+    - ``BinaryIO`` or ``IO[bytes]``: a file-like stream
+    - ``SpooledTemporaryFile``: a temporary file spooled to disk when exceeding the memory threshold
+    - ``Iterator[T]``: an iterator of items of type ``T`` parsed from NDJSON lazily
+
+    Return the kind along with the type of items for NDJSON, or None if the type is not a streaming type.
+    """
+    if dtype is BinaryIO:
+        return StreamKind.STREAM, None
+    if dtype is SpooledTemporaryFile:
+        return StreamKind.SPOOLED, None
+    origin = get_origin(dtype)
+    if origin is IO:
+        return StreamKind.STREAM, None
+    if origin in (collections.abc.Iterator, collections.abc.Iterable):
+        args = get_args(dtype)
+        item_type = args[0] if args else bytes
+        if item_type is bytes:
+            return StreamKind.CHUNKS, None
+        return StreamKind.NDJSON, item_type
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def spool_stream(stream: BinaryIO, max_size: int = DEFAULT_SPOOL_MAX_SIZE,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> SpooledTemporaryFile:
+    """
+    Copy the stream to a temporary file which is kept in memory until exceeding ``max_size`` bytes.
+    """
+    f = SpooledTemporaryFile(max_size=max_size)
+    for chunk in iter_chunks(stream, chunk_size):
+        f.write(chunk)
+    f.seek(0)
+    return f
+
+
+def iter_ndjson(stream: BinaryIO, item_type: Any = None, loads: Callable[[bytes], Any] = None) -> Iterator[Any]:
+    """
+    Parse the items of NDJSON lazily, in which blank lines are skipped.
+    The pydantic models are validated from the lines of JSON directly.
+    """
+    if loads is None:
+        loads = json.loads
+    validate_json = None
+    if inspect.isclass(item_type) and issubclass(item_type, BaseModel):
+        validate_json = item_type.model_validate_json
+    line_no = 0
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            if validate_json is not None:
+                item = validate_json(line)
+            else:
+                item = parse_json(loads(line), dtype=item_type)
+        except (ValueError, TypeError, AssertionError) as e:
+            raise RequestValidationError(f'Invalid NDJSON item at line {line_no}: {e}')
+        yield item
@@ -0,0 +1,197 @@
+import inspect
+from itertools import chain
+from typing import Any, Iterable, Iterator, Optional
+
+from flask import current_app, request, stream_with_context
+from pydantic import BaseModel
+
+JSON_ARRAY = 'json'
+NDJSON = 'ndjson'
+SSE = 'sse'
+
+MIMETYPES = {
+    JSON_ARRAY: 'application/json',
+    NDJSON: 'application/x-ndjson',
+    SSE: 'text/event-stream',
+}
+
+DEFAULT_BUFFER_SIZE = 8 * 1024
+
+
+class ServerSentEvent:
+    """
+    An event of Server-Sent Events, the data which is not a string is serialized as JSON.
+    """
+
+    __slots__ = ('data', 'event', 'id', 'retry')
+
+    def __init__(self, data: Any = None, event: str = None, id: str = None, retry: int = None):
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+
+def stream_json_array(items: Iterable, buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Stream the items as a JSON array.
+    """
+    return _make_stream_response(_iter_json_array(items, _get_dumps()), JSON_ARRAY, buffer_size)
+
+
+def stream_ndjson(items: Iterable, buffer_size: int = DEFAULT_BUFFER_SIZE):
+    """
+    Stream the items as NDJSON, one item per line.
+    """
+    return _make_stream_response(_iter_ndjson(items, _get_dumps()), NDJSON, buffer_size)
+
+
+def stream_sse(items: Iterable, event: str = None):
+    """
+    Stream the items as Server-Sent Events, each of which is flushed immediately.
+    The items can be ``ServerSentEvent`` to set the event type, id or retry of each event.
+    """
+    resp = _make_stream_response(_iter_sse(items, _get_dumps(), event), SSE, 0)
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
+
+
+def stream_batches(batches: Iterable[list], stream_format: str = None):
+    """
+    Stream the batches of items as a JSON array or NDJSON, each batch of which is serialized at once.
+    The format is negotiated by the Accept header if not given, and the items are streamed one by one
+    as Server-Sent Events if they are accepted.
+    """
+    if stream_format is None:
+        stream_format = negotiate_stream_format()
+    if stream_format == SSE:
+        return stream_sse(chain.from_iterable(batches))
+    json_dumps = current_app.json.dumps
+    if stream_format == NDJSON:
+        chunks = _iter_ndjson_batches(batches, json_dumps)
+    else:
+        chunks = _iter_json_array_batches(batches, json_dumps)
+    return _make_stream_response(chunks, stream_format, 0)
+
+
+def is_streamable(rv: Any) -> bool:
+    return inspect.isgenerator(rv) or (isinstance(rv, Iterator) and not isinstance(rv, (str, bytes)))
+
+
+def make_stream_response(rv: Iterator):
+    """
+    Stream the items of an iterator returned by a view function in the format negotiated by the Accept header,
+    which is NDJSON, Server-Sent Events or a JSON array by default.
+
+    The iterators of strings or bytes are kept as the raw response body.
+    """
+    try:
+        first = next(rv)
+    except StopIteration:
+        first = rv = None
+    if rv is None:
+        items = iter(())
+    else:
+        items = chain((first,), rv)
+        if isinstance(first, (str, bytes)):
+            return current_app.response_class(stream_with_context(items))
+    stream_format = negotiate_stream_format()
+    if stream_format == SSE:
+        return stream_sse(items)
+    if stream_format == NDJSON:
+        return stream_ndjson(items)
+    return stream_json_array(items)
+
+
+def negotiate_stream_format() -> str:
+    accept = request.accept_mimetypes
+    best = accept.best_match([MIMETYPES[JSON_ARRAY], MIMETYPES[NDJSON], MIMETYPES[SSE]])
+    for k, v in MIMETYPES.items():
+        if v == best:
+            return k
+    return JSON_ARRAY
+
+
+def _get_dumps():
+    json_dumps = current_app.json.dumps
+
+    def dumps(item: Any) -> str:
+        if isinstance(item, BaseModel):
+            return item.model_dump_json()
+        return json_dumps(item)
+
+    return dumps
+
+
+def _make_stream_response(chunks: Iterator[str], stream_format: str, buffer_size: Optional[int]):
+    if buffer_size:
+        chunks = _buffer_chunks(chunks, buffer_size)
+    return current_app.response_class(stream_with_context(chunks), mimetype=MIMETYPES[stream_format])
+
+
+def _buffer_chunks(chunks: Iterator[str], buffer_size: int) -> Iterator[str]:
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _iter_json_array(items: Iterable, dumps) -> Iterator[str]:
+    yield '['
+    sep = ''
+    for item in items:
+        yield sep
+        yield dumps(item)
+        sep = ','
+    yield ']'
+
+
+def _iter_ndjson(items: Iterable, dumps) -> Iterator[str]:
+    for item in items:
+        yield dumps(item)
+        yield '\n'
+
+
+def _iter_json_array_batches(batches: Iterable[list], dumps) -> Iterator[str]:
+    yield '['
+    sep = ''
+    for batch in batches:
+        if batch:
+            yield sep + dumps(batch)[1:-1]
+            sep = ','
+    yield ']'
+
+
+def _iter_ndjson_batches(batches: Iterable[list], dumps) -> Iterator[str]:
+    for batch in batches:
+        if batch:
+            yield '\n'.join([dumps(item) for item in batch]) + '\n'
+
+
+def _iter_sse(items: Iterable, dumps, event: Optional[str]) -> Iterator[str]:
+    for item in items:
+        if isinstance(item, ServerSentEvent):
+            e = item
+        else:
+            e = ServerSentEvent(item, event=event)
+        lines = []
+        if e.event is not None:
+            lines.append(f'event: {e.event}')
+        if e.id is not None:
+            lines.append(f'id: {e.id}')
+        if e.retry is not None:
+            lines.append(f'retry: {e.retry}')
+        if e.data is not None:
+            data = e.data if isinstance(e.data, str) else dumps(e.data)
+            for line in data.splitlines() or ['']:
+                lines.append(f'data: {line}')
+        lines.append('\n')
+        yield '\n'.join(lines)
@@ -30,9 +30,9 @@ class PyTest(TestCommand):
 
 tests_require = read_requirements('test.txt')
 install_requires = [
-    'Flask>=1.1.2',
+    'Flask>=2.2',
     'pydantic>=2.11.5,<3',
-    'SQLAlchemy>=1.3.22',
+    'SQLAlchemy>=2.0',
     'Flask-Cors>=3.0.10',
     'PyJWT>=2.0.0,<2.6.0',
     'APScheduler>=3.6.3',
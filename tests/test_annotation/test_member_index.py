@@ -0,0 +1,88 @@
+from guniflask.annotation import Annotation, AnnotationUtils
+
+
+class Marker(Annotation):
+    pass
+
+
+class Other(Annotation):
+    pass
+
+
+class SubMarker(Marker):
+    pass
+
+
+def marker(func):
+    AnnotationUtils.add_annotation(func, Marker())
+    return func
+
+
+class Base:
+    @marker
+    def inherited(self):
+        pass
+
+
+class Foo(Base):
+    @marker
+    def bar(self):
+        pass
+
+    def plain(self):
+        pass
+
+
+def test_get_annotated_methods():
+    methods = AnnotationUtils.get_annotated_methods(Foo, Marker)
+    assert [(m, func) for m, func, a in methods] == [('bar', Foo.bar), ('inherited', Base.inherited)]
+    assert all(isinstance(a, Marker) for m, func, a in methods)
+    assert AnnotationUtils.get_annotated_methods(Foo, Other) == []
+
+    index = AnnotationUtils.get_member_index(Foo)
+    assert index.annotated_functions == [('bar', Foo.bar), ('inherited', Base.inherited)]
+    assert AnnotationUtils.get_member_index(Foo) is index
+
+
+def test_get_annotated_methods_by_base_annotation():
+    class Bar:
+        @marker
+        def foo(self):
+            pass
+
+        def sub(self):
+            pass
+
+    AnnotationUtils.add_annotation(Bar.sub, SubMarker())
+    assert [m for m, func, a in AnnotationUtils.get_annotated_methods(Bar, Marker)] == ['foo', 'sub']
+    assert [m for m, func, a in AnnotationUtils.get_annotated_methods(Bar, SubMarker)] == ['sub']
+    assert [m for m, func, a in AnnotationUtils.get_annotated_methods(Bar, Annotation)] == ['foo', 'sub']
+
+
+def test_member_index_follows_new_annotations():
+    class Unrelated:
+        def plain(self):
+            pass
+
+    index = AnnotationUtils.get_member_index(Foo)
+    unrelated_index = AnnotationUtils.get_member_index(Unrelated)
+    AnnotationUtils.add_annotation(Foo.plain, Other())
+    assert AnnotationUtils.get_member_index(Foo) is not index
+    assert AnnotationUtils.get_member_index(Unrelated) is unrelated_index
+    assert [m for m, func, a in AnnotationUtils.get_annotated_methods(Foo, Other)] == ['plain']
+
+
+def test_member_index_of_subclass_follows_new_annotations():
+    class Parent:
+        def plain(self):
+            pass
+
+    class Child(Parent):
+        pass
+
+    parent_index = AnnotationUtils.get_member_index(Parent)
+    child_index = AnnotationUtils.get_member_index(Child)
+    AnnotationUtils.add_annotation(Parent.plain, Marker())
+    assert AnnotationUtils.get_member_index(Parent) is not parent_index
+    assert AnnotationUtils.get_member_index(Child) is not child_index
+    assert [m for m, func, a in AnnotationUtils.get_annotated_methods(Child, Marker)] == ['plain']
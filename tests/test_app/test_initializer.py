@@ -0,0 +1,73 @@
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from guniflask.app.initializer import AppInitializer
+from guniflask.config.app_settings import Settings
+from guniflask.web.event_multicaster import WebAsyncEventMulticaster
+from guniflask.web.json_codec import JsonCodecProvider, StdlibJsonCodec
+
+
+def make_initializer(settings: dict) -> AppInitializer:
+    app_initializer = AppInitializer.__new__(AppInitializer)
+    app_initializer.name = 'test_app'
+    app_initializer.settings = Settings(settings)
+    app_initializer._scan_index = None
+    return app_initializer
+
+
+@pytest.mark.parametrize('parallel_init, expected', [
+    (None, (False, None)),
+    (True, (True, None)),
+    (False, (False, None)),
+    (4, (True, 4)),
+    (0, (False, 0)),
+    ('true', (True, None)),
+    ('false', (False, None)),
+    ('yes', (False, None)),
+    ('8', (True, 8)),
+    ('0', (False, 0)),
+])
+def test_parallel_init_setting(parallel_init, expected):
+    app_initializer = make_initializer({'guniflask': {'parallel_init': parallel_init}})
+    assert app_initializer._get_parallel_init() == expected
+
+
+def test_scan_index_without_home(tmpdir):
+    app_initializer = make_initializer({'home': None, 'guniflask': {'scan_index': True}})
+    assert app_initializer._get_scan_index_file() is None
+    assert app_initializer._load_scan_index() is None
+
+    app_initializer = make_initializer({'home': str(tmpdir), 'guniflask': {'scan_index': True}})
+    assert app_initializer._get_scan_index_file() == str(tmpdir.join('.scan_index.json'))
+
+    index_file = str(tmpdir.join('index.json'))
+    app_initializer = make_initializer({'home': None, 'guniflask': {'scan_index': index_file}})
+    assert app_initializer._get_scan_index_file() == index_file
+
+
+@pytest.mark.parametrize('json_codec', [None, False])
+def test_json_codec_disabled_by_default(json_codec):
+    app = Flask(__name__)
+    make_initializer({'guniflask': {'json_codec': json_codec}})._init_json_provider(app)
+    assert isinstance(app.json, DefaultJSONProvider)
+
+
+def test_json_codec_setting():
+    app = Flask(__name__)
+    make_initializer({'guniflask': {'json_codec': 'stdlib'}})._init_json_provider(app)
+    assert isinstance(app.json, JsonCodecProvider)
+    assert isinstance(app.json.codec, StdlibJsonCodec)
+
+
+@pytest.mark.parametrize('async_listener, max_workers', [
+    (True, 4),
+    ({'max_workers': 2}, 2),
+])
+def test_async_listener_setting(async_listener, max_workers):
+    app_initializer = make_initializer({'guniflask': {'async_listener': async_listener}})
+    app = Flask(__name__)
+    app_initializer._create_bean_context(app)
+    multicaster = app.bean_context._event_multicaster
+    assert isinstance(multicaster, WebAsyncEventMulticaster)
+    assert multicaster.max_workers == max_workers
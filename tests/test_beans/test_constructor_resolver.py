@@ -0,0 +1,77 @@
+from typing import List, Set
+
+import pytest
+
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+from guniflask.beans.constructor_resolver import ConstructorResolver, InjectionPoint
+from guniflask.beans.errors import NoUniqueBeanDefinitionError
+
+
+class Plugin:
+    pass
+
+
+class FooPlugin(Plugin):
+    pass
+
+
+class BarPlugin(Plugin):
+    pass
+
+
+class Service:
+    def __init__(self, foo_plugin: FooPlugin, plugins: List[Plugin], plugin_set: Set[Plugin],
+                 bar_plugin, timeout: dict = None, retries=3):
+        self.foo_plugin = foo_plugin
+        self.plugins = plugins
+        self.plugin_set = plugin_set
+        self.bar_plugin = bar_plugin
+        self.timeout = timeout
+        self.retries = retries
+
+    def set_plugin(self, plugin: Plugin):
+        self.plugin = plugin
+
+
+def make_bean_factory():
+    bean_factory = DefaultBeanFactory()
+    bean_factory.register_bean_definition('foo_plugin', BeanDefinition(FooPlugin))
+    bean_factory.register_bean_definition('bar_plugin', BeanDefinition(BarPlugin))
+    return bean_factory
+
+
+def test_compile_injection_plan():
+    plan = ConstructorResolver.get_injection_plan(Service)
+    assert [(p.name, p.mode, p.required) for p in plan.injection_points] == [
+        ('foo_plugin', InjectionPoint.BY_TYPE, True),
+        ('plugins', InjectionPoint.LIST, True),
+        ('plugin_set', InjectionPoint.SET, True),
+        ('bar_plugin', InjectionPoint.BY_NAME, True),
+        ('timeout', InjectionPoint.UNRESOLVABLE, False),
+        ('retries', InjectionPoint.BY_NAME, False),
+    ]
+    assert ConstructorResolver.get_injection_plan(Service) is plan
+
+
+def test_injection_plan_of_bound_method_is_cached_on_function():
+    service = object.__new__(Service)
+    plan = ConstructorResolver.get_injection_plan(service.set_plugin)
+    assert [p.name for p in plan.injection_points] == ['plugin']
+    assert ConstructorResolver.get_injection_plan(object.__new__(Service).set_plugin) is plan
+    assert [p.name for p in ConstructorResolver.get_injection_plan(Service.set_plugin).injection_points] == \
+           ['self', 'plugin']
+
+
+def test_instantiate():
+    bean_factory = make_bean_factory()
+    resolver = ConstructorResolver(bean_factory)
+    service = resolver.instantiate(Service)
+    assert service.foo_plugin is bean_factory.get_bean('foo_plugin')
+    assert service.bar_plugin is bean_factory.get_bean('bar_plugin')
+    assert service.plugins == [service.foo_plugin, service.bar_plugin]
+    assert service.plugin_set == {service.foo_plugin, service.bar_plugin}
+    assert service.timeout is None
+    assert service.retries == 3
+
+    with pytest.raises(NoUniqueBeanDefinitionError):
+        resolver.instantiate(service.set_plugin)
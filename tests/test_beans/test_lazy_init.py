@@ -0,0 +1,88 @@
+import threading
+import time
+
+from guniflask.beans import BeanProxy, SmartInitializingSingleton
+from guniflask.context import AnnotationConfigBeanContext, component, lazy
+
+created = []
+
+
+@lazy
+@component
+class HeavyClient:
+    def __init__(self):
+        time.sleep(0.05)
+        created.append(self)
+
+    def ping(self):
+        return 'pong'
+
+
+@component
+class ClientService:
+    def __init__(self, heavy_client: HeavyClient):
+        self.heavy_client = heavy_client
+
+
+@component
+class Warmer(SmartInitializingSingleton):
+    def __init__(self):
+        self.warmed = False
+
+    def after_singletons_instantiated(self):
+        self.warmed = True
+
+
+@lazy(False)
+@component
+class EagerComponent:
+    pass
+
+
+@component
+class DefaultComponent:
+    pass
+
+
+def test_lazy_init():
+    created.clear()
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.register(HeavyClient, ClientService)
+    bean_context.refresh()
+    assert created == []
+    assert bean_context.startup_report.deferred_beans == ['heavy_client']
+    assert 'client_service' in bean_context.startup_report.bean_creation_times
+
+    service = bean_context.get_bean('client_service')
+    assert isinstance(service.heavy_client, BeanProxy)
+    assert service.heavy_client.ping() == 'pong'
+    assert created == [bean_context.get_bean('heavy_client')]
+
+
+def test_default_lazy_init():
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.set_default_lazy_init(True)
+    bean_context.register(Warmer, EagerComponent, DefaultComponent)
+    bean_context.refresh()
+    assert bean_context.contains_singleton('warmer')
+    assert bean_context.get_bean('warmer').warmed is True
+    assert bean_context.contains_singleton('eager_component')
+    assert not bean_context.contains_singleton('default_component')
+    assert bean_context.startup_report.deferred_beans == ['default_component']
+
+
+def test_lazy_init_creates_once_across_threads():
+    created.clear()
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.register(HeavyClient)
+    bean_context.refresh()
+
+    beans = []
+    threads = [threading.Thread(target=lambda: beans.append(bean_context.get_bean('heavy_client')))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
+    assert all(b is created[0] for b in beans)
@@ -0,0 +1,175 @@
+import threading
+import time
+
+import pytest
+
+from guniflask.app.initializer import AppInitializer
+from guniflask.beans.dependency_graph import BeanDependencyGraph
+from guniflask.beans.errors import BeanDependencyCycleError
+from guniflask.config.app_settings import Settings
+from guniflask.context import AnnotationConfigBeanContext, autowired, bean, component, configuration
+
+created = []
+lock = threading.Lock()
+
+
+def record(name):
+    time.sleep(0.1)
+    with lock:
+        created.append(name)
+
+
+@component
+class Database:
+    def __init__(self):
+        record('database')
+
+
+@component
+class Cache:
+    def __init__(self):
+        record('cache')
+
+
+@component
+class Mailer:
+    def __init__(self):
+        record('mailer')
+
+
+@component
+class UserService:
+    def __init__(self, database: Database, cache: Cache):
+        self.database = database
+        self.cache = cache
+        record('user_service')
+
+
+class Report:
+    def __init__(self, user_service):
+        self.user_service = user_service
+
+
+@configuration
+class ReportConfiguration:
+    @bean
+    def report(self, user_service: UserService) -> Report:
+        record('report')
+        return Report(user_service)
+
+
+@component
+class Notifier:
+    @autowired
+    def set_mailer(self, mailer: Mailer):
+        self.mailer = mailer
+
+
+def make_bean_context(*components, max_workers=None):
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.set_parallel_instantiation(True, max_workers=max_workers)
+    bean_context.register(*components)
+    return bean_context
+
+
+def test_dependency_graph():
+    bean_context = make_bean_context(Database, Cache, Mailer, UserService, ReportConfiguration, Notifier)
+    bean_context._invoke_bean_factory_post_processors()
+    bean_context._register_bean_post_processors()
+    graph = bean_context.get_bean_dependency_graph()
+    assert graph.get_dependencies('user_service') == {'database', 'cache'}
+    assert graph.get_dependencies('report') == {'user_service', 'report_configuration'}
+    assert graph.get_dependencies('notifier') == {'mailer'}
+    assert graph.find_cycles() == []
+
+
+def test_parallel_init():
+    created.clear()
+    bean_context = make_bean_context(Database, Cache, Mailer, UserService, ReportConfiguration)
+    start = time.perf_counter()
+    bean_context.refresh()
+    elapsed = time.perf_counter() - start
+    assert sorted(created) == ['cache', 'database', 'mailer', 'report', 'user_service']
+    assert created.index('user_service') > max(created.index('database'), created.index('cache'))
+    assert created.index('report') > created.index('user_service')
+    assert elapsed < 0.45
+    user_service = bean_context.get_bean('user_service')
+    assert user_service.database is bean_context.get_bean('database')
+    assert bean_context.get_bean('report').user_service is user_service
+    bean_context.close()
+
+
+def test_parallel_init_with_single_worker():
+    created.clear()
+    bean_context = make_bean_context(Database, Cache, UserService, max_workers=1)
+    bean_context.refresh()
+    assert created[-1] == 'user_service'
+    bean_context.close()
+
+
+class Chicken:
+    def __init__(self, egg):
+        self.egg = egg
+
+
+class Egg:
+    def __init__(self, chicken):
+        self.chicken = chicken
+
+
+def test_dependency_cycle():
+    bean_context = make_bean_context()
+    bean_context.register(component('chicken')(Chicken), component('egg')(Egg))
+    with pytest.raises(BeanDependencyCycleError) as exc_info:
+        bean_context.refresh()
+    assert exc_info.value.cycles == [['chicken', 'egg', 'chicken']]
+    assert 'chicken -> egg -> chicken' in str(exc_info.value)
+
+
+def test_find_cycles():
+    graph = BeanDependencyGraph()
+    graph.add_bean('a', ['b'])
+    graph.add_bean('b', ['c', 'x'])
+    graph.add_bean('c', ['a'])
+    graph.add_bean('d', ['d'])
+    graph.add_bean('e', ['a'])
+    assert graph.find_cycles() == [['a', 'b', 'c', 'a'], ['d', 'd']]
+
+
+APP_SERVICES = '''
+from flask import current_app
+
+from guniflask.config import settings
+from guniflask.context import component
+
+
+@component
+class SettingsReader:
+    def __init__(self):
+        self.app_name = settings['app_name']
+
+
+@component
+class ConfigReader:
+    def __init__(self):
+        self.testing = current_app.config['TESTING']
+'''
+
+
+def test_parallel_init_in_app_context(tmp_path, monkeypatch):
+    package = tmp_path / 'parallel_init_app'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'app.py').write_text('')
+    (package / 'services.py').write_text(APP_SERVICES)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    app_initializer = AppInitializer.__new__(AppInitializer)
+    app_initializer.name = 'parallel_init_app'
+    app_initializer.settings = Settings({'app_name': 'parallel_init_app', 'TESTING': True,
+                                         'guniflask': {'parallel_init': 4}})
+    app_initializer._scan_index = None
+    app = app_initializer.init()
+    assert app.bean_context.get_bean('settings_reader').app_name == 'parallel_init_app'
+    assert app.bean_context.get_bean('config_reader').testing is True
+    app.bean_context.close()
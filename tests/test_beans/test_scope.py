@@ -0,0 +1,175 @@
+import asyncio
+import threading
+
+import pytest
+
+from guniflask.beans import BeanDefinition, BeanProxy, DefaultBeanFactory, DisposableBean
+from guniflask.beans.errors import BeanCreationError, BeansError
+
+
+class Counter(DisposableBean):
+    def __init__(self):
+        self.count = 0
+        self.destroyed = False
+
+    def incr(self):
+        self.count += 1
+        return self.count
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class CounterService:
+    def __init__(self, counter: Counter):
+        self.counter = counter
+
+
+class Node:
+    def __init__(self, node: 'Node' = None):
+        self.node = node
+
+
+def make_bean_factory(scope: str):
+    bean_factory = DefaultBeanFactory()
+    bean_definition = BeanDefinition(Counter)
+    bean_definition.scope = scope
+    bean_factory.register_bean_definition('counter', bean_definition)
+    bean_factory.register_bean_definition('counter_service', BeanDefinition(CounterService))
+    return bean_factory
+
+
+def test_prototype_scope():
+    bean_factory = make_bean_factory(BeanDefinition.SCOPE_PROTOTYPE)
+    counter = bean_factory.get_bean('counter')
+    assert isinstance(counter, Counter)
+    assert bean_factory.get_bean('counter') is not counter
+    service = bean_factory.get_bean('counter_service')
+    assert isinstance(service.counter, Counter) and service.counter is not counter
+
+
+def test_prototype_circular_reference():
+    bean_factory = DefaultBeanFactory()
+    bean_definition = BeanDefinition(Node)
+    bean_definition.scope = BeanDefinition.SCOPE_PROTOTYPE
+    bean_factory.register_bean_definition('node', bean_definition)
+    with pytest.raises(BeanCreationError):
+        bean_factory.get_bean('node')
+
+
+def test_thread_scope():
+    bean_factory = make_bean_factory(BeanDefinition.SCOPE_THREAD)
+    service = bean_factory.get_bean('counter_service')
+    assert isinstance(service.counter, BeanProxy)
+    assert service.counter.incr() == 1
+    assert service.counter.incr() == 2
+    assert bean_factory.get_bean('counter') is bean_factory.get_bean('counter')
+
+    counts = []
+
+    def incr():
+        counts.append(service.counter.incr())
+
+    t = threading.Thread(target=incr)
+    t.start()
+    t.join()
+    assert counts == [1]
+    assert service.counter.count == 2
+
+    counter = bean_factory.get_bean('counter')
+    bean_factory.get_registered_scope(BeanDefinition.SCOPE_THREAD).destroy()
+    assert counter.destroyed is True
+    assert service.counter.count == 0
+
+
+def test_unknown_scope():
+    bean_factory = make_bean_factory('session')
+    with pytest.raises(BeansError):
+        bean_factory.get_bean('counter')
+
+
+class UnitOfWork:
+    def __init__(self, name: str):
+        self.name = name
+        self.entered = 0
+        self.exited = 0
+
+    def __enter__(self):
+        self.entered += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.exited += 1
+        return exc_type is KeyError
+
+    def __eq__(self, other):
+        return isinstance(other, UnitOfWork) and other.name == self.name
+
+    def __lt__(self, other):
+        return self.name < other.name
+
+    def __le__(self, other):
+        return self.name <= other.name
+
+    def __gt__(self, other):
+        return self.name > other.name
+
+    def __ge__(self, other):
+        return self.name >= other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __str__(self):
+        return f'uow {self.name}'
+
+    def __repr__(self):
+        return f'UnitOfWork({self.name!r})'
+
+
+def test_bean_proxy_forwards_special_methods():
+    uow = UnitOfWork('a')
+    proxy = BeanProxy(lambda: uow, 'uow')
+
+    with proxy as entered:
+        assert entered is uow
+    with proxy:
+        raise KeyError('suppressed by the target')
+    assert uow.entered == 2 and uow.exited == 2
+
+    assert proxy == UnitOfWork('a') and proxy != UnitOfWork('b')
+    assert proxy < UnitOfWork('b') and proxy <= UnitOfWork('a')
+    assert proxy > UnitOfWork('0') and proxy >= UnitOfWork('a')
+    assert hash(proxy) == hash(uow)
+    assert proxy in {uow} and {proxy: 1}[uow] == 1
+    assert str(proxy) == 'uow a' and repr(proxy) == "UnitOfWork('a')"
+    assert f'{proxy}' == 'uow a'
+
+    items = BeanProxy(lambda: [1, 2, 3], 'items')
+    assert list(reversed(items)) == [3, 2, 1]
+    it = iter([1, 2])
+    assert next(BeanProxy(lambda: it, 'it')) == 1
+
+
+def test_bean_proxy_forwards_async_context_manager():
+    class AsyncUnitOfWork:
+        async def __aenter__(self):
+            return 'entered'
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            return False
+
+    proxy = BeanProxy(lambda: AsyncUnitOfWork(), 'uow')
+
+    async def run():
+        async with proxy as v:
+            return v
+
+    assert asyncio.run(run()) == 'entered'
+
+
+def test_bean_proxy_repr_without_active_scope():
+    def raise_error():
+        raise BeansError('scope not active')
+
+    assert repr(BeanProxy(raise_error, 'uow')) == '<BeanProxy of bean "uow">'
@@ -0,0 +1,112 @@
+import random
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+from guniflask.beans.errors import BeanCreationDeadlockError, BeanCreationError
+
+
+class Rendezvous:
+    def __init__(self, parties: int):
+        self._parties = parties
+        self._arrived = 0
+        self._cond = threading.Condition()
+
+    def wait(self):
+        with self._cond:
+            self._arrived += 1
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._arrived >= self._parties, timeout=5)
+
+
+def make_bean_definition(factory):
+    factory.__annotations__ = {'return': dict}
+    return BeanDefinition(factory)
+
+
+def make_bean_graph(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    bean_factory = DefaultBeanFactory()
+    instantiations = Counter()
+
+    for i in range(n):
+        deps = [f'bean{j}' for j in rnd.sample(range(i), min(i, 3))]
+
+        def create(name=f'bean{i}', deps=deps) -> dict:
+            time.sleep(0.001)
+            instantiations[name] += 1
+            return {'name': name, 'deps': [bean_factory.get_bean(d) for d in deps]}
+
+        bean_factory.register_bean_definition(f'bean{i}', make_bean_definition(create))
+    return bean_factory, instantiations
+
+
+def test_concurrent_singleton_creation():
+    n = 60
+    bean_factory, instantiations = make_bean_graph(n)
+    results = []
+    errors = []
+
+    def resolve(seed):
+        rnd = random.Random(seed)
+        try:
+            names = [f'bean{i}' for i in rnd.sample(range(n), 20)]
+            results.append({name: bean_factory.get_bean(name) for name in names})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=resolve, args=(i,)) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert all(c == 1 for c in instantiations.values())
+    for beans in results:
+        for name, b in beans.items():
+            assert b is bean_factory.get_bean(name)
+            assert b['name'] == name
+
+
+def test_circular_reference_in_same_thread():
+    bean_factory = DefaultBeanFactory()
+    bean_factory.register_bean_definition('a', make_bean_definition(lambda: bean_factory.get_bean('b')))
+    bean_factory.register_bean_definition('b', make_bean_definition(lambda: bean_factory.get_bean('a')))
+    with pytest.raises(BeanCreationError, match='currently in creation'):
+        bean_factory.get_bean('a')
+
+
+def test_deadlock_detection():
+    bean_factory = DefaultBeanFactory()
+    rendezvous = Rendezvous(2)
+
+    def create(dep):
+        rendezvous.wait()
+        return {'dep': bean_factory.get_bean(dep)}
+
+    bean_factory.register_bean_definition('a', make_bean_definition(lambda: create('b')))
+    bean_factory.register_bean_definition('b', make_bean_definition(lambda: create('a')))
+    errors = []
+
+    def resolve(name):
+        try:
+            bean_factory.get_bean(name)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=resolve, args=(name,), name=f'thread-{name}') for name in ('a', 'b')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    assert not any(t.is_alive() for t in threads)
+
+    deadlock_errors = [e for e in errors if isinstance(e, BeanCreationDeadlockError)]
+    assert len(deadlock_errors) == 1
+    cycle = deadlock_errors[0].cycle
+    assert sorted(cycle) == [('thread-a', 'b'), ('thread-b', 'a')]
+    assert 'thread "thread-a" waits for bean "b"' in str(deadlock_errors[0])
@@ -0,0 +1,86 @@
+import json
+import time
+
+from guniflask.beans import BeanPostProcessor
+from guniflask.beans.startup_profiler import StartupProfiler
+from guniflask.context import AnnotationConfigBeanContext, component
+
+
+@component
+class SlowRepository:
+    def __init__(self):
+        time.sleep(0.05)
+
+
+@component
+class SlowService:
+    def __init__(self, slow_repository: SlowRepository):
+        time.sleep(0.02)
+        self.slow_repository = slow_repository
+
+
+@component
+class NothingPostProcessor(BeanPostProcessor):
+    pass
+
+
+def refresh_with_profiler():
+    profiler = StartupProfiler()
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.set_startup_profiler(profiler)
+    bean_context.register(SlowService, SlowRepository, NothingPostProcessor)
+    bean_context.refresh()
+    bean_context.close()
+    return profiler
+
+
+def test_startup_steps():
+    profiler = refresh_with_profiler()
+    steps = profiler.steps
+    assert steps[0].name == 'refresh'
+    phases = [s.name for s in steps if s.category == 'phase']
+    assert 'invoke_bean_factory_post_processors' in phases
+    assert 'finish_bean_factory_initialization' in phases
+
+    bean_steps = {s.name: s for s in steps if s.category == 'bean'}
+    assert bean_steps['slow_repository'].parent is bean_steps['slow_service']
+    assert bean_steps['slow_service'].parent.name == 'finish_bean_factory_initialization'
+    hooks = [s for s in steps if s.category == 'post_processor' and s.tags.get('bean_name') == 'slow_service']
+    assert 'NothingPostProcessor.post_process_after_initialization' in [s.name for s in hooks]
+    assert all(s.parent is bean_steps['slow_service'] for s in hooks)
+
+
+def test_slowest_beans():
+    profiler = refresh_with_profiler()
+    slowest_beans = profiler.get_slowest_beans(2)
+    assert [b['bean_name'] for b in slowest_beans] == ['slow_repository', 'slow_service']
+    service = slowest_beans[1]
+    assert service['total_time'] >= 0.07
+    assert 0.02 <= service['self_time'] < 0.05
+    assert 'slow_repository' in profiler.summary(2)
+
+
+def test_export(tmpdir):
+    profiler = refresh_with_profiler()
+
+    trace_file = str(tmpdir.join('startup.json'))
+    profiler.export(trace_file)
+    with open(trace_file) as f:
+        trace = json.load(f)
+    events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert len(events) == len(profiler.steps)
+    assert {'slow_service', 'slow_repository'} <= {e['name'] for e in events if e['cat'] == 'bean'}
+
+    speedscope_file = str(tmpdir.join('startup.speedscope.json'))
+    profiler.export(speedscope_file)
+    with open(speedscope_file) as f:
+        speedscope = json.load(f)
+    events = speedscope['profiles'][0]['events']
+    assert len(events) == 2 * len(profiler.steps)
+    opened = []
+    for e in events:
+        if e['type'] == 'O':
+            opened.append(e['frame'])
+        else:
+            assert opened.pop() == e['frame']
+    assert opened == []
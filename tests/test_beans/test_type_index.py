@@ -0,0 +1,110 @@
+from abc import ABCMeta, abstractmethod
+
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+
+
+class Greeter(metaclass=ABCMeta):
+    @abstractmethod
+    def greet(self):
+        pass
+
+
+class Repository:
+    pass
+
+
+class UserRepository(Repository):
+    pass
+
+
+class OrderRepository(Repository):
+    pass
+
+
+class HelloGreeter(Greeter):
+    def greet(self):
+        return 'hello'
+
+
+class RepositoryConfiguration:
+    def order_repository(self) -> Repository:
+        return OrderRepository()
+
+
+def make_bean_factory():
+    bean_factory = DefaultBeanFactory()
+    bean_factory.register_bean_definition('user_repository', BeanDefinition(UserRepository))
+    bean_factory.register_bean_definition('hello_greeter', BeanDefinition(HelloGreeter))
+    bean_factory.register_bean_definition('repository_configuration', BeanDefinition(RepositoryConfiguration))
+    bean_definition = BeanDefinition(RepositoryConfiguration.order_repository)
+    bean_definition.factory_bean_name = 'repository_configuration'
+    bean_factory.register_bean_definition('order_repository', bean_definition)
+    return bean_factory
+
+
+def test_get_bean_names_for_type():
+    bean_factory = make_bean_factory()
+    assert bean_factory.get_bean_names_for_type(Repository) == ['user_repository', 'order_repository']
+    assert bean_factory.get_bean_names_for_type(UserRepository) == ['user_repository']
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == []
+    assert bean_factory.get_bean_names_for_type(Greeter) == ['hello_greeter']
+    assert bean_factory.get_bean_names_for_type(dict) == []
+
+    stats = bean_factory.get_bean_type_index_stats()
+    assert stats['rebuilds'] == 1
+    assert stats['misses'] == 5
+    assert stats['resolved_bean_types'] == 4
+
+    bean_factory.get_bean_names_for_type(Repository)
+    assert bean_factory.get_bean_type_index_stats()['hits'] == 1
+
+
+def test_type_index_follows_singletons():
+    bean_factory = make_bean_factory()
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == []
+    bean_factory.get_bean('order_repository')
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == ['order_repository']
+    bean_factory.destroy_singleton('order_repository')
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == []
+
+
+def test_type_index_invalidation():
+    bean_factory = make_bean_factory()
+    assert bean_factory.get_bean_names_for_type(Greeter) == ['hello_greeter']
+
+    bean_factory.remove_bean_definition('hello_greeter')
+    assert bean_factory.get_bean_names_for_type(Greeter) == []
+
+    bean_factory.register_bean_definition('greeter', BeanDefinition(HelloGreeter))
+    assert bean_factory.get_bean_names_for_type(Greeter) == ['greeter']
+
+    stats = bean_factory.get_bean_type_index_stats()
+    assert stats['rebuilds'] == 3
+    assert stats['invalidations'] == 2
+
+
+def test_type_index_updates_singleton_types_in_place():
+    bean_factory = make_bean_factory()
+    assert bean_factory.get_bean_names_for_type(Repository) == ['user_repository', 'order_repository']
+    assert bean_factory.get_bean_names_for_type(Greeter) == ['hello_greeter']
+
+    bean_definition = BeanDefinition(RepositoryConfiguration.order_repository)
+    bean_definition.factory_bean_name = 'repository_configuration'
+    bean_factory.register_bean_definition('audited_repository', bean_definition)
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == []
+
+    bean_factory.get_bean('order_repository')
+    bean_factory.get_bean('audited_repository')
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == ['order_repository', 'audited_repository']
+    assert bean_factory.get_bean_names_for_type(Repository) == ['user_repository', 'order_repository',
+                                                                'audited_repository']
+    assert bean_factory.get_bean_names_for_type(Greeter) == ['hello_greeter']
+    stats = bean_factory.get_bean_type_index_stats()
+    assert stats['rebuilds'] == 2
+    assert stats['updates'] == 2
+
+    bean_factory.destroy_singleton('order_repository')
+    assert bean_factory.get_bean_names_for_type(OrderRepository) == ['audited_repository']
+    assert bean_factory.get_bean_names_for_type(Repository) == ['user_repository', 'order_repository',
+                                                                'audited_repository']
+    assert bean_factory.get_bean_type_index_stats()['rebuilds'] == 2
@@ -0,0 +1,189 @@
+import threading
+import time
+
+import pytest
+
+from guniflask.beans import DefaultBeanFactory
+from guniflask.context import AnnotationConfigBeanContext, ApplicationEventPublisher, AsyncEventMulticaster, \
+    async_listener, component
+from guniflask.context.event import ApplicationEvent
+from guniflask.context.event_listener import ApplicationEventListener
+from guniflask.scheduling import AsyncExecutor
+
+
+class OrderEvent(ApplicationEvent):
+    pass
+
+
+class RecordingListener(ApplicationEventListener):
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.events = []
+        self.threads = set()
+
+    def on_application_event(self, application_event: OrderEvent):
+        time.sleep(self.delay)
+        self.events.append(application_event.source)
+        self.threads.add(threading.current_thread().name)
+
+
+@async_listener
+class AsyncListener(RecordingListener):
+    pass
+
+
+@async_listener(ordered=True)
+class OrderedListener(RecordingListener):
+    pass
+
+
+@async_listener
+class FailingListener(ApplicationEventListener):
+    def on_application_event(self, application_event: OrderEvent):
+        if application_event.source % 2 == 0:
+            raise RuntimeError('failed')
+
+
+class ThreadExecutor(AsyncExecutor):
+    def submit(self, task):
+        threading.Thread(target=task).start()
+
+
+@async_listener(executor='thread_executor', ordered=True)
+class ExecutorListener(RecordingListener):
+    pass
+
+
+@async_listener(executor='thread_executor')
+class UnorderedExecutorListener(RecordingListener):
+    pass
+
+
+def make_publisher(*listeners, **kwargs):
+    bean_factory = DefaultBeanFactory()
+    bean_factory.register_singleton('thread_executor', ThreadExecutor())
+    multicaster = AsyncEventMulticaster(bean_factory, **kwargs)
+    publisher = ApplicationEventPublisher(bean_factory, event_multicaster=multicaster)
+    for listener in listeners:
+        publisher.add_application_listener(listener)
+    return publisher, multicaster
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_async_listener():
+    sync_listener = RecordingListener()
+    listener = AsyncListener(delay=0.1)
+    publisher, multicaster = make_publisher(sync_listener, listener)
+    start = time.perf_counter()
+    publisher.publish_event(OrderEvent(1))
+    assert time.perf_counter() - start < 0.1
+    assert sync_listener.events == [1]
+    multicaster.shutdown()
+    assert listener.events == [1]
+    assert listener.threads == {'event-multicaster-0'}
+
+
+def test_ordered_listener():
+    listener = OrderedListener()
+    publisher, multicaster = make_publisher(listener, max_workers=4)
+    for i in range(100):
+        publisher.publish_event(OrderEvent(i))
+    multicaster.shutdown()
+    assert listener.events == list(range(100))
+    assert len(listener.threads) == 1
+
+
+def test_ordered_listener_on_executor():
+    listener = ExecutorListener(delay=0.001)
+    publisher, multicaster = make_publisher(listener)
+    for i in range(50):
+        publisher.publish_event(OrderEvent(i))
+    wait_for(lambda: len(listener.events) == 50)
+    assert listener.events == list(range(50))
+
+
+@pytest.mark.parametrize('rejection_policy', [AsyncEventMulticaster.DROP, AsyncEventMulticaster.CALLER_RUNS])
+def test_rejection_policy(rejection_policy):
+    listener = AsyncListener(delay=0.05)
+    publisher, multicaster = make_publisher(listener, max_workers=1, queue_size=1, rejection_policy=rejection_policy)
+    for i in range(5):
+        publisher.publish_event(OrderEvent(i))
+    multicaster.shutdown()
+    metrics = multicaster.get_listener_metrics(listener).to_dict()
+    if rejection_policy == AsyncEventMulticaster.DROP:
+        assert metrics['dropped'] >= 2
+        assert len(listener.events) == 5 - metrics['dropped']
+    else:
+        assert metrics['caller_runs'] >= 2
+        assert 'MainThread' in listener.threads
+        assert sorted(listener.events) == list(range(5))
+
+
+@pytest.mark.parametrize('rejection_policy', [AsyncEventMulticaster.BLOCK, AsyncEventMulticaster.DROP,
+                                              AsyncEventMulticaster.CALLER_RUNS])
+def test_rejection_policy_on_executor(rejection_policy):
+    listener = UnorderedExecutorListener(delay=0.05)
+    publisher, multicaster = make_publisher(listener, queue_size=2, rejection_policy=rejection_policy)
+    start = time.perf_counter()
+    for i in range(6):
+        publisher.publish_event(OrderEvent(i))
+    elapsed = time.perf_counter() - start
+    metrics = multicaster.get_listener_metrics(listener)
+    wait_for(lambda: metrics.to_dict()['pending'] == 0)
+    metrics = metrics.to_dict()
+    if rejection_policy == AsyncEventMulticaster.BLOCK:
+        assert metrics['submitted'] == 6
+        assert elapsed >= 0.09
+        assert sorted(listener.events) == list(range(6))
+    elif rejection_policy == AsyncEventMulticaster.DROP:
+        assert metrics['dropped'] >= 3
+        assert len(listener.events) == 6 - metrics['dropped']
+    else:
+        assert metrics['caller_runs'] >= 2
+        assert 'MainThread' in listener.threads
+        assert sorted(listener.events) == list(range(6))
+
+
+@pytest.mark.parametrize('listener_type', [AsyncListener, OrderedListener, ExecutorListener])
+def test_multicast_after_shutdown(listener_type):
+    listener = listener_type()
+    publisher, multicaster = make_publisher(listener)
+    publisher.publish_event(OrderEvent(1))
+    multicaster.shutdown()
+    wait_for(lambda: listener.events == [1])
+    publisher.publish_event(OrderEvent(2))
+    assert listener.events == [1, 2]
+    assert 'MainThread' in listener.threads
+    assert multicaster.get_listener_metrics(listener).to_dict()['caller_runs'] == 1
+    assert multicaster._queues == [] and multicaster._workers == []
+
+
+def test_failures_are_isolated():
+    listener = AsyncListener()
+    failing_listener = FailingListener()
+    publisher, multicaster = make_publisher(failing_listener, listener)
+    for i in range(10):
+        publisher.publish_event(OrderEvent(i))
+    multicaster.shutdown()
+    assert sorted(listener.events) == list(range(10))
+    metrics = {m['listener']: m for m in multicaster.get_metrics()}
+    failing_metrics = metrics[f'{__name__}.FailingListener']
+    assert failing_metrics['failed'] == 5
+    assert failing_metrics['completed'] == 5
+    assert failing_metrics['pending'] == 0
+
+
+def test_async_listener_bean():
+    listener_type = component(async_listener(type('AsyncListenerBean', (RecordingListener,), {})))
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.register(listener_type)
+    bean_context.refresh()
+    bean_context.publish_event(OrderEvent(1))
+    bean_context.close()
+    assert bean_context.get_bean_of_type(listener_type).events == [1]
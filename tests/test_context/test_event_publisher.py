@@ -0,0 +1,71 @@
+from guniflask.beans import BeanDefinition, DefaultBeanFactory
+from guniflask.context import ApplicationEventPublisher
+from guniflask.context.event import ApplicationEvent
+from guniflask.context.event_listener import ApplicationEventListener
+
+
+class OrderEvent(ApplicationEvent):
+    pass
+
+
+class OrderCreatedEvent(OrderEvent):
+    pass
+
+
+class OrderListener(ApplicationEventListener):
+    instances = 0
+
+    def __init__(self):
+        OrderListener.instances += 1
+        self.events = []
+
+    def on_application_event(self, application_event: OrderEvent):
+        self.events.append(application_event)
+
+
+class AnyListener(ApplicationEventListener):
+    def __init__(self):
+        self.events = []
+
+    def on_application_event(self, application_event):
+        self.events.append(application_event)
+
+
+def test_dispatch_by_event_type():
+    publisher = ApplicationEventPublisher(DefaultBeanFactory())
+    order_listener = OrderListener()
+    any_listener = AnyListener()
+    publisher.add_application_listener(order_listener)
+    publisher.add_application_listener(any_listener)
+
+    created = OrderCreatedEvent(None)
+    other = ApplicationEvent(None)
+    publisher.publish_event(created)
+    publisher.publish_event(other)
+    assert order_listener.events == [created]
+    assert any_listener.events == [created, other]
+
+    late_listener = OrderListener()
+    publisher.add_application_listener(late_listener)
+    publisher.publish_event(created)
+    assert late_listener.events == [created]
+    assert len(order_listener.events) == 2
+
+
+def test_listener_beans():
+    bean_factory = DefaultBeanFactory()
+    bean_factory.register_bean_definition('order_listener', BeanDefinition(OrderListener))
+    prototype_definition = BeanDefinition(OrderListener)
+    prototype_definition.scope = BeanDefinition.SCOPE_PROTOTYPE
+    bean_factory.register_bean_definition('prototype_listener', prototype_definition)
+    publisher = ApplicationEventPublisher(bean_factory)
+    publisher.add_application_listener_bean('order_listener')
+    publisher.add_application_listener_bean('prototype_listener')
+
+    OrderListener.instances = 0
+    for _ in range(3):
+        publisher.publish_event(OrderEvent(None))
+    publisher.publish_event(ApplicationEvent(None))
+    assert len(bean_factory.get_bean('order_listener').events) == 3
+    # the prototype listener is created once more when resolving the listeners of each type of events
+    assert OrderListener.instances == 1 + 4 + 2
@@ -1,6 +1,15 @@
-from typing import List
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
 from guniflask.data_model import DataModel
+from guniflask.data_model.base import _get_nested_model_fields, _get_serializer
+from guniflask.orm import BaseModelMixin
+from guniflask.utils.rule import make_field_rule
 
 
 class Person(DataModel):
@@ -107,3 +116,109 @@ def test_data_model_to_dict_with_one_to_many():
             }
         ]
     }
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Tag(DataModel):
+    name: str
+    color: Color = Color.RED
+    meta: Dict[str, Any] = {}
+
+
+class TaggedArticle(Article):
+    tags: List[Tag] = []
+
+
+def test_data_model_to_dict_with_rules():
+    article = TaggedArticle(title='Title', author=User(name='Bob'),
+                            tags=[Tag(name='a', meta={'x': 1, 'y': {'z': 2}})])
+    assert article.to_dict(ignore='tags.meta.y,author') == {
+        'title': 'Title',
+        'tags': [{'name': 'a', 'color': 'red', 'meta': {'x': 1}}],
+    }
+    assert article.to_dict(only='tags.meta.y') == {'tags': [{'meta': {'y': {}}}]}
+    assert article.to_dict(only={'tags.name'}) == {}
+    assert article.to_dict(only=['tags.name'], ignore='tags.color') == {'tags': [{'name': 'a'}]}
+    assert _get_serializer(TaggedArticle, make_field_rule(None, ['tags.name'])) \
+           is _get_serializer(TaggedArticle, make_field_rule(None, ['tags.name']))
+
+
+Base = declarative_base()
+
+
+class UserEntity(BaseModelMixin, Base):
+    __tablename__ = 'user'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class ArticleEntity(BaseModelMixin, Base):
+    __tablename__ = 'article'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    user_id = Column(Integer, ForeignKey('user.id'))
+    author = relationship('UserEntity')
+
+
+class UserModel(DataModel):
+    id: int
+    name: str
+
+
+class ArticleModel(DataModel):
+    id: int
+    title: str
+    author: Optional[UserModel] = None
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = UserEntity(id=1, name='Bob')
+    session.add_all([ArticleEntity(id=i, title=f'Title{i}', author=user) for i in range(1, 4)])
+    session.commit()
+    return session
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+def test_data_model_from_orm_many(session, trusted):
+    rows = session.query(ArticleEntity).order_by(ArticleEntity.id).all()
+    articles = ArticleModel.from_orm_many(rows, include='author', trusted=trusted)
+    assert [a.title for a in articles] == ['Title1', 'Title2', 'Title3']
+    assert all(isinstance(a.author, UserModel) and a.author.name == 'Bob' for a in articles)
+
+    articles = ArticleModel.from_orm_many(rows, trusted=trusted)
+    assert articles[0].to_dict() == {'id': 1, 'title': 'Title1', 'author': None}
+
+
+class ReviewModel(DataModel):
+    id: int
+    reviewer: Optional[UserModel] = None
+    readers: Optional[List[UserModel]] = None
+
+
+def test_data_model_from_orm_many_trusted_optional_model():
+    assert _get_nested_model_fields(ReviewModel) == {'reviewer': (UserModel, False), 'readers': (UserModel, True)}
+
+    rows = [{'id': 1, 'reviewer': {'id': 1, 'name': 'Bob'}, 'readers': [{'id': 2, 'name': 'Alice'}]},
+            {'id': 2}]
+    reviews = ReviewModel.from_orm_many(rows, trusted=True)
+    assert isinstance(reviews[0].reviewer, UserModel) and reviews[0].reviewer.name == 'Bob'
+    assert isinstance(reviews[0].readers[0], UserModel) and reviews[0].readers[0].name == 'Alice'
+    assert reviews[1].reviewer is None and reviews[1].readers is None
+
+
+
+def test_data_model_from_orm_many_validation(session):
+    with pytest.raises(ValidationError):
+        UserModel.from_orm_many(session.query(UserEntity).all(), ignore='name')
+
+
+def test_data_model_from_orm_many_with_rows(session):
+    rows = session.query(UserEntity.id, UserEntity.name).all()
+    assert UserModel.from_orm_many(rows) == [UserModel(id=1, name='Bob')]
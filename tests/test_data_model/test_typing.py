@@ -1,7 +1,8 @@
 import inspect
-from typing import List, Set, Mapping, Dict
+from typing import List, Set, Mapping, Dict, Optional, Union
 
 import pytest
+from pydantic import BaseModel, ValidationError
 
 from guniflask.data_model.typing import parse_json, analyze_arg_type, inspect_args
 
@@ -179,3 +180,45 @@ def test_inspect_args():
     assert args['f'] is None
     assert args['g'] is None
     assert hints == {'return': dict, 'b': int, 'c': List, 'e': List, 'f': List[str], 'g': A}
+
+
+class Address(BaseModel):
+    city: str
+
+
+class Customer(BaseModel):
+    name: str
+    address: Address
+
+
+def test_parse_pydantic_models():
+    data = {'name': 'Bob', 'address': {'city': 'Shanghai'}}
+    customer = parse_json(data, Customer)
+    assert isinstance(customer, Customer) and customer.address.city == 'Shanghai'
+
+    customers = parse_json(data, List[Customer])
+    assert customers == [customer]
+    assert parse_json([data, data], List[Customer]) == [customer, customer]
+
+    customers = parse_json({'vip': [data]}, Dict[str, List[Customer]])
+    assert customers == {'vip': [customer]}
+
+    with pytest.raises(ValidationError):
+        parse_json([{'name': 'Bob'}], List[Customer])
+
+
+def test_arg_type_is_interned():
+    arg_ = analyze_arg_type(Dict[str, List[int]])
+    assert analyze_arg_type(Dict[str, List[int]]) is arg_
+    assert arg_.outer_type[1] is analyze_arg_type(List[int])
+    assert {arg_: 1}[analyze_arg_type(Dict[str, List[int]])] == 1
+    with pytest.raises(AttributeError):
+        arg_.shape = None
+
+    arg_ = analyze_arg_type(Optional[List[int]])
+    assert arg_.is_union() and arg_.outer_type == (analyze_arg_type(List[int]), type(None))
+
+
+def test_interned_union_keeps_order():
+    assert analyze_arg_type(Union[int, str]).outer_type == (int, str)
+    assert analyze_arg_type(Union[str, int]).outer_type == (str, int)
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from flask import Flask
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, select
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+from guniflask.orm import BaseModelMixin, iter_query_batches, stream_query
+from guniflask.web.json_codec import JsonCodecProvider, StdlibJsonCodec
+
+Base = declarative_base()
+
+
+class User(BaseModelMixin, Base):
+    __tablename__ = 'user'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class Article(BaseModelMixin, Base):
+    __tablename__ = 'article'
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    user_id = Column(Integer, ForeignKey('user.id'))
+    author = relationship('User')
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(id=1, name='Bob')
+    session.add_all([Article(id=i, title=f'Title{i}', author=user) for i in range(1, 6)])
+    session.commit()
+    return session
+
+
+def test_iter_query_batches(session):
+    batches = list(iter_query_batches(session.query(Article).order_by(Article.id), batch_size=2, include='author',
+                                      ignore='user_id,author.id'))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[0][0] == {'id': 1, 'title': 'Title1', 'author': {'name': 'Bob'}}
+
+    batches = list(iter_query_batches(select(Article).order_by(Article.id), session=session, batch_size=4,
+                                      only='title'))
+    assert batches == [[{'title': f'Title{i}'} for i in range(1, 5)], [{'title': 'Title5'}]]
+
+    batches = list(iter_query_batches(select(Article.id, Article.title).order_by(Article.id), session=session,
+                                      batch_size=3, ignore='title'))
+    assert batches == [[{'id': 1}, {'id': 2}, {'id': 3}], [{'id': 4}, {'id': 5}]]
+
+    batches = list(iter_query_batches(session.query(Article).with_entities(Article.title).filter(Article.id > 3)))
+    assert batches == [[{'title': 'Title4'}, {'title': 'Title5'}]]
+
+    articles = session.query(Article).order_by(Article.id)
+    assert sum(iter_query_batches(articles, batch_size=2), []) == [a.to_dict() for a in articles.all()]
+
+    with pytest.raises(ValueError):
+        list(iter_query_batches(select(Article)))
+
+
+def test_stream_query(session):
+    app = Flask(__name__)
+    app.json = JsonCodecProvider(app, StdlibJsonCodec())
+
+    @app.route('/articles')
+    def get_articles():
+        return stream_query(session.query(Article).order_by(Article.id), batch_size=2, only='id')
+
+    @app.route('/articles/empty')
+    def get_no_articles():
+        return stream_query(select(Article).filter(Article.id > 5), session=session, stream_format='json')
+
+    client = app.test_client()
+    resp = client.get('/articles')
+    assert resp.is_streamed and resp.mimetype == 'application/json'
+    assert json.loads(resp.data) == [{'id': i} for i in range(1, 6)]
+
+    resp = client.get('/articles', headers={'Accept': 'application/x-ndjson'})
+    assert resp.mimetype == 'application/x-ndjson'
+    assert resp.data.decode() == ''.join(f'{{"id":{i}}}\n' for i in range(1, 6))
+
+    resp = client.get('/articles', headers={'Accept': 'text/event-stream'})
+    assert resp.data.decode().startswith('data: {"id":1}\n\n')
+
+    assert json.loads(client.get('/articles/empty').data) == []
@@ -1,8 +1,11 @@
+import datetime as dt
+
 import pytest
-from sqlalchemy import create_engine, Column, String, Integer, ForeignKey
+from sqlalchemy import create_engine, Column, DateTime, String, Integer, ForeignKey
 from sqlalchemy.orm import backref, relationship, sessionmaker
 
-from guniflask.orm import result_to_dict, BaseModelMixin
+from guniflask.orm import result_to_dict, results_to_dicts, BaseModelMixin, model_to_dict, models_to_dicts
+from guniflask.utils.rule import make_field_rule
 
 try:
     from sqlalchemy.orm import declarative_base
@@ -192,3 +195,50 @@ def test_update_model_by_dict_with_list():
     user = User()
     with pytest.raises(RuntimeError):
         user.update_by_dict({'name': 'Bob', 'articles': [{'title': 'Title'}]})
+
+
+def test_mapper_plan_is_cached():
+    rule = make_field_rule(ignore='author.id', include='author')
+    article = Article(id=1, title='Title', author=User(id=1, name='Bob'))
+    assert model_to_dict(article, ignore='author.id', include='author')['author'] == \
+           {'name': 'Bob', 'nickname': None}
+    plan = rule.plans[Article]
+    assert [k for k, _ in plan.relationships] == ['author']
+    assert not rule.child('author').accepts('id')
+    assert model_to_dict(article, ignore='author.id', include='author') and rule.plans[Article] is plan
+    assert models_to_dicts([article, article], ignore='author.id', include='author')[1]['author']['name'] == 'Bob'
+
+
+class Event(BaseModelMixin, Base):
+    __tablename__ = 'event'
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime)
+
+
+def test_model_with_datetime():
+    event = Event.from_dict(dict(id=1, created_at='2024-01-02T03:04:05+00:00'))
+    assert event.created_at == dt.datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt.timezone.utc)
+    event.update_by_dict(dict(created_at='2024-01-03T03:04:05+00:00'))
+    assert event.created_at.day == 3
+    event.created_at = dt.datetime(2024, 1, 2)
+    assert event.to_dict()['created_at'].tzinfo is not None
+
+
+def test_results_to_dicts(session):
+    session.add(User(id=2, name='Alice', nickname=None))
+    session.add(Event(id=1, created_at=dt.datetime(2024, 1, 2)))
+    session.commit()
+    query = session.query(User).with_entities(User.id, User.name, User.nickname).order_by(User.id)
+    assert results_to_dicts(query.all(), ignore='id') == [{'name': 'Bob', 'nickname': 'Good Boy'},
+                                                          {'name': 'Alice', 'nickname': None}]
+    assert results_to_dicts(session.execute(query.statement), only='name') == [{'name': 'Bob'}, {'name': 'Alice'}]
+    assert results_to_dicts(query.all(), only='id,name', columnar=True) == {'id': [1, 2], 'name': ['Bob', 'Alice']}
+    assert results_to_dicts(session.execute(query.filter(User.id > 2).statement), columnar=True) == \
+           {'id': [], 'name': [], 'nickname': []}
+    assert results_to_dicts(query.filter(User.id > 2).all()) == []
+    assert results_to_dicts(query.order_by(None).order_by(User.id.desc()).all())[1]['nickname'] == 'Good Boy'
+
+    rows = session.query(Event).with_entities(Event.id, Event.created_at).all()
+    d = results_to_dicts(rows)
+    assert d == [result_to_dict(r) for r in rows] and d[0]['created_at'].tzinfo is not None
+    assert results_to_dicts(rows, columnar=True)['created_at'][0].tzinfo is not None
@@ -1,4 +1,5 @@
-from guniflask.utils.rule import make_ignore_rule_for_field, make_only_rule_for_field, _make_rule_set
+from guniflask.utils.rule import make_field_rule, make_ignore_rule_for_field, make_only_rule_for_field, \
+    _make_rule_set
 
 
 def test_make_set():
@@ -14,3 +15,12 @@ def test_make_ignore_rule():
 
 def test_make_only_rule():
     assert make_only_rule_for_field('a.b') == {'a', 'a.b'}
+
+
+def test_make_field_rule():
+    rule = make_field_rule(ignore='a.b', only=['a.c', 'd'])
+    assert rule is make_field_rule(ignore='a.b', only=['a.c', 'd'])
+    assert rule.accepts('a') and rule.accepts('d') and not rule.accepts('e')
+    assert not rule.child('a').accepts('b') and rule.child('a').accepts('c')
+    assert not rule.child('d').accepts('x')
+    assert make_field_rule().is_empty
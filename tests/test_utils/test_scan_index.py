@@ -0,0 +1,83 @@
+import sys
+import time
+
+import pytest
+
+from guniflask.context import AnnotationConfigBeanContext
+from guniflask.context.annotation_config_registry import ModuleBeanDefinitionScanner
+from guniflask.utils.path import walk_modules
+from guniflask.utils.scan_index import ModuleScanIndex, find_module_files
+
+COMPONENT_SOURCE = '''
+from guniflask.context import component
+
+
+@component
+class {name}:
+    pass
+'''
+
+
+@pytest.fixture
+def scan_package(tmpdir):
+    package = tmpdir.mkdir('scan_index_app')
+    package.join('__init__.py').write('')
+    package.join('util.py').write('imported = True\n')
+    package.join('service.py').write(COMPONENT_SOURCE.format(name='FooService'))
+    sub_package = package.mkdir('sub')
+    sub_package.join('__init__.py').write('')
+    sub_package.join('repository.py').write(COMPONENT_SOURCE.format(name='FooRepository'))
+    sys.path.insert(0, str(tmpdir))
+    yield package
+    sys.path.remove(str(tmpdir))
+    for name in list(sys.modules):
+        if name == 'scan_index_app' or name.startswith('scan_index_app.'):
+            del sys.modules[name]
+
+
+def make_scan_index(index_file):
+    return ModuleScanIndex(str(index_file), detectors={'components': ModuleBeanDefinitionScanner.contains_components})
+
+
+def test_find_module_files(scan_package):
+    names = [name for name, path in find_module_files('scan_index_app')]
+    assert names == [m.__name__ for m in walk_modules('scan_index_app')]
+
+
+def test_scan_with_index(scan_package, tmpdir):
+    index_file = tmpdir.join('scan_index.json')
+    scan_index = make_scan_index(index_file)
+    scan_index.build('scan_index_app')
+    scan_index.save()
+    for name in list(sys.modules):
+        if name.startswith('scan_index_app.'):
+            del sys.modules[name]
+
+    scan_index = make_scan_index(index_file)
+    assert scan_index.load()
+    bean_context = AnnotationConfigBeanContext()
+    bean_context.set_scan_index(scan_index)
+    bean_context.scan('scan_index_app')
+    assert bean_context.contains_bean_definition('foo_service')
+    assert bean_context.contains_bean_definition('foo_repository')
+    assert 'scan_index_app.util' not in sys.modules
+    assert not scan_index.modified
+
+
+def test_index_follows_changed_modules(scan_package, tmpdir):
+    index_file = tmpdir.join('scan_index.json')
+    scan_index = make_scan_index(index_file)
+    scan_index.build('scan_index_app')
+    scan_index.save()
+
+    time.sleep(0.01)
+    scan_package.join('util.py').write(COMPONENT_SOURCE.format(name='BarUtil'))
+    scan_package.join('service.py').setmtime(time.time() + 10)
+    scan_package.join('sub', 'repository.py').remove()
+    del sys.modules['scan_index_app.util']
+
+    scan_index = make_scan_index(index_file)
+    assert scan_index.load()
+    modules = scan_index.walk_modules('scan_index_app', 'components')
+    assert [m.__name__ for m in modules] == ['scan_index_app.service', 'scan_index_app.util']
+    assert scan_index.modified
@@ -0,0 +1,259 @@
+import gzip
+import zlib
+
+import pytest
+from flask import Flask
+
+from guniflask.web.compression import CompressionCache, GzipCompressor, ZstdCompressor, negotiate_encoding
+from guniflask.web.compression_policy import AdaptiveCompressionOption, AdaptiveCompressionPolicy, \
+    parse_request_start
+from guniflask.web.gzip import GzipFilter
+
+PAYLOAD = b'{"data": "' + b'x' * 4096 + b'"}'
+
+
+@pytest.mark.parametrize('accept_encoding, encodings, expected', [
+    (None, ['br', 'gzip'], 'gzip'),
+    (None, ['br'], None),
+    ('gzip, deflate, br', ['zstd', 'br', 'gzip'], 'br'),
+    ('gzip;q=1.0, br;q=0.5', ['br', 'gzip'], 'gzip'),
+    ('br;q=0, *;q=0.1', ['br', 'gzip'], 'gzip'),
+    ('identity', ['br', 'gzip'], None),
+    ('GZIP', ['gzip'], 'gzip'),
+])
+def test_negotiate_encoding(accept_encoding, encodings, expected):
+    assert negotiate_encoding(accept_encoding, encodings) == expected
+
+
+def split_chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_compress_stream():
+    chunks = split_chunks(PAYLOAD, 100)
+    compressor = GzipCompressor(level=1)
+    assert gzip.decompress(b''.join(compressor.compress_stream(chunks))) == PAYLOAD
+
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk, data in zip(chunks, compressor.compress_stream(chunks, sync_flush=True)):
+        assert d.decompress(data) == chunk
+
+
+def test_zstd_interleaved_streams():
+    zstandard = pytest.importorskip('zstandard')
+    compressor = ZstdCompressor(level=3)
+    payloads = [PAYLOAD, PAYLOAD.replace(b'x', b'y')]
+    streams = [compressor.compress_stream(split_chunks(p, 100), sync_flush=True) for p in payloads]
+    outputs = [b'', b'']
+    done = [False, False]
+    while not all(done):
+        for i, stream in enumerate(streams):
+            if not done[i]:
+                try:
+                    outputs[i] += next(stream)
+                except StopIteration:
+                    done[i] = True
+    for payload, output in zip(payloads, outputs):
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(output) == payload
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compressor.compress(PAYLOAD)) == PAYLOAD
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    gzip_filter = GzipFilter()
+    app.after_request(gzip_filter.after_request)
+
+    @app.route('/data')
+    def get_data():
+        return app.response_class(PAYLOAD, mimetype='application/json')
+
+    @app.route('/small')
+    def get_small():
+        return app.response_class(b'{}', mimetype='application/json')
+
+    @app.route('/stream')
+    def get_stream():
+        return app.response_class((PAYLOAD[i:i + 512] for i in range(0, len(PAYLOAD), 512)),
+                                  mimetype='application/json')
+
+    return app
+
+
+def test_gzip_response(app):
+    client = app.test_client()
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    assert int(resp.headers['Content-Length']) == len(resp.data)
+    assert gzip.decompress(resp.data) == PAYLOAD
+
+    resp = client.get('/data', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in resp.headers
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    assert resp.data == PAYLOAD
+
+    resp = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in resp.headers and 'Vary' not in resp.headers
+
+
+def test_gzip_streamed_response(app):
+    resp = app.test_client().get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert resp.is_streamed
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in resp.headers
+    assert gzip.decompress(resp.data) == PAYLOAD
+
+
+def test_compression_cache():
+    cache = CompressionCache(max_size=10)
+    cache.put('a', b'12345')
+    cache.put('b', b'12345')
+    assert cache.get('a') == b'12345'
+    cache.put('c', b'123')
+    assert cache.get('b') is None
+    cache.put('d', b'x' * 11)
+    assert cache.get('d') is None
+    assert cache.get_metrics() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3, 'evictions': 1,
+                                   'entries': 2, 'size': 8, 'max_size': 10}
+
+
+def test_cache_and_etag():
+    app = Flask(__name__)
+    gzip_filter = GzipFilter(compress_cache_size=1024 * 1024, etag=True)
+    app.after_request(gzip_filter.after_request)
+    calls = []
+
+    @app.route('/data')
+    def get_data():
+        return app.response_class(PAYLOAD, mimetype='application/json')
+
+    compress = gzip_filter.compressors['gzip'].compress
+
+    def counting_compress(data):
+        calls.append(len(data))
+        return compress(data)
+
+    gzip_filter.compressors['gzip'].compress = counting_compress
+    client = app.test_client()
+
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    etag = resp.headers['ETag']
+    assert etag.endswith('-gzip"') and gzip.decompress(resp.data) == PAYLOAD
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['ETag'] == etag and gzip.decompress(resp.data) == PAYLOAD
+    assert len(calls) == 1
+    assert gzip_filter.get_cache_metrics()['hits'] == 1
+
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert resp.status_code == 304 and resp.data == b''
+    assert len(calls) == 1 and gzip_filter.get_cache_metrics()['hits'] == 1
+
+    resp = client.get('/data', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert resp.status_code == 200 and resp.data == PAYLOAD
+    assert resp.headers['ETag'] != etag
+
+
+class FixedLoadMonitor:
+    queue_time_limit = None
+
+    def __init__(self, load):
+        self.load = load
+
+    def get_load(self):
+        return self.load
+
+
+@pytest.mark.parametrize('load, size, mimetype, expected', [
+    (0.0, 4096, 'application/json', 9),
+    (0.55, 4096, 'application/json', 5),
+    (0.55, 2 * 1024 * 1024, 'application/json', 1),
+    (0.9, 4096, 'application/json', 1),
+    (0.99, 4096, 'application/json', 1),
+    (0.99, 1024 * 1024, 'application/json', None),
+    (0.99, None, 'application/json', None),
+    (0.0, None, 'text/event-stream', 1),
+])
+def test_adaptive_compression_level(load, size, mimetype, expected):
+    policy = AdaptiveCompressionPolicy(load_monitor=FixedLoadMonitor(load))
+    assert policy.select_level('gzip', size, mimetype) == expected
+
+
+def test_adaptive_compression_encodings():
+    policy = AdaptiveCompressionPolicy(AdaptiveCompressionOption(max_levels={'gzip': 7}),
+                                       load_monitor=FixedLoadMonitor(0.0))
+    assert policy.get_encodings(['br', 'gzip']) == ['br', 'gzip']
+    assert policy.select_level('gzip', 4096, 'application/json') == 7
+    policy.load_monitor.load = 0.8
+    assert policy.get_encodings(['br', 'gzip']) == ['gzip', 'br']
+
+
+def test_parse_request_start():
+    assert parse_request_start('t=100.5', now=101.0) == 0.5
+    assert parse_request_start('1600000000500', now=1600000001.0) == 0.5
+    assert parse_request_start('t=1600000000500000', now=1600000001.0) == 0.5
+    assert parse_request_start('t=abc') is None
+
+
+def test_adaptive_gzip_filter():
+    app = Flask(__name__)
+    gzip_filter = GzipFilter(adaptive={'max_levels': {'gzip': 8}})
+    gzip_filter.policy.load_monitor = FixedLoadMonitor(0.0)
+    app.after_request(gzip_filter.after_request)
+
+    @app.route('/data')
+    def get_data():
+        return app.response_class(PAYLOAD, mimetype='application/json')
+
+    client = app.test_client()
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip' and gzip.decompress(resp.data) == PAYLOAD
+    assert resp.data == GzipCompressor(level=8).compress(PAYLOAD)
+
+    gzip_filter.policy.load_monitor.load = 1.0
+    gzip_filter.policy.option.skip_min_length = 1024
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in resp.headers and resp.data == PAYLOAD
+    assert gzip_filter.get_policy_metrics() == {'load': 1.0, 'levels': {'gzip:8': 1}, 'skipped': 1}
+
+
+def test_adaptive_gzip_filter_with_cache():
+    app = Flask(__name__)
+    gzip_filter = GzipFilter(compress_cache_size=1024 * 1024, etag=True, adaptive={'max_levels': {'gzip': 8}})
+    gzip_filter.policy.load_monitor = FixedLoadMonitor(0.0)
+    app.after_request(gzip_filter.after_request)
+
+    @app.route('/data')
+    def get_data():
+        return app.response_class(PAYLOAD, mimetype='application/json')
+
+    client = app.test_client()
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.data == GzipCompressor(level=8).compress(PAYLOAD)
+    etag = resp.headers['ETag']
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.data == GzipCompressor(level=8).compress(PAYLOAD)
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert resp.status_code == 304
+
+    gzip_filter.policy.load_monitor.load = 0.9
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert resp.data == GzipCompressor(level=1).compress(PAYLOAD)
+    assert gzip_filter.get_cache_metrics()['hits'] == 1
+    assert gzip_filter.get_policy_metrics() == {'load': 0.9, 'levels': {'gzip:8': 1, 'gzip:1': 1}, 'skipped': 0}
+
+    gzip_filter.policy.load_monitor.load = 1.0
+    gzip_filter.policy.option.skip_min_length = 1024
+    resp = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in resp.headers and resp.data == PAYLOAD
+    assert resp.headers['ETag'] != etag and not resp.headers['ETag'].endswith('-gzip"')
+
+
+def test_adaptive_max_levels_default_to_static_levels():
+    gzip_filter = GzipFilter(compress_level=5, compress_levels={'br': 6}, adaptive=True)
+    assert gzip_filter.policy.max_levels == {'gzip': 5, 'br': 6, 'zstd': 12}
+    gzip_filter.policy.load_monitor = FixedLoadMonitor(0.0)
+    assert gzip_filter.policy.select_level('gzip', 4096, 'application/json') == 5
+
+    gzip_filter = GzipFilter(compress_level=5, adaptive={'max_levels': {'gzip': 8}})
+    assert gzip_filter.policy.max_levels['gzip'] == 8
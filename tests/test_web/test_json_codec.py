@@ -0,0 +1,125 @@
+import datetime as dt
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import List
+
+import pytest
+from flask import Flask, jsonify
+
+from guniflask.data_model import DataModel
+from guniflask.web import RequestBody, RequestValidationError, blueprint, post_route
+from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
+from guniflask.web.json_codec import JsonCodecProvider, MsgspecCodec, OrjsonCodec, StdlibJsonCodec, \
+    create_json_codec
+
+
+class Color(Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class Item(DataModel):
+    name: str
+    color: Color
+    created_at: dt.datetime
+
+
+class Cart(DataModel):
+    items: List[Item]
+    total: int = 0
+
+
+@pytest.fixture(params=[StdlibJsonCodec, OrjsonCodec, MsgspecCodec])
+def codec(request):
+    if not request.param.is_available():
+        pytest.skip(f'{request.param.name} is not installed')
+    return request.param()
+
+
+def make_item(name: str) -> Item:
+    return Item(name=name, color=Color.RED, created_at=dt.datetime(2024, 1, 2, 3, 4, 5))
+
+
+def test_dumps(codec):
+    data = {
+        'time': dt.datetime(2024, 1, 2, 3, 4, 5),
+        'date': dt.date(2024, 1, 2),
+        'color': Color.BLUE,
+        'tags': {'a'},
+        'price': Decimal('1.5'),
+        'item': make_item('foo'),
+    }
+    assert json.loads(codec.dumps(data)) == {
+        'time': '2024-01-02T03:04:05',
+        'date': '2024-01-02',
+        'color': 'blue',
+        'tags': ['a'],
+        'price': '1.5',
+        'item': {'name': 'foo', 'color': 'red', 'created_at': '2024-01-02T03:04:05'},
+    }
+
+
+def test_dumps_model(codec):
+    cart = Cart(items=[make_item('foo'), make_item('bar')], total=2)
+    assert json.loads(codec.dumps(cart)) == cart.to_dict() | {
+        'items': [{'name': n, 'color': 'red', 'created_at': '2024-01-02T03:04:05'} for n in ('foo', 'bar')],
+    }
+
+
+def test_loads(codec):
+    assert codec.loads(b'{"a": [1, 2.5, "x", null, true]}') == {'a': [1, 2.5, 'x', None, True]}
+    assert codec.loads('{"a": 1}') == {'a': 1}
+
+
+def test_create_json_codec():
+    assert isinstance(create_json_codec('stdlib'), StdlibJsonCodec)
+    assert create_json_codec().name in ('orjson', 'msgspec', 'stdlib')
+    with pytest.raises(ValueError):
+        create_json_codec('unknown')
+
+
+@blueprint('/carts')
+class CartController:
+    @post_route('/')
+    def create_cart(self, cart: Cart = RequestBody):
+        return cart, 201
+
+    @post_route('/items')
+    def list_items(self, items: List[Item] = RequestBody):
+        return {'items': items, 'names': {i.name for i in items}}
+
+
+@pytest.fixture
+def client(codec):
+    app = Flask(__name__)
+    app.json = JsonCodecProvider(app, codec)
+    post_processor = BlueprintPostProcessor()
+    post_processor.post_process_after_initialization(CartController(), 'cart_controller')
+    for b in post_processor.blueprints:
+        app.register_blueprint(b)
+
+    @app.route('/jsonify')
+    def json_response():
+        return jsonify(color=Color.RED)
+
+    return app.test_client()
+
+
+def test_json_responses(client):
+    item = {'name': 'foo', 'color': 'red', 'created_at': '2024-01-02T03:04:05'}
+    resp = client.post('/carts/', json={'items': [item]})
+    assert resp.status_code == 201
+    assert resp.mimetype == 'application/json'
+    assert resp.json == {'items': [item], 'total': 0}
+
+    resp = client.post('/carts/items', json=[item])
+    assert resp.json == {'items': [item], 'names': ['foo']}
+
+    assert client.get('/jsonify').json == {'color': 'red'}
+
+
+def test_invalid_body(client):
+    client.application.testing = True
+    with pytest.raises(RequestValidationError):
+        client.post('/carts/', json={'items': [{'name': 'foo'}]})
@@ -0,0 +1,82 @@
+import datetime as dt
+from typing import List
+
+import pytest
+from flask import Flask
+from pydantic import BaseModel
+
+from guniflask.web import CookieValue, PathVariable, RequestBody, RequestHeader, RequestParam, RequestValidationError, \
+    blueprint, get_route, post_route
+from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
+
+
+class Paging(BaseModel):
+    page: int = 1
+    size: int = 20
+
+
+class Order(BaseModel):
+    item: str
+    quantity: int
+
+
+@blueprint('/shops')
+class ShopController:
+    @post_route('/<sid>/orders')
+    def create_order(self,
+                     order: Order = RequestBody,
+                     shop_id: int = PathVariable('sid'),
+                     user_id: int = RequestParam(required=True),
+                     dry_run: bool = RequestParam(default=False),
+                     since: dt.datetime = RequestParam(default=None),
+                     tags: List[int] = RequestParam(default=None),
+                     paging: Paging = RequestParam,
+                     trace_id: int = RequestHeader('X-Trace-Id'),
+                     languages: List[str] = RequestHeader('Accept-Language'),
+                     session: str = CookieValue(default='none')):
+        return dict(order=order.model_dump(), shop_id=shop_id, user_id=user_id, dry_run=dry_run,
+                    since=since.isoformat() if since else None, tags=tags, paging=paging.model_dump(),
+                    trace_id=trace_id, languages=languages, session=session)
+
+    @get_route('/<shop_id>')
+    def get_shop(self, shop_id: int, name: str = None):
+        return dict(shop_id=shop_id, name=name)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    post_processor = BlueprintPostProcessor()
+    post_processor.post_process_after_initialization(ShopController(), 'shop_controller')
+    for b in post_processor.blueprints:
+        app.register_blueprint(b)
+    return app
+
+
+def test_bind_mixed_parameters(app):
+    with app.test_request_context('/shops/42/orders?user_id=7&dry_run=true&since=2024-01-02T03:04:05'
+                                  '&tags=1&tags=2&page=2&size=50',
+                                  method='POST',
+                                  headers={'X-Trace-Id': '123', 'Accept-Language': 'en'},
+                                  json={'item': 'book', 'quantity': 3}):
+        result = app.view_functions['shop_controller.create_order'](sid='42')
+    assert result == dict(order={'item': 'book', 'quantity': 3}, shop_id=42, user_id=7, dry_run=True,
+                          since='2024-01-02T03:04:05+00:00', tags=[1, 2], paging={'page': 2, 'size': 50},
+                          trace_id=123, languages=['en'], session='none')
+
+
+def test_bind_defaults(app):
+    with app.test_request_context('/shops/42'):
+        result = app.view_functions['shop_controller.get_shop'](shop_id='42')
+    assert result == dict(shop_id=42, name=None)
+
+
+@pytest.mark.parametrize('query_string, message', [
+    ('', 'Parameter not given: user_id'),
+    ('user_id=x', 'Failed to read value'),
+])
+def test_bind_invalid_parameters(app, query_string, message):
+    with app.test_request_context(f'/shops/42/orders?{query_string}', method='POST',
+                                  headers={'X-Trace-Id': '123'}, json={'item': 'book', 'quantity': 3}):
+        with pytest.raises(RequestValidationError, match=message):
+            app.view_functions['shop_controller.create_order'](sid='42')
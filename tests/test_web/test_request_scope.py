@@ -0,0 +1,58 @@
+import pytest
+from flask import Flask
+
+from guniflask.beans import DisposableBean
+from guniflask.beans.errors import ScopeNotActiveError
+from guniflask.context import component, scope
+from guniflask.web import WebApplicationContext
+
+
+@scope('request')
+@component
+class RequestCache(DisposableBean):
+    def __init__(self):
+        self.data = {}
+        self.destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+@component
+class CacheService:
+    def __init__(self, request_cache: RequestCache):
+        self.request_cache = request_cache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    bean_context = WebApplicationContext(app)
+    bean_context.register(RequestCache, CacheService)
+    with app.app_context():
+        bean_context.refresh()
+    app.bean_context = bean_context
+    return app
+
+
+def test_request_scope(app):
+    service = app.bean_context.get_bean('cache_service')
+
+    with app.test_request_context():
+        service.request_cache.data['x'] = 1
+        cache = app.bean_context.get_bean('request_cache')
+        assert cache.data == {'x': 1}
+    assert cache.destroyed is True
+
+    with app.test_request_context():
+        assert service.request_cache.data == {}
+
+    with pytest.raises(ScopeNotActiveError):
+        service.request_cache.data
+
+
+def test_request_scope_not_active_in_app_context(app):
+    service = app.bean_context.get_bean('cache_service')
+    with app.app_context():
+        with pytest.raises(ScopeNotActiveError):
+            service.request_cache.data
@@ -0,0 +1,82 @@
+import io
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator
+
+import pytest
+from flask import Flask
+
+from guniflask.data_model import DataModel
+from guniflask.web import FilePart, RequestBody, RequestValidationError, blueprint, post_route
+from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
+from guniflask.web.request_stream import StreamKind, resolve_stream_type
+
+PAYLOAD = b'0123456789' * 1000
+
+
+class Event(DataModel):
+    id: int
+    name: str
+
+
+@blueprint('/upload')
+class UploadController:
+    @post_route('/chunks')
+    def upload_chunks(self, chunks: Iterator[bytes] = RequestBody(chunk_size=1024)):
+        sizes = [len(c) for c in chunks]
+        return {'chunks': len(sizes), 'size': sum(sizes)}
+
+    @post_route('/stream')
+    def upload_stream(self, stream: BinaryIO):
+        return {'size': len(stream.read())}
+
+    @post_route('/spooled')
+    def upload_spooled(self, f: SpooledTemporaryFile = RequestBody(spool_max_size=1024)):
+        return {'rolled': f._rolled, 'size': len(f.read())}
+
+    @post_route('/events')
+    def upload_events(self, events: Iterator[Event]):
+        return {'events': [e.to_dict() for e in events]}
+
+    @post_route('/file')
+    def upload_file(self, x: Iterator[bytes] = FilePart(chunk_size=1000)):
+        return {'chunks': len(list(x))}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.testing = True
+    post_processor = BlueprintPostProcessor()
+    post_processor.post_process_after_initialization(UploadController(), 'upload_controller')
+    for b in post_processor.blueprints:
+        app.register_blueprint(b)
+    return app.test_client()
+
+
+def test_resolve_stream_type():
+    assert resolve_stream_type(Iterator[bytes]) == (StreamKind.CHUNKS, None)
+    assert resolve_stream_type(BinaryIO) == (StreamKind.STREAM, None)
+    assert resolve_stream_type(SpooledTemporaryFile) == (StreamKind.SPOOLED, None)
+    assert resolve_stream_type(Iterator[Event]) == (StreamKind.NDJSON, Event)
+    assert resolve_stream_type(bytes) is None
+
+
+def test_stream_body(client):
+    assert client.post('/upload/chunks', data=PAYLOAD).json == {'chunks': 10, 'size': len(PAYLOAD)}
+    assert client.post('/upload/stream', data=PAYLOAD).json == {'size': len(PAYLOAD)}
+    assert client.post('/upload/spooled', data=PAYLOAD).json == {'rolled': True, 'size': len(PAYLOAD)}
+    assert client.post('/upload/spooled', data=b'x').json == {'rolled': False, 'size': 1}
+
+
+def test_stream_file_part(client):
+    resp = client.post('/upload/file', data={'x': (io.BytesIO(PAYLOAD), 'payload.txt')})
+    assert resp.json == {'chunks': 10}
+
+
+def test_ndjson_body(client):
+    data = b'{"id": 1, "name": "a"}\n\n{"id": 2, "name": "b"}\n'
+    resp = client.post('/upload/events', data=data)
+    assert resp.json == {'events': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]}
+
+    with pytest.raises(RequestValidationError, match='line 2'):
+        client.post('/upload/events', data=b'{"id": 1, "name": "a"}\n{"id": "x"}\n')
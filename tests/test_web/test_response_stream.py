@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from flask import Flask
+
+from guniflask.data_model import DataModel
+from guniflask.web import ServerSentEvent, blueprint, get_route, stream_ndjson, stream_sse
+from guniflask.web.blueprint_post_processor import BlueprintPostProcessor
+from guniflask.web.json_codec import JsonCodecProvider, StdlibJsonCodec
+
+
+class Row(DataModel):
+    id: int
+    name: str
+
+
+def generate_rows(n: int):
+    for i in range(n):
+        yield Row(id=i, name=f'row{i}')
+
+
+@blueprint('/rows')
+class RowController:
+    def __init__(self):
+        self.produced = 0
+
+    @get_route('/')
+    def list_rows(self, n: int = 3):
+        return generate_rows(n)
+
+    @get_route('/dicts')
+    def list_dicts(self):
+        return iter([{'id': 1}, {'id': 2}]), 201
+
+    @get_route('/ndjson')
+    def list_ndjson(self):
+        return stream_ndjson(generate_rows(2))
+
+    @get_route('/events')
+    def list_events(self):
+        return stream_sse([ServerSentEvent({'id': 1}, event='row', id='1'), 'a\nb'], event='message')
+
+    @get_route('/text')
+    def list_text(self):
+        return (s for s in ['a', 'b', 'c'])
+
+    @get_route('/lazy')
+    def list_lazy(self):
+        def generate():
+            for i in range(10000):
+                self.produced = i + 1
+                yield {'id': i}
+
+        return generate()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = JsonCodecProvider(app, StdlibJsonCodec())
+    post_processor = BlueprintPostProcessor()
+    controller = RowController()
+    post_processor.post_process_after_initialization(controller, 'row_controller')
+    for b in post_processor.blueprints:
+        app.register_blueprint(b)
+    app.controller = controller
+    return app
+
+
+def test_stream_json_array(app):
+    client = app.test_client()
+    resp = client.get('/rows/?n=3')
+    assert resp.is_streamed and resp.mimetype == 'application/json'
+    assert resp.json == [{'id': i, 'name': f'row{i}'} for i in range(3)]
+    assert client.get('/rows/?n=0').json == []
+
+    resp = client.get('/rows/dicts')
+    assert resp.status_code == 201 and resp.json == [{'id': 1}, {'id': 2}]
+
+
+def test_negotiate_stream_format(app):
+    client = app.test_client()
+    resp = client.get('/rows/?n=2', headers={'Accept': 'application/x-ndjson'})
+    assert resp.mimetype == 'application/x-ndjson'
+    assert resp.data == b'{"id":0,"name":"row0"}\n{"id":1,"name":"row1"}\n'
+
+    resp = client.get('/rows/?n=1', headers={'Accept': 'text/event-stream'})
+    assert resp.mimetype == 'text/event-stream'
+    assert resp.data == b'data: {"id":0,"name":"row0"}\n\n'
+
+
+def test_stream_helpers(app):
+    client = app.test_client()
+    resp = client.get('/rows/ndjson')
+    assert [json.loads(line) for line in resp.data.splitlines()] == [{'id': 0, 'name': 'row0'},
+                                                                    {'id': 1, 'name': 'row1'}]
+    resp = client.get('/rows/events')
+    assert resp.headers['Cache-Control'] == 'no-cache'
+    assert resp.data == b'event: row\nid: 1\ndata: {"id":1}\n\nevent: message\ndata: a\ndata: b\n\n'
+
+
+def test_stream_raw_text(app):
+    resp = app.test_client().get('/rows/text')
+    assert resp.mimetype == 'text/html' and resp.data == b'abc'
+
+
+def test_stream_lazily(app):
+    resp = app.test_client().get('/rows/lazy', buffered=False)
+    chunks = iter(resp.response)
+    first = next(chunks)
+    assert app.controller.produced < 10000
+    data = first + b''.join(chunks)
+    assert len(json.loads(data)) == 10000
+    assert app.controller.produced == 10000
+